@@ -1,17 +1,33 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from textblob import TextBlob
-import re
-from collections import Counter
-# NLTK 관련 import 제거 (한국어 처리에 불필요)
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 import io
-import base64
+
+from cfa.analysis import (
+    collapse_duplicates, column_features, read_table, search_index, segment_counts, term_matrix
+)
+from cfa.cache import cached_stage, content_hash, stage_cache
+from cfa.charts import box_figure, box_summary, box_summary_from_histogram, histogram_bins, histogram_figure
+from cfa.cube import RollupCube
+from cfa.dtypes import compact_frame, memory_report, parse_dates
+from cfa.excel import iter_excel_chunks, sheet_rows
+from cfa.filter_index import FilterIndex
+from cfa.grid import PAGE_SIZES, page_slice, search_mask, sort_order, visible_rows
+from cfa.jobs import session_job
+from cfa.profiling import profile_run, profile_stage, profiled
+from cfa.sampling import (
+    DEFAULT_PER_STRATUM, estimate_group_table, estimate_monthly_positive_ratio, estimate_sentiment_counts,
+    estimate_summary, sample_chunks
+)
+from cfa.search_index import parse_query
+from cfa.store import feedback_store
+from cfa.streaming import DEFAULT_CHUNK_SIZE, StreamingAggregates, stream_csv
+from cfa.term_matrix import keywords_frame
+from cfa.ui import (
+    PROFILING_KEY, create_wordcloud, excel_options, load_data, show_dataset_cache_panel, show_export_buttons,
+    show_profile_panel
+)
+
+# plotly.express는 앱 시작 시간을 줄이기 위해 차트를 만들 때 함수 안에서 불러옴
 
 # 페이지 설정
 st.set_page_config(
@@ -21,107 +37,586 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
+WORDCLOUD_OPTIONS = {
+    'width': 800,
+    'height': 400,
+    'background_color': 'white',
+    'font_path': 'malgun.ttf',  # Windows 기본 한글 폰트
+    'max_words': 50,
+}
+
+@cached_stage('tokens')
+def column_keywords(df, text_column, top_n=10, dataset_key=None):
+    """텍스트 컬럼의 상위 키워드"""
+    return term_matrix(df, text_column, dataset_key).top_terms(top_n=top_n)
 
-# NLTK 데이터 다운로드 제거 (한국어 처리에 불필요)
+@cached_stage('tokens.segments')
+def segment_keywords(df, text_column, segments, top_n=5, dataset_key=None):
+    """세그먼트(제품, 카테고리, 감성 등) 값 컬럼별 상위 키워드 표"""
+    matrix = term_matrix(df, text_column, dataset_key)
+    grouped = segment_counts(df, text_column, segments, dataset_key)
+    return keywords_frame(matrix.top_terms_grouped(grouped, top_n=top_n))
 
-# 한국어 불용어 설정
-korean_stopwords = set(['이', '그', '저', '것', '수', '등', '때', '곳', '말', '일', '년', '월', '일', '시', '분', '초'])
+@cached_stage('normalize')
+def normalize_data(df):
+    """날짜 컬럼 변환 및 월 컬럼 추가
 
-def load_data(uploaded_file):
-    """데이터 파일 로드"""
+    날짜 변환에 실패하면 원본 데이터와 오류 메시지를 함께 반환한다.
+    """
+    if 'date' not in df.columns:
+        return df, None
     try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file)
-        else:
-            st.error("지원되지 않는 파일 형식입니다. CSV 또는 Excel 파일을 업로드해주세요.")
-            return None
-        return df
+        dates = parse_dates(df['date'])
     except Exception as e:
-        st.error(f"파일 로드 중 오류가 발생했습니다: {str(e)}")
-        return None
+        return df, str(e)
+    return df.assign(date=dates, month=dates.dt.to_period('M')), None
+
+@cached_stage('sentiment')
+def add_sentiment(df, dataset_key=None):
+    """감성 분석 결과 컬럼 추가"""
+    features = column_features(df, 'feedback_text', dataset_key)
+    return df.assign(sentiment=features['sentiment'])
+
+@cached_stage('filters.index')
+def filter_index(df):
+    """고급 필터링용 값별 비트맵 인덱스"""
+    return FilterIndex(df)
+
+@cached_stage('aggregates.summary')
+def summary_stats(df):
+    """기본 통계 (평균 평점, 제품 수, 카테고리 수)"""
+    return {
+        'avg_rating': df['rating'].mean() if 'rating' in df.columns else None,
+        'unique_products': df['product'].nunique() if 'product' in df.columns else None,
+        'unique_categories': df['category'].nunique() if 'category' in df.columns else None,
+    }
+
+@cached_stage('aggregates.sentiment')
+def sentiment_distribution(df, column='sentiment'):
+    """감성별 피드백 수"""
+    counts = df[column].value_counts()
+    # 범주형 감성 코드는 나오지 않은 감성도 0으로 포함하므로 제외
+    return counts[counts > 0]
+
+@cached_stage('aggregates.cube')
+def rollup_cube(df):
+    """월/제품/카테고리/감성별 집계 큐브 (원본 행은 한 번만 훑음)"""
+    return RollupCube.from_frame(df)
+
+@cached_stage('aggregates.group')
+def group_analysis(df, column):
+    """그룹별 평균 평점, 피드백 수, 긍정 비율"""
+    return rollup_cube(df).group_table(column)
+
+@cached_stage('aggregates.monthly')
+def monthly_positive_ratio(df):
+    """월별 긍정 비율"""
+    return rollup_cube(df).monthly_positive_ratio()
+
+SENTIMENT_COLORS = {'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
+
+@cached_stage('charts.sentiment')
+def sentiment_charts(sentiment_counts):
+    """감성 분포 파이/막대 차트"""
+    import plotly.express as px
+    
+    fig_pie = px.pie(
+        values=sentiment_counts.values,
+        names=sentiment_counts.index,
+        title="감성 분포",
+        color_discrete_map=SENTIMENT_COLORS
+    )
+    fig_bar = px.bar(
+        x=sentiment_counts.index,
+        y=sentiment_counts.values,
+        title="감성별 피드백 수",
+        color=sentiment_counts.index,
+        color_discrete_map=SENTIMENT_COLORS
+    )
+    return fig_pie, fig_bar
+
+@cached_stage('charts.keywords')
+def keyword_chart(keywords, title="상위 키워드 빈도"):
+    """상위 키워드 막대 차트"""
+    import plotly.express as px
+    
+    return px.bar(
+        x=list(keywords.values()),
+        y=list(keywords.keys()),
+        orientation='h',
+        title=title,
+        labels={'x': '빈도', 'y': '키워드'}
+    )
+
+@cached_stage('charts.segment_keywords')
+def segment_keyword_chart(segment_frame, segment_label):
+    """세그먼트별 상위 키워드 막대 차트"""
+    import plotly.express as px
+    
+    fig = px.bar(
+        segment_frame,
+        x='빈도',
+        y='키워드',
+        orientation='h',
+        facet_col='그룹',
+        facet_col_wrap=3,
+        title=f"{segment_label}별 상위 키워드",
+        labels={'그룹': segment_label}
+    )
+    fig.update_yaxes(matches=None, showticklabels=True)
+    fig.update_xaxes(matches=None)
+    return fig
+
+@cached_stage('charts.product_rating')
+def product_rating_chart(df):
+    """제품별 평점 분포 상자 그림 (행 대신 사분위수·수염·이상값 표본만 전송)"""
+    histogram = rollup_cube(df).rating_histogram('product')
+    if histogram is not None:
+        summary = box_summary_from_histogram(histogram)
+    else:
+        summary = box_summary(df['rating'], df['product'])
+    return box_figure(summary, "제품별 평점 분포", 'product', 'rating', default_color='#636efa')
+
+@cached_stage('charts.monthly_trend')
+def monthly_trend_chart(monthly_sentiment):
+    """월별 긍정 비율 추이 차트"""
+    import plotly.express as px
+    
+    return px.line(
+        monthly_sentiment,
+        x='month',
+        y='sentiment',
+        # 근사 분석 모드는 95% 신뢰구간을 오차 막대로 표시
+        error_y='margin' if 'margin' in monthly_sentiment.columns else None,
+        title="월별 긍정 비율 추이",
+        labels={'sentiment': '긍정 비율(%)', 'month': '월'}
+    )
+
+@cached_stage('load.sample')
+def load_sample_data(data):
+    """샘플 데이터 로드 (타입 압축 데이터와 메모리 비교 표)"""
+    raw = pd.read_csv(io.BytesIO(data))
+    df = compact_frame(raw)
+    return df, memory_report(raw, df)
+
+def streaming_key(uploaded_file, chunk_size):
+    """업로드 파일 전체 누적 집계의 캐시 키 (스트리밍 모드와 근사 분석 모드의 정확한 계산이 공유)"""
+    return content_hash(
+        'stream', getattr(uploaded_file, 'file_id', None), uploaded_file.name,
+        uploaded_file.size, chunk_size
+    )
 
-def preprocess_text(text):
-    """텍스트 전처리"""
-    if pd.isna(text):
-        return ""
+@profiled('load_streaming')
+def load_streaming(uploaded_file, chunk_size):
+    """CSV를 청크 단위로 읽어 누적 집계 (업로드 파일 및 청크 크기 기준 캐시)"""
+    key = streaming_key(uploaded_file, chunk_size)
+    aggregates = stage_cache.get(key)
+    if aggregates is None:
+        progress = st.progress(0.0, text="청크 단위로 분석 중...")
+        aggregates = stream_csv(
+            uploaded_file,
+            chunksize=chunk_size,
+            on_progress=lambda fraction, rows: progress.progress(
+                fraction, text=f"청크 단위로 분석 중... ({rows:,}행 처리)"
+            )
+        )
+        progress.empty()
+        stage_cache.put(key, aggregates)
+    return aggregates
+
+@profiled('show_streaming_analysis')
+def show_streaming_analysis(aggregates, notice="대용량 스트리밍 모드: 행 단위 표, 필터링, 다운로드는 제공되지 않습니다."):
+    """스트리밍 모드 분석 결과 (누적 집계 기반, 저장소 모드에서도 사용)"""
+    st.info(notice)
     
-    # 특수문자 제거 및 소문자 변환
-    text = re.sub(r'[^\w\s]', '', str(text))
-    text = text.lower()
+    # 기본 통계
+    st.subheader("📈 기본 통계")
+    col1, col2, col3, col4 = st.columns(4)
     
-    # 간단한 공백 기반 토큰화 (NLTK 의존성 제거)
-    tokens = text.split()
+    with col1:
+        st.metric("총 피드백 수", aggregates.rows)
+    
+    with col2:
+        if aggregates.rating_count:
+            st.metric("평균 평점", f"{aggregates.avg_rating:.2f}")
     
-    # 불용어 제거
-    tokens = [token for token in tokens if token not in korean_stopwords and len(token) > 1]
+    with col3:
+        if aggregates.has_dimension('product'):
+            st.metric("제품 수", aggregates.unique_count('product'))
+    
+    with col4:
+        if aggregates.has_dimension('category'):
+            st.metric("카테고리 수", aggregates.unique_count('category'))
+    
+    # 감성 분석
+    if aggregates.sentiment_counts:
+        st.subheader("😊 감성 분석")
+        sentiment_counts = pd.Series(aggregates.sentiment_counts).sort_values(ascending=False)
+        fig_pie, fig_bar = sentiment_charts(sentiment_counts)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(fig_pie, use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(fig_bar, use_container_width=True)
     
-    return ' '.join(tokens)
+    # 키워드 분석
+    keywords = aggregates.keywords()
+    finish_wordcloud = None
+    if keywords:
+        st.subheader("🔍 키워드 분석")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(keyword_chart(keywords), use_container_width=True)
+        
+        with col2:
+            st.write("**키워드 워드클라우드**")
+            finish_wordcloud = create_wordcloud(keywords, WORDCLOUD_OPTIONS)
+    
+    # 제품별/카테고리별 분석
+    for column, title in [('product', "📱 제품별 분석"), ('category', "🏷️ 카테고리별 분석")]:
+        table = aggregates.group_table(column)
+        if table is not None:
+            st.subheader(title)
+            st.dataframe(table, use_container_width=True)
+    
+    # 시간별 분석
+    monthly_sentiment = aggregates.monthly_positive_ratio()
+    if monthly_sentiment is not None and not monthly_sentiment.empty:
+        st.subheader("📅 시간별 분석")
+        st.plotly_chart(monthly_trend_chart(monthly_sentiment), use_container_width=True)
+    
+    # 텍스트 길이 분석
+    length_stats = aggregates.length_stats()
+    if length_stats is not None:
+        st.subheader("📏 텍스트 길이 분석")
+        distribution = aggregates.length_distribution()
+        edges, counts = histogram_bins(distribution.index, weights=distribution.to_numpy())
+        fig_length = histogram_figure(edges, counts, "텍스트 길이 분포", '텍스트 길이')
+        st.plotly_chart(fig_length, use_container_width=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("평균 길이", f"{length_stats['mean']:.1f}")
+        with col2:
+            st.metric("중앙값", f"{length_stats['median']:.1f}")
+        with col3:
+            st.metric("최소 길이", f"{length_stats['min']}")
+        with col4:
+            st.metric("최대 길이", f"{length_stats['max']}")
+    
+    if finish_wordcloud is not None:
+        with profile_stage('wordcloud'):
+            finish_wordcloud()
+
+def upload_chunks(uploaded_file, chunk_size):
+    """업로드 파일을 청크 단위 DataFrame으로 (CSV, .xlsx만 나눠 읽고 그 외 형식은 파일 전체를 한 번에)"""
+    if uploaded_file.name.endswith('.csv'):
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file, chunksize=chunk_size)
+    if uploaded_file.name.endswith('.xlsx'):
+        return iter_excel_chunks(uploaded_file.getvalue(), chunk_size=chunk_size)
+    return [read_table(uploaded_file.getvalue(), uploaded_file.name)]
+
+def upload_progress(uploaded_file):
+    """`upload_chunks`로 읽은 행 수를 진행률(0~1)로 바꾸는 함수
+
+    CSV는 읽은 바이트 위치, .xlsx는 시트 정보에 적힌 행 수 기준이다 (내용을 한 번에 넘기므로
+    파일 위치로는 알 수 없음). 그 외 형식은 한 번에 읽으므로 청크 하나로 끝난다.
+    """
+    if uploaded_file.name.endswith('.csv'):
+        size = uploaded_file.size
+        return lambda rows: min(uploaded_file.tell() / size, 1.0) if size else 0.0
+    if uploaded_file.name.endswith('.xlsx'):
+        total = sheet_rows(uploaded_file.getvalue())
+        return lambda rows: min(rows / total, 1.0) if total else 0.0
+    return lambda rows: 1.0
+
+@profiled('load_approximate')
+def load_approximate(uploaded_file, per_stratum, chunk_size):
+    """파일을 청크 단위로 읽으며 제품/카테고리/월 층화 표본 생성 (업로드 파일 및 표본 크기 기준 캐시)"""
+    key = content_hash('approximate', streaming_key(uploaded_file, chunk_size), per_stratum)
+    sample = stage_cache.get(key)
+    if sample is None:
+        progress = st.progress(0.0, text="표본 추출 중...")
+        fraction = upload_progress(uploaded_file)
+        sample = sample_chunks(
+            upload_chunks(uploaded_file, chunk_size),
+            per_stratum=per_stratum,
+            on_progress=lambda rows: progress.progress(fraction(rows), text=f"표본 추출 중... ({rows:,}행 처리)")
+        )
+        progress.empty()
+        stage_cache.put(key, sample)
+    return sample
+
+def exact_stages(data, file_name, chunk_size, key):
+    """전체 데이터 누적 집계 작업 단계 (끝나면 스트리밍 모드와 같은 키로 캐시)"""
+    def exact(results):
+        if file_name.endswith('.csv'):
+            aggregates = stream_csv(io.BytesIO(data), chunksize=chunk_size)
+        elif file_name.endswith('.xlsx'):
+            aggregates = StreamingAggregates()
+            for chunk in iter_excel_chunks(data, chunk_size=chunk_size):
+                aggregates.update(chunk)
+        else:
+            df = read_table(data, file_name)
+            aggregates = StreamingAggregates()
+            for start in range(0, len(df), chunk_size):
+                aggregates.update(df.iloc[start:start + chunk_size])
+        stage_cache.put(key, aggregates)
+        return aggregates
+    return [('exact', exact)]
+
+EXACT_KEY = 'cfa_exact'
 
-def analyze_sentiment(text):
-    """감성 분석 (TextBlob 사용)"""
-    if pd.isna(text) or text == "":
-        return "중립"
+@profiled('show_approximate_analysis')
+def show_approximate_analysis(uploaded_file, per_stratum, chunk_size):
+    """근사 분석 모드 (층화 표본으로 기존 분석을 실행하고 추정값에 95% 신뢰구간 표시)
+
+    "정확히 계산"을 누르면 전체 데이터를 백그라운드에서 누적 집계하고, 끝나면 정확한 결과로 바꿔 표시한다.
+    """
+    exact_key = streaming_key(uploaded_file, chunk_size)
+    aggregates = stage_cache.get(exact_key)
+    if aggregates is not None:
+        show_streaming_analysis(aggregates, notice="전체 데이터로 계산한 정확한 결과입니다. 행 단위 표, 필터링, 다운로드는 제공되지 않습니다.")
+        return
+    
+    sample = load_approximate(uploaded_file, per_stratum, chunk_size)
+    st.info(
+        f"근사 분석 모드: 전체 {sample.rows:,}행을 제품·카테고리·월 {sample.strata_count:,}개 층으로 나눠 "
+        f"뽑은 표본 {sample.sample_rows:,}행으로 계산한 추정값입니다. ±는 95% 신뢰구간입니다."
+    )
     
-    # 한국어 텍스트를 영어로 번역하여 감성 분석 (간단한 구현)
-    # 실제 프로덕션에서는 한국어 전용 감성 분석 모델 사용 권장
+    # 정확한 계산 (백그라운드 작업, 그동안 근사 결과를 계속 볼 수 있음)
+    job = None
+    if st.session_state.get(EXACT_KEY) == exact_key:
+        job = session_job(
+            st.session_state, exact_key,
+            lambda: exact_stages(uploaded_file.getvalue(), uploaded_file.name, chunk_size, exact_key)
+        )
+        status = st.empty()
+    elif st.button("정확히 계산", help="전체 데이터로 모든 통계를 백그라운드에서 다시 계산합니다."):
+        st.session_state[EXACT_KEY] = exact_key
+        st.rerun()
+    
+    # 표본 전처리 및 감성 분석 (입력이 바뀐 단계만 다시 계산)
+    # 키워드는 감성 단계에 넘긴 데이터로 구해 같은 텍스트 파생 컬럼을 재사용
+    df, date_error = normalize_data(sample.frame())
+    text_df = df
+    if 'feedback_text' in df.columns:
+        df = add_sentiment(df)
+    summary = estimate_summary(sample, df)
     
-    # 간단한 키워드 기반 감성 분석
-    positive_words = ['좋', '편', '빠르', '유용', '친절', '깔끔', '직관', '간단']
-    negative_words = ['느리', '어렵', '오류', '충돌', '문제', '불편', '아프', '작']
+    # 기본 통계 (총 피드백 수, 제품 수, 카테고리 수는 층별 행 수로 정확히 계산)
+    st.subheader("📈 기본 통계")
+    col1, col2, col3, col4 = st.columns(4)
     
-    text_lower = str(text).lower()
+    with col1:
+        st.metric("총 피드백 수", sample.rows)
     
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    with col2:
+        avg_rating, margin = summary['avg_rating']
+        if avg_rating == avg_rating:
+            st.metric("평균 평점", f"{avg_rating:.2f} ± {margin:.2f}")
     
-    if positive_count > negative_count:
-        return "긍정"
-    elif negative_count > positive_count:
-        return "부정"
+    with col3:
+        if 'product' in df.columns:
+            st.metric("제품 수", df['product'].nunique())
+    
+    with col4:
+        if 'category' in df.columns:
+            st.metric("카테고리 수", df['category'].nunique())
+    
+    # 감성 분석 (감성별 수는 표본 가중치로 추정)
+    finish_wordcloud = None
+    if 'feedback_text' in df.columns:
+        st.subheader("😊 감성 분석")
+        ratio, margin = summary['positive_ratio']
+        st.metric("긍정 비율", f"{ratio:.1f}% ± {margin:.1f}%p")
+        fig_pie, fig_bar = sentiment_charts(estimate_sentiment_counts(sample, df))
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.plotly_chart(fig_pie, use_container_width=True)
+        
+        with col2:
+            st.plotly_chart(fig_bar, use_container_width=True)
+        
+        # 키워드 분석 (표본 행렬의 가중 빈도)
+        keywords = term_matrix(text_df, 'feedback_text').top_terms(weights=sample.weights)
+        if keywords:
+            st.subheader("🔍 키워드 분석")
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.plotly_chart(keyword_chart(keywords, title="상위 키워드 빈도 (추정)"), use_container_width=True)
+            
+            with col2:
+                st.write("**키워드 워드클라우드**")
+                finish_wordcloud = create_wordcloud(keywords, WORDCLOUD_OPTIONS)
+    
+    # 제품별/카테고리별 분석
+    for column, title in [('product', "📱 제품별 분석"), ('category', "🏷️ 카테고리별 분석")]:
+        if column in df.columns:
+            st.subheader(title)
+            st.dataframe(estimate_group_table(sample, df, column), use_container_width=True)
+    
+    # 시간별 분석
+    if 'date' in df.columns and date_error is None:
+        monthly_sentiment = estimate_monthly_positive_ratio(sample, df)
+        if monthly_sentiment is not None and not monthly_sentiment.empty:
+            st.subheader("📅 시간별 분석")
+            st.plotly_chart(monthly_trend_chart(monthly_sentiment), use_container_width=True)
+    
+    # 표본 행
+    st.subheader(f"📋 표본 행 ({len(df):,}개)")
+    show_result_grid(df, key='approximate')
+    
+    if finish_wordcloud is not None:
+        with profile_stage('wordcloud'):
+            finish_wordcloud()
+    
+    # 정확한 계산이 끝날 때까지 진행 표시를 갱신 (그 사이 위젯을 바꾸면 바로 다시 실행됨)
+    if job is not None:
+        with profile_stage('job.exact'):
+            while not job.wait('exact', timeout=0.5):
+                if job.finished or job.cancelled:
+                    break
+                status.info(f"전체 데이터로 정확히 계산하는 중... ({job.elapsed:.0f}초)")
+        if job.error is not None:
+            status.error(f"정확한 계산 중 오류가 발생했습니다: {str(job.error)}")
+            del st.session_state[EXACT_KEY]
+        elif 'exact' in job.results:
+            st.rerun()
+
+def store_aggregates():
+    """저장소 전체 통계 (저장소 내용이 바뀌었을 때만 다시 집계)"""
+    key = content_hash('store.aggregates', feedback_store.path, feedback_store.revision())
+    aggregates = stage_cache.get(key)
+    if aggregates is None:
+        aggregates = feedback_store.aggregates()
+        stage_cache.put(key, aggregates)
+    return aggregates
+
+@profiled('show_store_analysis')
+def show_store_analysis(uploaded_file):
+    """피드백 저장소 분석 (업로드 파일은 새 행만 분석해 추가, 통계는 저장소에서 바로 집계)"""
+    if uploaded_file is not None:
+        df, dataset_key, _ = load_data(uploaded_file)
+        if df is None:
+            return
+        progress = st.progress(0.0, text="새 피드백을 분석해 저장하는 중...")
+        result = feedback_store.import_frame(
+            df, dataset_key, uploaded_file.name,
+            on_progress=lambda fraction, rows: progress.progress(
+                fraction, text=f"새 피드백을 분석해 저장하는 중... ({rows:,}행 확인)"
+            )
+        )
+        progress.empty()
+        if result['skipped']:
+            st.info(f"이미 저장소에 추가한 파일입니다. (새 피드백 {result['added']:,}개)")
+        else:
+            st.success(
+                f"새 피드백 {result['added']:,}개를 저장소에 추가했습니다. "
+                f"(중복 {result['rows'] - result['added']:,}개 제외)"
+            )
+    
+    aggregates = store_aggregates()
+    if not aggregates.rows:
+        st.warning("저장소가 비어 있습니다. 파일을 업로드해주세요.")
+        return
+    show_streaming_analysis(
+        aggregates,
+        notice=f"피드백 저장소 모드: 저장된 피드백 {aggregates.rows:,}개 전체의 통계입니다."
+    )
+
+def show_store_panel():
+    """사이드바 피드백 저장소 현황 및 비우기"""
+    with st.sidebar.expander("🗃️ 피드백 저장소", expanded=True):
+        imports = feedback_store.imports()
+        st.caption(f"피드백 {len(feedback_store):,}개, 파일 {len(imports)}개")
+        if not imports.empty:
+            st.dataframe(imports, hide_index=True, use_container_width=True)
+        if st.button("저장소 비우기"):
+            feedback_store.clear()
+            st.rerun()
+
+@cached_stage('grid.order')
+def grid_order(df, column, ascending=True):
+    """결과 표 정렬 순서 (컬럼·방향별로 한 번만 계산)"""
+    return sort_order(df[column], ascending)
+
+@cached_stage('grid.search')
+def grid_search(df, column, query):
+    """결과 표 검색 결과 (검색어별로 한 번만 계산)"""
+    return search_mask(df[column], query)
+
+@cached_stage('search.query')
+def text_search(df, query, rows, dataset_key=None):
+    """필터 결과 안의 텍스트 검색 결과 (점수 순 행 위치, 검색어·필터별로 한 번만 계산)"""
+    return search_index(df, 'feedback_text', dataset_key).search(query, rows)
+
+@profiled('show_result_grid')
+def show_result_grid(df, rows=None, columns=None, key='grid', search_column='feedback_text', ranked=False):
+    """결과 표 (정렬·검색·페이지 나누기는 서버에서 처리하고 현재 페이지만 전송)
+
+    rows는 표시할 행 위치 (None이면 전체), ranked이면 rows가 검색 점수 순서이므로 정렬 기준을
+    고르지 않았을 때 그 순서로 표시한다. 검색·정렬을 적용한 행 위치를 반환한다.
+    """
+    columns = list(df.columns) if columns is None else list(columns)
+    col1, col2, col3, col4, col5 = st.columns([3, 2, 1, 1, 1])
+    
+    with col1:
+        query = ''
+        if search_column in df.columns:
+            query = st.text_input("검색", key=f"{key}_search", placeholder="텍스트 검색")
+    with col2:
+        default_order = '(관련도순)' if ranked else '(원래 순서)'
+        sort_column = st.selectbox("정렬 기준", [default_order] + columns, key=f"{key}_sort")
+    with col3:
+        descending = st.checkbox("내림차순", key=f"{key}_descending")
+    with col4:
+        page_size = st.selectbox("페이지 크기", PAGE_SIZES, key=f"{key}_page_size")
+    with col5:
+        page = st.number_input("페이지", min_value=1, value=1, step=1, key=f"{key}_page")
+    
+    if sort_column == default_order:
+        order = rows if ranked else None
+    else:
+        order = grid_order(df, sort_column, not descending)
+    mask = grid_search(df, search_column, query) if query else None
+    positions = visible_rows(len(df), rows, order, mask)
+    page_rows, page, page_count = page_slice(positions, int(page), page_size)
+    
+    st.dataframe(df.iloc[page_rows][columns], use_container_width=True)
+    if len(positions):
+        start = (page - 1) * page_size
+        st.caption(
+            f"전체 {len(positions):,}개 중 {start + 1:,}–{start + len(page_rows):,}번째 "
+            f"(페이지 {page}/{page_count})"
+        )
     else:
-        return "중립"
-
-def extract_keywords(texts, top_n=10):
-    """키워드 추출"""
-    all_words = []
-    for text in texts:
-        if pd.notna(text):
-            processed_text = preprocess_text(text)
-            words = processed_text.split()
-            all_words.extend(words)
-    
-    # 빈도 계산
-    word_freq = Counter(all_words)
-    
-    # 상위 키워드 반환
-    return dict(word_freq.most_common(top_n))
-
-def create_wordcloud(keywords):
-    """워드클라우드 생성"""
-    if not keywords:
-        return None
-    
-    wordcloud = WordCloud(
-        width=800, 
-        height=400, 
-        background_color='white',
-        font_path='malgun.ttf',  # Windows 기본 한글 폰트
-        max_words=50
-    ).generate_from_frequencies(keywords)
-    
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.imshow(wordcloud, interpolation='bilinear')
-    ax.axis('off')
-    
-    # Streamlit에 표시
-    st.pyplot(fig)
-    plt.close()
+        st.caption("표시할 결과가 없습니다.")
+    return positions
 
-def main():
+def show_memory_report(memory_table):
+    """타입 압축 전후 메모리 비교"""
+    if memory_table is None:
+        return
+    with st.expander("🗜️ 데이터 타입 최적화"):
+        before = memory_table['원래(MB)'].sum()
+        after = memory_table['변환(MB)'].sum()
+        st.metric(
+            "메모리 사용량", f"{after:.2f} MB",
+            delta=f"{after - before:.2f} MB (변환 전 {before:.2f} MB)", delta_color="inverse"
+        )
+        st.dataframe(memory_table, use_container_width=True)
+
+def show_dashboard():
     st.title("📊 고객 피드백 분석 대시보드")
     st.markdown("---")
     
@@ -129,18 +624,86 @@ def main():
     st.sidebar.header("📁 데이터 업로드")
     uploaded_file = st.sidebar.file_uploader(
         "CSV 또는 Excel 파일을 업로드하세요",
-        type=['csv', 'xlsx', 'xls']
+        type=['csv', 'xlsx', 'xls', 'parquet']
     )
+    excel = excel_options(uploaded_file)
+    show_dataset_cache_panel()
     
     # 샘플 데이터 사용 옵션
     use_sample = st.sidebar.checkbox("샘플 데이터 사용", value=True)
     
+    # 유사 중복 피드백 묶기 옵션
+    collapse = st.sidebar.checkbox(
+        "유사 중복 피드백 묶기",
+        value=False,
+        help="복사해 붙였거나 거의 같은 피드백을 한 묶음으로 보고 묶음마다 첫 행만 남겨 분석합니다. "
+             "남긴 행에는 묶음 번호(duplicate_group)와 묶음 행 수(duplicate_count)가 표시됩니다."
+    )
+    
+    # 대용량 CSV 스트리밍 옵션
+    streaming = st.sidebar.checkbox(
+        "대용량 스트리밍 모드 (CSV)",
+        value=False,
+        help="파일 전체를 메모리에 올리지 않고 청크 단위로 읽어 집계합니다."
+    )
+    chunk_size = DEFAULT_CHUNK_SIZE
+    if streaming:
+        chunk_size = st.sidebar.number_input(
+            "청크 크기 (행)", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=10000
+        )
+    
+    # 근사 분석 옵션
+    approximate = st.sidebar.checkbox(
+        "근사 분석 모드 (표본)",
+        value=False,
+        help="파일을 읽으며 제품·카테고리·월별 층화 표본을 뽑아 분석하고 평균 평점, 긍정 비율 등에 "
+             "95% 신뢰구간을 표시합니다. \"정확히 계산\"으로 전체 데이터 결과를 백그라운드에서 구할 수 있습니다."
+    )
+    if approximate:
+        per_stratum = st.sidebar.number_input(
+            "층별 표본 크기 (행)", min_value=50, value=DEFAULT_PER_STRATUM, step=500
+        )
+    
+    # 피드백 저장소 옵션
+    use_store = st.sidebar.checkbox(
+        "피드백 저장소 모드",
+        value=False,
+        help="업로드한 파일의 새 피드백만 분석해 로컬 저장소에 누적하고, 저장소 전체 통계를 표시합니다."
+    )
+    if use_store:
+        try:
+            show_store_analysis(uploaded_file)
+        except Exception as e:
+            st.error(f"저장소 처리 중 오류가 발생했습니다: {str(e)}")
+        show_store_panel()
+        return
+    
+    if uploaded_file is not None and approximate:
+        try:
+            show_approximate_analysis(uploaded_file, int(per_stratum), int(chunk_size))
+        except Exception as e:
+            st.error(f"근사 분석 중 오류가 발생했습니다: {str(e)}")
+        return
+    
+    if uploaded_file is not None and streaming and uploaded_file.name.endswith('.csv'):
+        try:
+            aggregates = load_streaming(uploaded_file, int(chunk_size))
+        except Exception as e:
+            st.error(f"파일 로드 중 오류가 발생했습니다: {str(e)}")
+            return
+        st.success("파일이 성공적으로 업로드되었습니다!")
+        show_streaming_analysis(aggregates)
+        return
+    
+    dataset_key = None
+    memory_table = None
     if uploaded_file is not None:
-        df = load_data(uploaded_file)
+        df, dataset_key, memory_table = load_data(uploaded_file, **excel)
         if df is not None:
             st.success("파일이 성공적으로 업로드되었습니다!")
     elif use_sample:
-        df = pd.read_csv("sample_feedback_data.csv")
+        with open("sample_feedback_data.csv", 'rb') as f:
+            df, memory_table = load_sample_data(f.read())
         st.info("샘플 데이터를 사용하고 있습니다.")
     else:
         st.warning("파일을 업로드하거나 샘플 데이터를 선택해주세요.")
@@ -153,58 +716,59 @@ def main():
     # 데이터 미리보기
     st.subheader("📋 데이터 미리보기")
     st.dataframe(df.head(), use_container_width=True)
+    show_memory_report(memory_table)
+    
+    # 전처리 및 감성 분석 (입력이 바뀐 단계만 다시 계산)
+    # 키워드·검색은 감성 단계에 넘긴 데이터(text_df)로 구해 같은 텍스트 파생 컬럼을 재사용
+    df, date_error = normalize_data(df)
+    text_df = df
+    if 'feedback_text' in df.columns:
+        df = add_sentiment(df, dataset_key)
+    
+    # 유사 중복 피드백을 묶어 감성 분포와 키워드 빈도가 부풀지 않도록 함
+    if collapse and 'feedback_text' in df.columns:
+        total_rows = len(df)
+        df, dataset_key = collapse_duplicates(df, 'feedback_text', dataset_key)
+        text_df = df
+        st.caption(f"유사 중복 피드백 {total_rows - len(df):,}개를 묶어 {len(df):,}개 행으로 분석합니다.")
     
     # 기본 통계
     st.subheader("📈 기본 통계")
     col1, col2, col3, col4 = st.columns(4)
+    stats = summary_stats(df)
     
     with col1:
         st.metric("총 피드백 수", len(df))
     
     with col2:
         if 'rating' in df.columns:
-            avg_rating = df['rating'].mean()
+            avg_rating = stats['avg_rating']
             st.metric("평균 평점", f"{avg_rating:.2f}")
     
     with col3:
         if 'product' in df.columns:
-            unique_products = df['product'].nunique()
+            unique_products = stats['unique_products']
             st.metric("제품 수", unique_products)
     
     with col4:
         if 'category' in df.columns:
-            unique_categories = df['category'].nunique()
+            unique_categories = stats['unique_categories']
             st.metric("카테고리 수", unique_categories)
     
     # 감성 분석
     st.subheader("😊 감성 분석")
     
     if 'feedback_text' in df.columns:
-        # 감성 분석 실행
-        df['sentiment'] = df['feedback_text'].apply(analyze_sentiment)
-        
         # 감성 분포 시각화
-        sentiment_counts = df['sentiment'].value_counts()
+        sentiment_counts = sentiment_distribution(df)
+        fig_pie, fig_bar = sentiment_charts(sentiment_counts)
         
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_pie = px.pie(
-                values=sentiment_counts.values,
-                names=sentiment_counts.index,
-                title="감성 분포",
-                color_discrete_map={'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
-            )
             st.plotly_chart(fig_pie, use_container_width=True)
         
         with col2:
-            fig_bar = px.bar(
-                x=sentiment_counts.index,
-                y=sentiment_counts.values,
-                title="감성별 피드백 수",
-                color=sentiment_counts.index,
-                color_discrete_map={'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
-            )
             st.plotly_chart(fig_bar, use_container_width=True)
         
         # 감성별 상세 분석
@@ -212,71 +776,67 @@ def main():
         sentiment_filter = st.selectbox("감성 선택", ['전체'] + list(sentiment_counts.index))
         
         if sentiment_filter == '전체':
-            filtered_df = df
+            sentiment_rows = None
         else:
-            filtered_df = df[df['sentiment'] == sentiment_filter]
+            sentiment_rows = filter_index(df).query({'sentiment': [sentiment_filter]})
         
-        st.dataframe(filtered_df[['feedback_text', 'sentiment', 'rating']], use_container_width=True)
+        detail_columns = [column for column in ['feedback_text', 'sentiment', 'rating'] if column in df.columns]
+        show_result_grid(df, sentiment_rows, detail_columns, key='sentiment_detail')
     
     # 키워드 분석
     st.subheader("🔍 키워드 분석")
+    finish_wordcloud = None
     
     if 'feedback_text' in df.columns:
         # 키워드 추출
-        keywords = extract_keywords(df['feedback_text'])
+        keywords = column_keywords(text_df, 'feedback_text', dataset_key=dataset_key)
         
         col1, col2 = st.columns(2)
         
         with col1:
             # 상위 키워드 차트
             if keywords:
-                fig_keywords = px.bar(
-                    x=list(keywords.values()),
-                    y=list(keywords.keys()),
-                    orientation='h',
-                    title="상위 키워드 빈도",
-                    labels={'x': '빈도', 'y': '키워드'}
-                )
-                st.plotly_chart(fig_keywords, use_container_width=True)
+                st.plotly_chart(keyword_chart(keywords), use_container_width=True)
         
         with col2:
-            # 워드클라우드
+            # 워드클라우드 (그리는 동안 나머지 페이지를 먼저 표시)
             if keywords:
                 st.write("**키워드 워드클라우드**")
-                create_wordcloud(keywords)
+                finish_wordcloud = create_wordcloud(keywords, WORDCLOUD_OPTIONS)
+        
+        # 세그먼트별 키워드 (같은 행렬을 그룹별로 합산)
+        segment_options = {
+            label: column for column, label in
+            [('product', '제품'), ('category', '카테고리'), ('sentiment', '감성')]
+            if column in df.columns
+        }
+        if keywords and segment_options:
+            segment_label = st.selectbox("세그먼트별 키워드 기준", list(segment_options))
+            segment_frame = segment_keywords(
+                text_df, 'feedback_text', df[segment_options[segment_label]], dataset_key=dataset_key
+            )
+            if not segment_frame.empty:
+                st.plotly_chart(
+                    segment_keyword_chart(segment_frame, segment_label),
+                    use_container_width=True
+                )
     
     # 제품별 분석
     if 'product' in df.columns:
         st.subheader("📱 제품별 분석")
         
-        product_analysis = df.groupby('product').agg({
-            'rating': ['mean', 'count'],
-            'sentiment': lambda x: (x == '긍정').sum() / len(x) * 100
-        }).round(2)
-        
-        product_analysis.columns = ['평균 평점', '피드백 수', '긍정 비율(%)']
+        product_analysis = group_analysis(df, 'product')
         st.dataframe(product_analysis, use_container_width=True)
         
         # 제품별 평점 비교
         if 'rating' in df.columns:
-            fig_product_rating = px.box(
-                df, 
-                x='product', 
-                y='rating',
-                title="제품별 평점 분포"
-            )
-            st.plotly_chart(fig_product_rating, use_container_width=True)
+            st.plotly_chart(product_rating_chart(df), use_container_width=True)
     
     # 카테고리별 분석
     if 'category' in df.columns:
         st.subheader("🏷️ 카테고리별 분석")
         
-        category_analysis = df.groupby('category').agg({
-            'rating': ['mean', 'count'],
-            'sentiment': lambda x: (x == '긍정').sum() / len(x) * 100
-        }).round(2)
-        
-        category_analysis.columns = ['평균 평점', '피드백 수', '긍정 비율(%)']
+        category_analysis = group_analysis(df, 'category')
         st.dataframe(category_analysis, use_container_width=True)
     
     # 시간별 분석 (날짜가 있는 경우)
@@ -284,22 +844,11 @@ def main():
         st.subheader("📅 시간별 분석")
         
         try:
-            df['date'] = pd.to_datetime(df['date'])
-            df['month'] = df['date'].dt.to_period('M')
+            if date_error is not None:
+                raise ValueError(date_error)
             
-            monthly_sentiment = df.groupby('month')['sentiment'].apply(
-                lambda x: (x == '긍정').sum() / len(x) * 100
-            ).reset_index()
-            monthly_sentiment['month'] = monthly_sentiment['month'].astype(str)
-            
-            fig_trend = px.line(
-                monthly_sentiment,
-                x='month',
-                y='sentiment',
-                title="월별 긍정 비율 추이",
-                labels={'sentiment': '긍정 비율(%)', 'month': '월'}
-            )
-            st.plotly_chart(fig_trend, use_container_width=True)
+            monthly_sentiment = monthly_positive_ratio(df)
+            st.plotly_chart(monthly_trend_chart(monthly_sentiment), use_container_width=True)
             
         except Exception as e:
             st.warning(f"날짜 분석 중 오류가 발생했습니다: {str(e)}")
@@ -307,86 +856,89 @@ def main():
     # 필터링 옵션
     st.subheader("🔍 고급 필터링")
     
+    index = filter_index(df)
+    selections = {}
+    rating_range = None
+    
+    # 텍스트 검색 (역색인으로 찾아 아래 필터 조건과 함께 적용)
+    search_query = ''
+    if 'feedback_text' in df.columns:
+        search_query = st.text_input(
+            "텍스트 검색",
+            placeholder='예: 로그인 오류, 배송 OR 포장, 로그*, "앱이 자주 멈"',
+            help="띄어 쓴 단어는 모두 포함, OR(또는 |)로 나눈 묶음은 하나라도 포함, 단어 끝의 *는 접두어, "
+                 "\"따옴표\"는 순서대로 이어지는 구문(마지막 단어는 접두어)으로 찾습니다. "
+                 "결과는 검색어가 많이 나온 순서로 표시됩니다."
+        ).strip()
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        if 'product' in df.columns:
-            selected_products = st.multiselect(
+        if 'product' in index.options:
+            selections['product'] = st.multiselect(
                 "제품 선택",
-                options=df['product'].unique(),
-                default=df['product'].unique()
+                options=index.options['product'],
+                default=index.options['product']
             )
         
-        if 'category' in df.columns:
-            selected_categories = st.multiselect(
+        if 'category' in index.options:
+            selections['category'] = st.multiselect(
                 "카테고리 선택",
-                options=df['category'].unique(),
-                default=df['category'].unique()
+                options=index.options['category'],
+                default=index.options['category']
             )
     
     with col2:
-        if 'rating' in df.columns:
+        if index.rating_bounds is not None:
+            rating_min, rating_max = (int(bound) for bound in index.rating_bounds)
             rating_range = st.slider(
                 "평점 범위",
-                min_value=int(df['rating'].min()),
-                max_value=int(df['rating'].max()),
-                value=(int(df['rating'].min()), int(df['rating'].max()))
+                min_value=rating_min,
+                max_value=rating_max,
+                value=(rating_min, rating_max)
             )
         
-        if 'sentiment' in df.columns:
-            selected_sentiments = st.multiselect(
+        if 'sentiment' in index.options:
+            selections['sentiment'] = st.multiselect(
                 "감성 선택",
-                options=df['sentiment'].unique(),
-                default=df['sentiment'].unique()
+                options=index.options['sentiment'],
+                default=index.options['sentiment']
             )
     
-    # 필터링된 데이터 표시
-    filtered_data = df.copy()
-    
-    if 'product' in df.columns and selected_products:
-        filtered_data = filtered_data[filtered_data['product'].isin(selected_products)]
-    
-    if 'category' in df.columns and selected_categories:
-        filtered_data = filtered_data[filtered_data['category'].isin(selected_categories)]
-    
-    if 'rating' in df.columns:
-        filtered_data = filtered_data[
-            (filtered_data['rating'] >= rating_range[0]) & 
-            (filtered_data['rating'] <= rating_range[1])
-        ]
-    
-    if 'sentiment' in df.columns and selected_sentiments:
-        filtered_data = filtered_data[filtered_data['sentiment'].isin(selected_sentiments)]
-    
-    st.subheader(f"📊 필터링된 결과 ({len(filtered_data)}개)")
-    st.dataframe(filtered_data, use_container_width=True)
+    # 비트맵 연산으로 조건에 맞는 행 위치만 구함 (데이터 복사 없음)
+    rows = index.query(selections, rating_range)
+    if search_query:
+        rows = text_search(text_df, search_query, rows, dataset_key)
+        if not parse_query(search_query):
+            st.caption("검색할 수 있는 단어가 없습니다. 불용어와 한 글자 단어는 접두어(*)로만 찾을 수 있습니다.")
+    
+    st.subheader(f"📊 필터링된 결과 ({len(rows)}개)")
+    show_result_grid(df, rows, key='filtered', ranked=bool(search_query))
+    
+    # 필터링된 결과의 상위 키워드 (행렬의 해당 행만 합산)
+    if 'feedback_text' in df.columns and len(rows):
+        filtered_keywords = term_matrix(text_df, 'feedback_text', dataset_key).top_terms(rows)
+        if filtered_keywords:
+            st.plotly_chart(
+                keyword_chart(filtered_keywords, title="필터링된 결과 상위 키워드"),
+                use_container_width=True
+            )
     
     # 데이터 다운로드
     st.subheader("💾 데이터 다운로드")
     
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        csv = filtered_data.to_csv(index=False, encoding='utf-8-sig')
-        st.download_button(
-            label="CSV 다운로드",
-            data=csv,
-            file_name="filtered_feedback_data.csv",
-            mime="text/csv"
-        )
+    # 버튼을 눌렀을 때만 파일을 만들고, 같은 필터 상태에서는 만든 파일을 재사용
+    show_export_buttons(df, rows, (df, selections, rating_range, search_query), 'filtered_feedback_data')
     
-    with col2:
-        excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            filtered_data.to_excel(writer, index=False, sheet_name='Feedback Data')
-        excel_data = excel_buffer.getvalue()
-        
-        st.download_button(
-            label="Excel 다운로드",
-            data=excel_data,
-            file_name="filtered_feedback_data.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+    if finish_wordcloud is not None:
+        with profile_stage('wordcloud'):
+            finish_wordcloud()
+
+def main():
+    # 성능 측정 여부는 위젯보다 먼저 읽고, 패널은 측정이 끝난 뒤 사이드바 아래에 그림
+    with profile_run(st.session_state.get(PROFILING_KEY, False)) as profiler:
+        show_dashboard()
+    show_profile_panel(profiler)
 
 if __name__ == "__main__":
     main()
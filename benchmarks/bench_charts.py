@@ -0,0 +1,70 @@
+"""차트 전송 크기 비교 (행 전체 전송 vs 서버 집계)
+
+사용법: python benchmarks/bench_charts.py [행 수 ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.charts import box_figure, box_summary, histogram_bins, histogram_figure
+
+SENTIMENT_COLORS = {'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
+
+
+def build_frame(n_rows, seed=0):
+    """텍스트 길이와 감성, 제품, 평점이 있는 n_rows 크기의 데이터"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '텍스트_길이': rng.gamma(4, 12, size=n_rows).astype(int) + 1,
+        '감성': rng.choice(['긍정', '부정', '중립'], size=n_rows),
+        'product': rng.choice(['모바일앱', '웹사이트'], size=n_rows),
+        'rating': rng.integers(1, 6, size=n_rows),
+    })
+
+
+def row_charts(df):
+    """기존 방식: 모든 행을 차트 데이터로 전송"""
+    return [
+        px.histogram(df, x='텍스트_길이', nbins=30),
+        px.box(df, x='감성', y='텍스트_길이', color='감성', color_discrete_map=SENTIMENT_COLORS),
+        px.box(df, x='product', y='rating'),
+    ]
+
+
+def summary_charts(df):
+    """서버 집계 방식: 구간 빈도와 상자 통계만 전송"""
+    edges, counts = histogram_bins(df['텍스트_길이'], nbins=30)
+    return [
+        histogram_figure(edges, counts, "텍스트 길이 분포", '텍스트 길이'),
+        box_figure(box_summary(df['텍스트_길이'], df['감성']), "", '감성', '텍스트_길이',
+                   color_map=SENTIMENT_COLORS),
+        box_figure(box_summary(df['rating'], df['product']), "", 'product', 'rating'),
+    ]
+
+
+def measure(build, df):
+    start = time.perf_counter()
+    figures = build(df)
+    payload = sum(len(figure.to_json()) for figure in figures)
+    return payload, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 500_000]
+    print(f"{'rows':>10} {'rows payload':>14} {'summary payload':>16} {'rows time':>10} {'summary time':>13}")
+    for n_rows in sizes:
+        df = build_frame(n_rows)
+        row_payload, row_time = measure(row_charts, df)
+        summary_payload, summary_time = measure(summary_charts, df)
+        print(f"{n_rows:>10,} {row_payload / 1024:>11,.0f} KB {summary_payload / 1024:>13,.1f} KB "
+              f"{row_time:>9.2f}s {summary_time:>12.3f}s")
+
+
+if __name__ == "__main__":
+    main()
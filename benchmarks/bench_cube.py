@@ -0,0 +1,94 @@
+"""집계 큐브 벤치마크 및 그룹별 표 결과 일치 검사
+
+사용법: python benchmarks/bench_cube.py [행 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.cube import RollupCube
+from cfa.dtypes import compact_frame
+from cfa.sentiment import analyze_sentiment_batch
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+def build_frame(n_rows, seed=0):
+    """샘플 데이터를 반복하고 날짜를 2년으로 넓힌 n_rows 크기의 (전처리 후) 데이터"""
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(SAMPLE_PATH).sample(n_rows, replace=True, random_state=seed)
+    df = compact_frame(df.reset_index(drop=True))
+    dates = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, size=n_rows), unit='D')
+    return df.assign(
+        date=dates,
+        month=dates.to_period('M'),
+        sentiment=analyze_sentiment_batch(df['feedback_text'], categorical=True),
+    )
+
+
+def positive_ratio(sentiments):
+    return (sentiments == '긍정').sum() / len(sentiments) * 100
+
+
+def groupby_tables(df):
+    """기존 방식: 섹션마다 원본 행을 groupby하고 그룹마다 파이썬 함수 호출"""
+    tables = {}
+    for column in ('product', 'category'):
+        analysis = df.groupby(column, observed=True).agg({
+            'rating': ['mean', 'count'],
+            'sentiment': positive_ratio
+        }).round(2)
+        analysis.columns = ['평균 평점', '피드백 수', '긍정 비율(%)']
+        tables[column] = analysis
+    monthly = df.groupby('month')['sentiment'].apply(positive_ratio).reset_index()
+    monthly['month'] = monthly['month'].astype(str)
+    tables['month'] = monthly
+    return tables
+
+
+def cube_tables(cube):
+    tables = {column: cube.group_table(column) for column in ('product', 'category')}
+    tables['month'] = cube.monthly_positive_ratio()
+    return tables
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = build_frame(n_rows)
+
+    expected, grouped = timed(groupby_tables, df)
+    cube, build = timed(RollupCube.from_frame, df)
+    result, rollup = timed(cube_tables, cube)
+
+    mismatches = 0
+    for name in expected:
+        a, b = expected[name], result[name]
+        same_keys = list(a.index if name != 'month' else a['month']) == \
+            list(b.index if name != 'month' else b['month'])
+        a_values = a.select_dtypes('number').to_numpy(float)
+        b_values = b.select_dtypes('number').to_numpy(float)
+        mismatches += not (same_keys and np.allclose(a_values, b_values))
+
+    print(f"rows={n_rows:,} cells={cube.n_cells:,}")
+    print(f"  groupby + python callbacks:  {grouped:.3f}s")
+    print(f"  cube build (one pass):       {build:.3f}s")
+    print(f"  tables from cube (rollup):   {rollup * 1000:.1f} ms")
+    print(f"  speedup (build + rollup): {grouped / (build + rollup):.1f}x")
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""데이터 타입 압축 전후 메모리 및 그룹 집계 시간 비교
+
+사용법: python benchmarks/bench_dtypes.py [행 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.dtypes import compact_frame, memory_mb, parse_dates
+from cfa.sentiment import analyze_sentiment_batch
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+def build_frame(n_rows, seed=0):
+    """샘플 데이터를 반복하고 날짜를 넓힌 n_rows 크기의 데이터 (파일에서 읽은 직후 형태)"""
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(SAMPLE_PATH).sample(n_rows, replace=True, random_state=seed)
+    df = df.reset_index(drop=True)
+    days = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 730, size=n_rows), unit='D')
+    df['date'] = days.strftime('%Y-%m-%d')
+    return df
+
+
+def positive_ratio(sentiments):
+    return (sentiments == '긍정').sum() / len(sentiments) * 100
+
+
+def group_apply(df, column):
+    """기존 방식: 그룹마다 파이썬 함수로 긍정 비율 계산"""
+    analysis = df.groupby(column).agg({
+        'rating': ['mean', 'count'],
+        'sentiment': positive_ratio
+    }).round(2)
+    analysis.columns = ['평균 평점', '피드백 수', '긍정 비율(%)']
+    return analysis
+
+
+def group_vectorized(df, column):
+    """압축 데이터 방식: 긍정 여부를 미리 계산해 합산 (app.group_analysis와 같은 계산)"""
+    grouped = df.assign(_positive=df['sentiment'] == '긍정').groupby(column, observed=True).agg(
+        rating_mean=('rating', 'mean'),
+        rating_count=('rating', 'count'),
+        positive=('_positive', 'sum'),
+        rows=('_positive', 'size'),
+    )
+    return pd.DataFrame({
+        '평균 평점': grouped['rating_mean'],
+        '피드백 수': grouped['rating_count'],
+        '긍정 비율(%)': grouped['positive'] / grouped['rows'] * 100,
+    }).round(2)
+
+
+def timed(func, *args, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    raw = build_frame(n_rows)
+    raw['sentiment'] = analyze_sentiment_batch(raw['feedback_text'])
+
+    compact, compact_time = timed(compact_frame, raw, repeat=1)
+    compact = compact.assign(sentiment=analyze_sentiment_batch(raw['feedback_text'], categorical=True))
+
+    print(f"rows={n_rows:,}")
+    print(f"  memory: {memory_mb(raw):.1f} MB -> {memory_mb(compact):.1f} MB "
+          f"(compact_frame {compact_time:.3f}s)")
+
+    _, inferred = timed(pd.to_datetime, raw['date'], repeat=1)
+    _, explicit = timed(parse_dates, raw['date'], repeat=1)
+    print(f"  date parse: inferred {inferred:.3f}s, explicit format {explicit:.3f}s")
+
+    mismatches = 0
+    for column in ('product', 'category'):
+        expected, before = timed(group_apply, raw, column)
+        result, after = timed(group_vectorized, compact, column)
+        matches = np.allclose(expected.to_numpy(float), result.to_numpy(float)) and \
+            list(expected.index) == list(result.index)
+        mismatches += not matches
+        print(f"  groupby {column}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms "
+              f"({before / after:.1f}x) {'ok' if matches else 'MISMATCH'}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""유사 중복 묶음 속도(행 수에 따른 증가) 및 정확도 검사
+
+사용법: python benchmarks/bench_duplicates.py [최대 행 수] [검사 행 수]
+
+합성 피드백을 최대 행 수의 1/8, 1/4, 1/2, 전체로 늘리며 묶음 시간과 10만 행당 시간을 비교하고,
+앞부분 검사 행 수(기본 3000)만 따로 묶어 정확한 문자 shingle Jaccard 유사도를 모든 쌍에
+대해 계산한 결과와 비교한다. 실제로 비슷한 행이 있는 행이 묶인 비율(재현율)과 묶음의
+각 행이 묶음 대표(첫 행)와 실제로 비슷한 비율(정밀도)이 기준보다 낮으면 실패로 처리한다.
+MinHash 추정 오차가 있으므로 두 비율 모두 유사도 기준에 허용 오차를 두고 센다.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.duplicates import (
+    DEFAULT_SHINGLE_SIZE, DEFAULT_THRESHOLD, cluster_sizes, duplicate_clusters, normalize_text
+)
+from synthetic import build_feedback
+
+# 통과 기준
+MIN_RECALL = 0.9
+MIN_PRECISION = 0.95
+# 유사도 기준 근처의 추정 오차 허용 범위
+TOLERANCE = 0.1
+
+
+def shingles(text, size=DEFAULT_SHINGLE_SIZE):
+    """정규화한 텍스트의 문자 shingle 집합 (`cfa.duplicates`와 같은 규칙)"""
+    text = normalize_text(text)
+    if not text:
+        return frozenset()
+    if len(text) < size:
+        return frozenset([text])
+    return frozenset(text[i:i + size] for i in range(len(text) - size + 1))
+
+
+def jaccard(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def check_accuracy(texts, threshold=DEFAULT_THRESHOLD):
+    """(재현율, 정밀도, 실제 중복 행 수) 모든 쌍의 정확한 유사도와 비교
+
+    재현율은 유사도가 기준 + 허용 오차 이상인 다른 행이 있는 행(정규화한 텍스트가 같은 행
+    포함) 중 혼자가 아닌 묶음에 든 비율, 정밀도는 묶음의 행 중 대표와의 유사도가
+    기준 - 허용 오차 이상인 비율이다.
+    """
+    clusters = duplicate_clusters(texts, threshold=threshold)
+    sizes = cluster_sizes(clusters)
+    sets = [shingles(text) for text in texts]
+    # 같은 shingle 집합의 행은 한 번만 비교
+    distinct = {}
+    for row, items in enumerate(sets):
+        if items:
+            distinct.setdefault(items, []).append(row)
+    groups = list(distinct.items())
+    duplicated = set()
+    for i, (left, left_rows) in enumerate(groups):
+        if len(left_rows) > 1:
+            duplicated.update(left_rows)
+        for right, right_rows in groups[i + 1:]:
+            if jaccard(left, right) >= threshold + TOLERANCE:
+                duplicated.update(left_rows)
+                duplicated.update(right_rows)
+
+    representatives = {}
+    for row, cluster in enumerate(clusters):
+        if cluster >= 0:
+            representatives.setdefault(cluster, row)
+    members = [(row, representatives[cluster]) for row, cluster in enumerate(clusters) if cluster >= 0]
+    close = sum(jaccard(sets[row], sets[first]) >= threshold - TOLERANCE for row, first in members)
+    recall = sum(sizes[row] > 1 for row in duplicated) / len(duplicated) if duplicated else 1.0
+    precision = close / len(members) if members else 1.0
+    return recall, precision, len(duplicated)
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    check_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+
+    print(f"{'행 수':>10} {'서로 다른 텍스트':>16} {'묶음 수':>10} {'최대 묶음':>9} {'시간(s)':>8} {'10만 행당(s)':>12}")
+    timings = []
+    for rows in [n_rows // 8, n_rows // 4, n_rows // 2, n_rows]:
+        texts = build_feedback(rows, unique_texts=rows)['feedback_text']
+        start = time.perf_counter()
+        clusters = duplicate_clusters(texts)
+        seconds = time.perf_counter() - start
+        timings.append((rows, seconds))
+        valid = clusters[clusters >= 0]
+        print(f"{rows:>10,} {texts.nunique():>16,} {valid.max() + 1:>10,} {np.bincount(valid).max():>9,} "
+              f"{seconds:>8.2f} {seconds / rows * 100_000:>12.3f}")
+    (small_rows, small_seconds), (large_rows, large_seconds) = timings[0], timings[-1]
+    print(f"  행 수 {large_rows / small_rows:.0f}배 -> 시간 {large_seconds / small_seconds:.1f}배")
+
+    texts = build_feedback(check_rows, unique_texts=check_rows, seed=1)['feedback_text']
+    recall, precision, duplicated = check_accuracy(texts)
+    print(f"  정확도 검사 ({check_rows:,}행, 중복 행 {duplicated:,}개): 재현율 {recall:.3f}, 정밀도 {precision:.3f}")
+    mismatches = int(recall < MIN_RECALL) + int(precision < MIN_PRECISION)
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Excel 읽기 속도·메모리 비교 (기존 pd.read_excel vs 읽기 전용 스트리밍 + 컬럼 선택)
+
+사용법: python benchmarks/bench_excel.py [행 수 ...]
+
+CRM 내보내기처럼 분석에 쓰지 않는 컬럼이 많은 합성 피드백 Excel 파일을 만들어
+파일 전체 읽기(read_excel), 스트리밍으로 전체 컬럼 읽기, 분석 컬럼만 골라 읽기,
+분석 컬럼만 청크 단위로 읽고 버리기(누적 집계처럼)의 시간과 최대 메모리(tracemalloc)를
+비교하고, 읽은 내용이 read_excel 결과(같은 컬럼)와 같은지 확인한다.
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.excel import DEFAULT_COLUMNS, iter_excel_chunks, read_excel_columns
+from cfa.export import write_xlsx
+from synthetic import build_feedback
+
+# 분석에 쓰는 컬럼
+ANALYSIS_COLUMNS = list(DEFAULT_COLUMNS)
+
+CHUNK_SIZE = 10_000
+
+
+def build_export(n_rows, seed=0):
+    """분석 컬럼 외에 고객·주문 정보 컬럼이 붙은 CRM 내보내기 형태의 데이터"""
+    rng = np.random.default_rng(seed)
+    df = build_feedback(n_rows, seed=seed)
+    ids = rng.integers(0, 10**8, size=n_rows)
+    return df.assign(
+        customer_id=ids,
+        order_id=rng.integers(0, 10**10, size=n_rows),
+        email=[f'user{i}@example.com' for i in ids],
+        channel=rng.choice(['앱', '웹', '전화', '이메일'], size=n_rows),
+        region=rng.choice(['서울', '경기', '부산', '대구', '광주'], size=n_rows),
+        agent=rng.choice([f'상담원{i}' for i in range(50)], size=n_rows),
+        memo=rng.choice(['', '재문의 예정', '환불 요청 접수, 처리 중', '담당 부서 전달 완료'], size=n_rows),
+        amount=rng.integers(1000, 500_000, size=n_rows),
+    )
+
+
+def count_chunks(data, columns):
+    """청크를 읽자마자 버리고 행 수만 셈 (스트리밍 집계의 메모리 사용 형태)"""
+    return sum(len(chunk) for chunk in iter_excel_chunks(data, columns=columns, chunk_size=CHUNK_SIZE))
+
+
+def measure(read, *args):
+    """결과, 걸린 시간(초), 최대 메모리(MB)
+
+    tracemalloc은 실행을 느리게 하므로 시간과 메모리는 따로 한 번씩 측정한다.
+    """
+    start = time.perf_counter()
+    result = read(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    read(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 40_000]
+    mismatches = 0
+    print(f"{'rows':>9} {'method':>22} {'time':>8} {'peak':>10}")
+    for n_rows in sizes:
+        data = write_xlsx(build_export(n_rows))
+        results = {
+            'read_excel': measure(lambda: pd.read_excel(io.BytesIO(data))),
+            'stream (all columns)': measure(read_excel_columns, data),
+            'stream (5 columns)': measure(read_excel_columns, data, None, ANALYSIS_COLUMNS),
+            'chunks (5 columns)': measure(count_chunks, data, ANALYSIS_COLUMNS),
+        }
+        print(f"{n_rows:>9,} (파일 {len(data) / 1024**2:.1f} MB)")
+        for name, (_, elapsed, peak) in results.items():
+            print(f"{'':>9} {name:>22} {elapsed:>7.2f}s {peak:>7.1f} MB")
+
+        expected = results['read_excel'][0]
+        if not results['stream (all columns)'][0].equals(expected):
+            print("  전체 컬럼 읽기 결과가 read_excel과 다릅니다")
+            mismatches += 1
+        if not results['stream (5 columns)'][0].equals(expected[ANALYSIS_COLUMNS]):
+            print("  컬럼 선택 읽기 결과가 read_excel과 다릅니다")
+            mismatches += 1
+        if results['chunks (5 columns)'][0] != len(expected):
+            print("  청크 행 수가 read_excel과 다릅니다")
+            mismatches += 1
+
+    print(f"mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""내보내기 속도·메모리 비교 (기존 to_csv / ExcelWriter vs 청크 단위 쓰기)
+
+사용법: python benchmarks/bench_export.py [행 수 ...]
+
+필터링된 행(평점 3 이상)을 내보낼 때 걸리는 시간과 최대 메모리(tracemalloc)를
+형식별로 비교하고, 새 방식의 CSV 바이트와 Excel 읽기 결과가 기존 방식과 같은지 확인한다.
+"""
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.dtypes import compact_frame
+from cfa.export import export_rows
+
+WORDS = ['배송', '빠르고', '만족합니다', '앱이', '자주', '멈춰요', '가격이', '비싸요', '디자인이', '깔끔합니다']
+
+
+def build_frame(n_rows, seed=0):
+    """앱에서 다루는 컬럼 구성과 같은 n_rows 크기의 데이터"""
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=n_rows), unit='D')
+    words = np.array(WORDS, dtype=object)
+    texts = [' '.join(words[rng.integers(0, len(WORDS), size=5)]) for _ in range(n_rows)]
+    df = pd.DataFrame({
+        'date': dates,
+        'product': rng.choice(['모바일앱', '웹사이트'], size=n_rows),
+        'category': rng.choice(['UI', '기능', '버그', '성능'], size=n_rows),
+        'feedback_text': texts,
+        'rating': rng.integers(1, 6, size=n_rows),
+        'sentiment': rng.choice(['긍정', '부정', '중립'], size=n_rows),
+    })
+    df['month'] = df['date'].dt.to_period('M')
+    return compact_frame(df)
+
+
+def old_csv(df, rows):
+    return df.iloc[rows].to_csv(index=False, encoding='utf-8-sig').encode('utf-8-sig')
+
+
+def old_xlsx(df, rows):
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        df.iloc[rows].to_excel(writer, index=False, sheet_name='Feedback Data')
+    return buffer.getvalue()
+
+
+def measure(write, *args):
+    """결과 바이트, 걸린 시간(초), 최대 메모리(MB)
+
+    tracemalloc은 실행을 느리게 하므로 시간과 메모리는 따로 한 번씩 측정한다.
+    """
+    start = time.perf_counter()
+    data = write(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    write(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return data, elapsed, peak
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 200_000]
+    mismatches = 0
+    print(f"{'rows':>9} {'format':>12} {'time':>8} {'peak':>10} {'size':>10}")
+    for n_rows in sizes:
+        df = build_frame(n_rows)
+        rows = np.flatnonzero(df['rating'].to_numpy() >= 3)
+        results = {
+            'csv (old)': measure(old_csv, df, rows),
+            'csv': measure(export_rows, df, rows, 'csv'),
+            'xlsx (old)': measure(old_xlsx, df, rows),
+            'xlsx': measure(export_rows, df, rows, 'xlsx'),
+            'parquet': measure(export_rows, df, rows, 'parquet'),
+        }
+        for name, (data, elapsed, peak) in results.items():
+            print(f"{len(rows):>9,} {name:>12} {elapsed:>7.2f}s {peak:>7.1f} MB {len(data) / 1024**2:>7.1f} MB")
+
+        if results['csv'][0] != results['csv (old)'][0]:
+            print("  CSV 바이트가 기존 방식과 다릅니다")
+            mismatches += 1
+        if n_rows <= 50_000:
+            # Excel 읽기는 느리므로 작은 크기에서만 비교
+            old = pd.read_excel(io.BytesIO(results['xlsx (old)'][0]))
+            new = pd.read_excel(io.BytesIO(results['xlsx'][0]))
+            if not old.equals(new):
+                print("  Excel 내용이 기존 방식과 다릅니다")
+                mismatches += 1
+        parquet = pd.read_parquet(io.BytesIO(results['parquet'][0]))
+        if not parquet.equals(df.iloc[rows].reset_index(drop=True)):
+            print("  Parquet 내용이 원본과 다릅니다")
+            mismatches += 1
+
+    print(f"불일치: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""고급 필터링 비트맵 인덱스 벤치마크 및 결과 일치 검사
+
+사용법: python benchmarks/bench_filters.py [행 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.filter_index import FilterIndex
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+def build_frame(n_rows, seed=0):
+    """샘플 데이터를 반복하고 감성/결측값을 섞은 n_rows 크기의 데이터"""
+    rng = np.random.default_rng(seed)
+    df = pd.read_csv(SAMPLE_PATH).sample(n_rows, replace=True, random_state=seed)
+    df = df.reset_index(drop=True)
+    df['sentiment'] = rng.choice(['긍정', '부정', '중립'], size=n_rows)
+    df.loc[rng.integers(0, n_rows, size=20), 'product'] = np.nan
+    df.loc[rng.integers(0, n_rows, size=20), 'rating'] = np.nan
+    return df
+
+
+def mask_filter(df, selections, rating_range):
+    """기존 방식: 복사 후 isin/범위 비교를 차례로 적용"""
+    filtered = df.copy()
+    for column, values in selections.items():
+        if values:
+            filtered = filtered[filtered[column].isin(values)]
+    filtered = filtered[(filtered['rating'] >= rating_range[0]) & (filtered['rating'] <= rating_range[1])]
+    return df.index.get_indexer(filtered.index)
+
+
+def random_queries(index, n_queries, seed=0):
+    rng = np.random.default_rng(seed)
+    low, high = (int(bound) for bound in index.rating_bounds)
+    queries = []
+    for _ in range(n_queries):
+        selections = {
+            column: [value for value in options if rng.random() < 0.6]
+            for column, options in index.options.items()
+        }
+        bounds = sorted(rng.integers(low, high + 1, size=2).tolist())
+        queries.append((selections, tuple(bounds)))
+    return queries
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = build_frame(n_rows)
+
+    start = time.perf_counter()
+    index = FilterIndex(df)
+    build = time.perf_counter() - start
+
+    queries = random_queries(index, 20)
+    start = time.perf_counter()
+    expected = [mask_filter(df, *query) for query in queries]
+    masks = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = [index.query(*query) for query in queries]
+    bitmaps = time.perf_counter() - start
+
+    mismatches = sum(not np.array_equal(a, b) for a, b in zip(expected, result))
+    print(f"rows={n_rows:,} queries={len(queries)}")
+    print(f"  index build:          {build:.3f}s")
+    print(f"  copy + isin masks:    {masks:.3f}s")
+    print(f"  bitmap index query:   {bitmaps:.3f}s")
+    print(f"  speedup: {masks / bitmaps:.1f}x")
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
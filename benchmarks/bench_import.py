@@ -0,0 +1,96 @@
+"""앱 시작 시 모듈 import 시간 보고 (`python -X importtime` 기준)
+
+사용법: python benchmarks/bench_import.py [비교할 git 리비전] [반복 횟수]
+
+각 진입점(app.py, streamlit_app.py)의 최상위 import 문만 새 프로세스에서 실행해
+전체 import 시간과 가장 오래 걸린 패키지를 보여 준다. 리비전을 주면 그 시점의
+코드와 비교한다. 무거운 렌더러·분석 패키지가 시작할 때 불러와지면 실패로 처리한다.
+"""
+import ast
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+ENTRY_POINTS = ['app.py', 'streamlit_app.py']
+
+# 해당 화면을 그릴 때만 불러와야 하는 패키지
+LAZY_MODULES = ['textblob', 'nltk', 'matplotlib', 'wordcloud', 'sklearn', 'scipy', 'openpyxl', 'plotly.express']
+
+
+def import_code(path):
+    """파일의 최상위 import 문만 모은 코드"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return ast.unparse(ast.Module(body=imports, type_ignores=[]))
+
+
+def measure(root, entry_point):
+    """(전체 import 시간 초, 최상위 패키지별 누적 시간 dict, 불러온 지연 대상 패키지 목록)"""
+    code = import_code(os.path.join(root, entry_point))
+    code += f"\nimport json, sys\nprint(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=root, capture_output=True, text=True, check=True,
+    )
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        # 들여쓰기가 없는 항목이 최상위 import (누적 시간에 하위 import 포함)
+        if not name[1:].startswith(' '):
+            packages[name.strip()] = int(cumulative) / 1e6
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return sum(packages.values()), packages, loaded
+
+
+def best_of(root, entry_point, repeat):
+    """반복 측정 중 가장 빠른 결과 (디스크 캐시 등 잡음 제거)"""
+    return min((measure(root, entry_point) for _ in range(repeat)), key=lambda result: result[0])
+
+
+def checkout(revision):
+    """git 리비전의 파일을 임시 디렉터리에 풀어 경로 반환"""
+    directory = tempfile.mkdtemp()
+    archive = subprocess.run(
+        ['git', 'archive', revision], cwd=ROOT, capture_output=True, check=True
+    ).stdout
+    with tempfile.TemporaryFile() as f:
+        f.write(archive)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(directory, filter='data')
+    return directory
+
+
+def main():
+    revision = sys.argv[1] if len(sys.argv) > 1 else None
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    baseline_root = checkout(revision) if revision else None
+
+    failures = 0
+    for entry_point in ENTRY_POINTS:
+        total, packages, loaded = best_of(ROOT, entry_point, repeat)
+        print(f"{entry_point}: {total:.2f}s")
+        for name, seconds in sorted(packages.items(), key=lambda item: -item[1])[:8]:
+            print(f"  {name:<28} {seconds:6.3f}s")
+        if baseline_root is not None and os.path.exists(os.path.join(baseline_root, entry_point)):
+            baseline, _, baseline_loaded = best_of(baseline_root, entry_point, repeat)
+            print(f"  {revision}: {baseline:.2f}s -> {total:.2f}s ({(total / baseline - 1) * 100:+.0f}%)")
+            print(f"  {revision}에서 시작 시 불러오던 패키지: {', '.join(baseline_loaded) or '-'}")
+        if loaded:
+            print(f"  시작 시 불러온 지연 대상 패키지: {', '.join(loaded)}")
+            failures += 1
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""텍스트 분석 병렬 처리 확장성 (프로세스 수 1 → N) 및 직렬 결과 일치 검사
+
+사용법: python benchmarks/bench_parallel.py [행 수] [최대 프로세스 수] [파티션 크기]
+
+프로세스 수마다 풀을 미리 띄운 뒤(시작 시간 제외) 감성/토큰/길이와 토큰 빈도를
+계산한 시간을 측정하고, 결과가 직렬 처리와 같은지 확인한다.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.parallel import analyze_texts
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+def build_texts(n_rows, seed=0):
+    """샘플 피드백 문장을 조합해 n_rows 크기의 (대부분 고유한) 텍스트 컬럼 생성"""
+    rng = np.random.default_rng(seed)
+    sentences = pd.read_csv(SAMPLE_PATH)['feedback_text'].tolist()
+    texts = [
+        ' '.join(rng.choice(sentences, size=rng.integers(1, 4))) + f' (#{i})'
+        for i in range(n_rows)
+    ]
+    for i in rng.integers(0, n_rows, size=100):
+        texts[i] = np.nan
+    return pd.Series(texts, dtype=object, name='feedback_text')
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    partition_size = int(sys.argv[3]) if len(sys.argv) > 3 else 50_000
+    texts = build_texts(n_rows)
+
+    start = time.perf_counter()
+    expected, expected_counts = analyze_texts(texts, workers=1, keywords=True)
+    serial = time.perf_counter() - start
+    print(f"rows={n_rows:,} partition={partition_size:,} cpu={os.cpu_count()}")
+    print(f"  workers= 1 (serial): {serial:6.2f}s")
+
+    mismatches = 0
+    workers = 2
+    while workers <= max(max_workers, 2):
+        # 풀 시작(spawn) 시간은 제외
+        analyze_texts(texts.iloc[:2 * partition_size], workers=workers, partition_size=partition_size)
+        start = time.perf_counter()
+        features, counts = analyze_texts(
+            texts, workers=workers, partition_size=partition_size, keywords=True
+        )
+        elapsed = time.perf_counter() - start
+        same = features.equals(expected) and counts == expected_counts \
+            and counts.most_common(50) == expected_counts.most_common(50)
+        mismatches += not same
+        print(f"  workers={workers:2d}:          {elapsed:6.2f}s  speedup {serial / elapsed:4.1f}x  "
+              f"{'일치' if same else '불일치'}")
+        if workers >= max_workers:
+            break
+        workers = min(workers * 2, max_workers)
+
+    print(f"mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
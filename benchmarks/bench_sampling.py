@@ -0,0 +1,88 @@
+"""근사 분석 모드 층화 표본 속도 및 추정값 신뢰구간 검사
+
+사용법: python benchmarks/bench_sampling.py [행 수] [층별 표본 크기] [반복 횟수]
+
+합성 피드백을 청크 단위로 읽어 층화 표본을 만드는 시간을 재고, 전체 데이터로 계산한
+평균 평점, 긍정 비율, 제품·카테고리별 평균 평점과 표본 추정값을 비교한다. 난수 시드를
+바꿔 반복 횟수만큼 표본을 다시 뽑아 95% 신뢰구간이 전체 데이터 값을 포함한 비율을
+세고, 기준보다 낮으면 실패로 처리한다. 감성은 전체 데이터에 한 번만 계산해 둔다.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.sampling import estimate_group_table, estimate_summary, sample_chunks
+from cfa.sentiment import analyze_sentiment_batch
+from synthetic import build_feedback
+
+CHUNK_SIZE = 100_000
+# 통과 기준 (95% 신뢰구간이므로 무작위 오차를 감안해 낮춤)
+MIN_COVERAGE = 0.9
+
+
+def chunks(df, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def exact_values(df):
+    """전체 데이터로 계산한 (지표 이름, 값) 목록"""
+    values = [
+        ('평균 평점', df['rating'].mean()),
+        ('긍정 비율', (df['sentiment'] == '긍정').mean() * 100),
+    ]
+    for column in ('product', 'category'):
+        for value, mean in df.groupby(column, observed=True)['rating'].mean().items():
+            values.append((f'{column}={value} 평균 평점', mean))
+    return values
+
+
+def estimated_values(sample, df):
+    """표본으로 추정한 (지표 이름, 값, 95% 신뢰구간 반폭) 목록 (exact_values와 같은 순서)"""
+    frame = df.loc[sample.frame().index]
+    summary = estimate_summary(sample, frame)
+    values = [('평균 평점', *summary['avg_rating']), ('긍정 비율', *summary['positive_ratio'])]
+    for column in ('product', 'category'):
+        table = estimate_group_table(sample, frame, column)
+        for value, row in table.iterrows():
+            values.append((f'{column}={value} 평균 평점', row['평균 평점'], row['평균 평점 ±']))
+    return values
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    per_stratum = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    df = build_feedback(n_rows)
+    df['sentiment'] = analyze_sentiment_batch(df['feedback_text'])
+    exact = exact_values(df)
+
+    start = time.perf_counter()
+    sample = sample_chunks(chunks(df), per_stratum=per_stratum)
+    seconds = time.perf_counter() - start
+    print(f"{n_rows:,}행, 층 {sample.strata_count:,}개, 층별 최대 {per_stratum:,}행 -> 표본 {sample.sample_rows:,}행 "
+          f"({sample.sample_rows / n_rows:.1%}), {seconds:.2f}s")
+
+    print(f"{'지표':<28} {'전체':>8} {'추정':>8} {'±':>7}")
+    for (name, value), (_, estimate, margin) in zip(exact, estimated_values(sample, df)):
+        print(f"{name:<28} {value:>8.3f} {estimate:>8.3f} {margin:>7.3f}")
+
+    covered = total = 0
+    for seed in range(1, repeats + 1):
+        sample = sample_chunks(chunks(df), per_stratum=per_stratum, seed=seed)
+        for (_, value), (_, estimate, margin) in zip(exact, estimated_values(sample, df)):
+            covered += abs(estimate - value) <= margin
+            total += 1
+    coverage = covered / total
+    print(f"  신뢰구간 포함 비율 (시드 {repeats}개, 지표 {total:,}개): {coverage:.3f}")
+    mismatches = int(coverage < MIN_COVERAGE)
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
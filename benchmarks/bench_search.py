@@ -0,0 +1,137 @@
+"""역색인 전문 검색 속도·색인 크기 및 결과 일치 검사
+
+사용법: python benchmarks/bench_search.py [행 수]
+
+합성 피드백의 토큰으로 색인을 만든 뒤 AND/OR/접두어/구문 접두어 검색어마다
+색인 검색 시간과 기존 방식(텍스트 컬럼 `str.contains` 전체 탐색) 시간을 비교하고,
+검색 결과와 순위(점수 내림차순, 같은 점수는 행 순서)가 토큰 목록을 한 행씩
+확인한 결과와 같은지 검사한다.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.search_index import SearchIndex, parse_query
+from cfa.term_matrix import TermMatrix
+from cfa.text import tokenize
+from synthetic import build_feedback
+
+
+def build_queries(index, token_strings, seed=0):
+    """데이터에 실제로 있는 단어로 만든 검색어 (흔한 단어, 드문 단어, 조합, 접두어, 구문)"""
+    rng = np.random.default_rng(seed)
+    frequencies = np.array([index.document_frequency(term_id) for term_id in range(len(index.vocabulary))])
+    by_frequency = np.argsort(-frequencies, kind='stable')
+    common = index.vocabulary[by_frequency[:2]]
+    rare = index.vocabulary[by_frequency[len(by_frequency) // 2]]
+    rows = [tokens.split() for tokens in token_strings if len(tokens.split()) >= 3]
+    phrase = rows[rng.integers(len(rows))]
+    return [
+        common[0],
+        rare,
+        f"{common[0]} {common[1]}",
+        f"{common[0]} OR {rare}",
+        f"{common[1][:1]}*",
+        f"{common[0]} {rare} | {common[1][:2]}*",
+        f'"{phrase[0]} {phrase[1]} {phrase[2][:1]}"',
+    ]
+
+
+def reference_search(token_lists, query):
+    """행마다 토큰 목록을 확인해 검색어에 맞는 행과 점수를 구함 (색인과 같은 규칙)"""
+    def clause_score(tokens, clause):
+        if clause[0] == 'term':
+            return tokens.count(clause[1])
+        if clause[0] == 'prefix':
+            return sum(token.startswith(clause[1]) for token in tokens)
+        terms, prefix = list(clause[1]), clause[2]
+        width = len(terms)
+        occurrences = sum(
+            tokens[i:i + width] == terms and tokens[i + width].startswith(prefix)
+            for i in range(len(tokens) - width)
+        )
+        return occurrences * (width + 1)
+
+    groups = parse_query(query)
+    rows, scores = [], []
+    for row, tokens in enumerate(token_lists):
+        total, matched = 0, False
+        for group in groups:
+            group_scores = [clause_score(tokens, clause) for clause in group]
+            if all(group_scores):
+                total += sum(group_scores)
+                matched = True
+        if matched:
+            rows.append(row)
+            scores.append(total)
+    rows, scores = np.array(rows, dtype=np.int64), np.array(scores, dtype=np.int64)
+    return rows[np.lexsort((rows, -scores))]
+
+
+def scan_search(texts, query):
+    """기존 방식: 검색어의 단어마다 텍스트 컬럼 전체를 부분 문자열로 탐색"""
+    groups = [
+        [(clause[1] if clause[0] != 'phrase' else ' '.join(clause[1])) for clause in group]
+        for group in parse_query(query)
+    ]
+    mask = np.zeros(len(texts), dtype=bool)
+    for group in groups:
+        group_mask = np.ones(len(texts), dtype=bool)
+        for word in group:
+            group_mask &= texts.str.contains(word, case=False, regex=False, na=False).to_numpy()
+        mask |= group_mask
+    return np.flatnonzero(mask)
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = build_feedback(n_rows)
+    texts = df['feedback_text']
+    token_strings = tokenize(texts)
+
+    start = time.perf_counter()
+    matrix = TermMatrix.from_tokens(token_strings)
+    matrix_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    index = SearchIndex(matrix)
+    index_seconds = time.perf_counter() - start
+    uncompressed = matrix.matrix.indices.nbytes + matrix.matrix.data.nbytes + matrix.matrix.indptr.nbytes
+
+    print(f"rows={n_rows:,} terms={len(index.vocabulary):,}")
+    print(f"  term matrix build:    {matrix_seconds:.3f}s")
+    print(f"  index build:          {index_seconds:.3f}s")
+    print(f"  index size:           {index.nbytes / 1024**2:.1f} MB "
+          f"(행렬 {uncompressed / 1024**2:.1f} MB, {index.nbytes / uncompressed:.0%})")
+
+    token_lists = [tokens.split() for tokens in token_strings]
+    mismatches = 0
+    for query in build_queries(index, token_strings):
+        start = time.perf_counter()
+        result = index.search(query)
+        search_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        scan_search(texts, query)
+        scan_ms = (time.perf_counter() - start) * 1000
+        expected = reference_search(token_lists, query)
+        same = np.array_equal(result, expected)
+        mismatches += not same
+        print(f"  {query:<28} {len(result):>9,}행  index {search_ms:8.2f}ms  scan {scan_ms:9.1f}ms"
+              + ('' if same else '  불일치'))
+
+    # 필터 결과(행 위치) 안에서만 찾기
+    rows = np.flatnonzero(df['product'].to_numpy() == df['product'].iloc[0])
+    query = build_queries(index, token_strings)[2]
+    filtered = index.search(query, rows)
+    expected = reference_search(token_lists, query)
+    mismatches += not np.array_equal(filtered, expected[np.isin(expected, rows)])
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
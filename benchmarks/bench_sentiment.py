@@ -0,0 +1,67 @@
+"""감성 분석 일괄 처리 벤치마크 및 결과 일치 검사
+
+사용법: python benchmarks/bench_sentiment.py [행 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.sentiment import analyze_sentiment, analyze_sentiment_batch
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+def build_texts(n_rows, seed=0):
+    """샘플 피드백 문장을 조합해 n_rows 크기의 (대부분 고유한) 텍스트 컬럼 생성"""
+    rng = np.random.default_rng(seed)
+    sentences = pd.read_csv(SAMPLE_PATH)['feedback_text'].tolist()
+    texts = [
+        ' '.join(rng.choice(sentences, size=rng.integers(1, 4))) + f' (#{i})'
+        for i in range(n_rows)
+    ]
+    # 결측값, 빈 문자열, 숫자, 겹치는 사전 단어 등 경계 사례 포함
+    edge_cases = [np.nan, "", 123, "좋지만 불편하고 느리다", "작은 글씨", "편리 불편", "GOOD 좋아요"]
+    for i, value in zip(rng.integers(0, n_rows, size=len(edge_cases) * 50), edge_cases * 50):
+        texts[i] = value
+    return pd.Series(texts, dtype=object, name='feedback_text')
+
+
+def build_templated_texts(n_rows, seed=0):
+    """샘플 피드백을 그대로 반복한 (중복이 많은) 텍스트 컬럼 생성"""
+    sentences = pd.read_csv(SAMPLE_PATH)['feedback_text']
+    return sentences.sample(n_rows, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def run(name, texts):
+    start = time.perf_counter()
+    expected = texts.apply(analyze_sentiment)
+    per_row = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = analyze_sentiment_batch(texts)
+    batch = time.perf_counter() - start
+
+    mismatches = int((expected != result).sum())
+    print(f"[{name}] rows={len(texts):,}")
+    print(f"  apply(analyze_sentiment):  {per_row:.3f}s")
+    print(f"  analyze_sentiment_batch:   {batch:.3f}s")
+    print(f"  speedup: {per_row / batch:.1f}x")
+    print(f"  mismatches: {mismatches}")
+    return mismatches
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    mismatches = run("unique", build_texts(n_rows))
+    mismatches += run("templated", build_templated_texts(n_rows))
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""문자 n-gram 감성 모델 속도 및 키워드 사전과의 일치율 비교
+
+사용법: python benchmarks/bench_sentiment_model.py [행 수]
+
+배포한 모델(`cfa/models/sentiment_ngram.npz`)을 불러오는 시간을 재고, 합성 피드백
+(모델 학습에 쓰지 않은 시드)에서 키워드 사전과 모델의 처리 속도(행/초), 두 방식의 라벨
+일치율과 라벨 교차표, 각 방식과 평점 약한 라벨(4점 이상 긍정, 2점 이하 부정, 3점 중립)의
+일치율을 비교한다. 배치 크기를 바꿔도 모델 결과가 같은지 확인하고, 다르거나 모델의
+평점 라벨 일치율이 키워드 사전보다 낮으면 실패로 처리한다.
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.sentiment import SENTIMENT_LABELS, analyze_sentiment_batch, analyze_sentiment_model
+from cfa.sentiment_model import DEFAULT_MODEL_PATH, NgramSentimentModel, rating_labels
+from synthetic import build_feedback
+
+# 배치 단위 계산 결과 비교에 쓰는 작은 배치 크기
+SMALL_BATCH = 1000
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    model, seconds = timed(NgramSentimentModel.load)
+    print(f"모델 {DEFAULT_MODEL_PATH}: {os.path.getsize(DEFAULT_MODEL_PATH) / 1024:,.0f} KB, "
+          f"불러오기 {seconds * 1000:.1f} ms, 해시 공간 2^{model.hash_bits}칸, n-gram {model.sizes}")
+
+    df = build_feedback(n_rows, seed=1, unique_texts=n_rows)
+    texts = df['feedback_text']
+    lexicon, lexicon_seconds = timed(analyze_sentiment_batch, texts)
+    predicted, model_seconds = timed(analyze_sentiment_model, texts, model)
+    print(f"{n_rows:,}행 (고유 텍스트 {texts.nunique():,}개)")
+    print(f"  키워드 사전: {lexicon_seconds:.2f}s ({n_rows / lexicon_seconds:,.0f}행/초)")
+    print(f"  n-gram 모델: {model_seconds:.2f}s ({n_rows / model_seconds:,.0f}행/초)")
+
+    print(f"  두 방식 라벨 일치율: {(lexicon == predicted).mean():.1%}")
+    print(pd.crosstab(lexicon.rename('사전'), predicted.rename('모델')).to_string())
+
+    labels = rating_labels(df['rating'])
+    rated = labels >= 0
+    label_names = SENTIMENT_LABELS[labels[rated]]
+    lexicon_agreement = (lexicon.to_numpy()[rated] == label_names).mean()
+    model_agreement = (predicted.to_numpy()[rated] == label_names).mean()
+    print(f"  평점 라벨 일치율: 키워드 사전 {lexicon_agreement:.1%}, n-gram 모델 {model_agreement:.1%}")
+
+    values = texts.where(texts.notna(), '').astype(str).tolist()
+    small = model.predict_codes(values, batch_size=SMALL_BATCH)
+    mismatches = int((model.predict_codes(values) != small).sum())
+    if mismatches:
+        print(f"  배치 크기 {SMALL_BATCH:,}에서 결과가 다른 행: {mismatches:,}")
+    mismatches += int(model_agreement < lexicon_agreement)
+    print(f"  mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""동시 세션 재실행 지연 시간 부하 테스트 (세션 수별 p50/p95/p99 지연 시간, 프로세스 메모리)
+
+사용법: python benchmarks/bench_sessions.py [--sessions 1,2,4,8] [--clicks 10] [--rows 10k | --file 데이터.csv]
+                                            [--think 0] [--out 결과.json]
+
+Streamlit 서버처럼 한 프로세스 안에서 세션마다 스레드를 하나씩 두고 `AppTest`로 app.py를 실행한다.
+세션은 모두 같은 데이터 파일을 업로드 위젯(`AppTest.file_uploader`)으로 올린 뒤 감성 선택,
+제품/카테고리/감성 필터, 평점 범위를 무작위로 바꾸며, 위젯을 바꿀 때마다 일어나는 스크립트
+재실행 시간과 실행 중 프로세스 상주 메모리(RSS)의 최댓값을 세션 수별로 보고한다. 분석 캐시는
+세션끼리 공유되므로(서버와 같음) 측정 전에 세션 하나로 캐시와 지연 import를 채워 둔다.
+재실행 중 예외가 나면 실패로 처리한다.
+
+Streamlit 버전 고정: `AppTest`는 세션을 하나씩 실행한다고 가정하고 실행마다 전역 Runtime을
+만들고 지우므로, 여러 세션을 동시에 실행하려면 Streamlit 내부(`Runtime.instance`,
+`streamlit.testing.v1.app_test.ScriptCache`)를 바꿔 서버처럼 하나씩만 쓰게 해야 한다
+(`SharedServerState`). 이 부분은 공개 API가 아니므로 requirements.txt의 Streamlit 버전을
+TESTED_STREAMLIT과 같은 버전(1.65.x)으로 고정하고, 다른 버전에서는 내부를 바꾸기 전에 오류
+메시지를 출력하고 측정하지 않고 끝낸다. 준비 실행 뒤에는 세션들이 실제로 공유 Runtime과
+스크립트 캐시를 썼는지 확인해 잘못된 측정을 막는다. Streamlit을 올릴 때는 이 스크립트를 다시
+확인한 뒤 TESTED_STREAMLIT과 requirements.txt를 함께 바꾼다.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+APP_PATH = os.path.abspath(os.path.join(ROOT, 'app.py'))
+
+# 분석 데이터 디스크 캐시는 측정마다 새로 만들고 끝나면 지움 (앱을 불러오기 전에 설정해야 함)
+_cache_dir = tempfile.TemporaryDirectory()
+os.environ['CFA_DATASET_CACHE_DIR'] = _cache_dir.name
+
+sys.path.insert(0, ROOT)
+
+import streamlit
+from streamlit import config
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, app_test, local_script_runner
+
+from cfa.profiling import current_rss
+from synthetic import build_feedback, parse_rows
+
+# RSS 최댓값을 확인하는 간격 (초)
+RSS_INTERVAL = 0.02
+
+# SharedServerState가 바꾸는 Streamlit 내부를 확인한 버전 (major.minor, requirements.txt와 같게)
+TESTED_STREAMLIT = ('1.65',)
+
+# 업로드 위젯 이름 (app.py 사이드바)
+UPLOAD_LABEL = "CSV 또는 Excel 파일을 업로드하세요"
+
+MIME_TYPES = {
+    '.csv': 'text/csv',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.xls': 'application/vnd.ms-excel',
+    '.parquet': 'application/octet-stream',
+}
+
+
+def check_streamlit():
+    """확인한 Streamlit 버전과 내부 구조가 아니면 RuntimeError (내부를 바꾸기 전에 확인)"""
+    version = '.'.join(streamlit.__version__.split('.')[:2])
+    if version not in TESTED_STREAMLIT:
+        raise RuntimeError(
+            f"Streamlit {streamlit.__version__}에서는 동시 세션 측정을 확인하지 않았습니다 "
+            f"(확인한 버전: {', '.join(TESTED_STREAMLIT)}). requirements.txt의 버전으로 설치하거나, "
+            "SharedServerState가 바꾸는 내부 구현을 확인한 뒤 TESTED_STREAMLIT에 추가하세요."
+        )
+    if not (isinstance(Runtime.__dict__.get('instance'), classmethod)
+            and hasattr(app_test, 'ScriptCache') and hasattr(local_script_runner, 'ScriptCache')):
+        raise RuntimeError(f"Streamlit {streamlit.__version__}의 내부 구조가 달라 세션끼리 Runtime을 공유할 수 없습니다.")
+
+
+class SharedServerState:
+    """모든 세션이 가짜 Runtime과 스크립트 캐시를 하나씩만 함께 쓰도록 고정
+
+    AppTest는 실행할 때마다 전역 Runtime과 스크립트 캐시를 새로 만들고 끝나면 Runtime을
+    지우므로, 여러 세션을 동시에 실행하면 다른 세션이 지운 Runtime을 참조하고 스크립트도
+    매번 다시 컴파일한다. 서버에서는 둘 다 프로세스에 하나뿐이다. 실행 중에만 켜는
+    테스트 모드 설정도 다른 세션이 끝나며 끄지 않도록 계속 켜 둔다.
+    """
+
+    def __init__(self):
+        check_streamlit()
+        config.set_option('global.appTest', True)
+        create = Runtime.instance.__func__
+        self.runtimes = []
+        self.script_cache = ScriptCache()
+        self.script_cache_calls = 0
+
+        def instance(cls):
+            if not self.runtimes:
+                self.runtimes.append(create(cls))
+            return self.runtimes[0]
+
+        def script_cache():
+            self.script_cache_calls += 1
+            return self.script_cache
+
+        Runtime.instance = classmethod(instance)
+        Runtime.exists = classmethod(lambda cls: bool(self.runtimes) or cls._instance is not None)
+        app_test.ScriptCache = local_script_runner.ScriptCache = script_cache
+
+    def check(self):
+        """준비 실행에서 공유 상태를 실제로 썼는지 확인 (쓰지 않았으면 오류 메시지)"""
+        if not self.script_cache_calls:
+            return "AppTest가 공유 스크립트 캐시를 쓰지 않았습니다 (Streamlit 내부 구현이 바뀜)."
+        if not self.runtimes or Runtime.instance() is not self.runtimes[0]:
+            return "세션들이 공유 Runtime을 쓰지 않았습니다 (Streamlit 내부 구현이 바뀜)."
+        return None
+
+
+def _widget(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    return None
+
+
+def _subset(options, rng):
+    """비어 있지 않은 무작위 부분 집합"""
+    size = rng.integers(1, len(options) + 1)
+    return [options[i] for i in sorted(rng.choice(len(options), size=size, replace=False))]
+
+
+def click(at, rng):
+    """현재 화면의 필터 위젯 하나를 무작위로 바꾸고 바꾼 위젯 이름을 반환 (바꿀 위젯이 없으면 None)"""
+    actions = []
+    selectbox = _widget(at.selectbox, "감성 선택")
+    if selectbox is not None:
+        actions.append(('sentiment_select', lambda: selectbox.select(rng.choice(selectbox.options))))
+    for name, label in [('product', "제품 선택"), ('category', "카테고리 선택"), ('sentiment', "감성 선택")]:
+        multiselect = _widget(at.multiselect, label)
+        if multiselect is not None and multiselect.options:
+            actions.append((name, lambda widget=multiselect: widget.set_value(_subset(widget.options, rng))))
+    slider = _widget(at.slider, "평점 범위")
+    if slider is not None:
+        def move_slider():
+            low, high = sorted(int(value) for value in rng.integers(slider.min, slider.max + 1, size=2))
+            slider.set_range(low, high)
+        actions.append(('rating', move_slider))
+    if not actions:
+        return None
+    name, action = actions[rng.integers(len(actions))]
+    action()
+    return name
+
+
+def run_session(app_path, upload, clicks, seed, think, timeout, start, records, errors):
+    """세션 하나: 업로드 위젯에 파일을 올려 실행한 뒤 위젯을 clicks번 바꾸며 재실행마다 (동작, 초)를 기록
+
+    upload는 (파일 이름, 내용, MIME 형식)이다. 업로드 전 빈 화면 실행은 측정하지 않는다.
+    """
+    rng = np.random.default_rng(seed)
+    try:
+        at = AppTest.from_file(app_path, default_timeout=timeout).run()
+    except Exception as e:
+        errors.append(f"세션 {seed}: {type(e).__name__}: {e}")
+        start.wait()
+        return
+    uploader = _widget(at.file_uploader, UPLOAD_LABEL)
+    start.wait()
+    if uploader is None:
+        errors.append(f"세션 {seed}: 업로드 위젯이 없습니다.")
+        return
+    uploader.set_value(upload)
+    action = 'upload'
+    for step in range(clicks + 1):
+        if step:
+            if think:
+                time.sleep(rng.uniform(0, think))
+            action = click(at, rng)
+            if action is None:
+                errors.append(f"세션 {seed}: 바꿀 필터 위젯이 없습니다.")
+                return
+        began = time.perf_counter()
+        try:
+            at.run()
+        except Exception as e:
+            errors.append(f"세션 {seed}: {type(e).__name__}: {e}")
+            return
+        records.append((action, time.perf_counter() - began))
+        if at.exception:
+            errors.append(f"세션 {seed} ({action}): {at.exception[0].value}")
+            return
+
+
+class RssSampler:
+    """측정하는 동안 별도 스레드에서 프로세스 상주 메모리 최댓값을 기록"""
+
+    def __init__(self, interval=RSS_INTERVAL):
+        self.interval = interval
+        self.peak = current_rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='cfa-rss', daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            rss = current_rss()
+            if rss is not None and (self.peak is None or rss > self.peak):
+                self.peak = rss
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def _mb(value):
+    return None if value is None else round(value / 1024**2, 1)
+
+
+def run_level(app_path, upload, sessions, clicks, seed, think, timeout):
+    """세션 수 하나의 결과 dict (지연 시간 백분위수는 ms)"""
+    start = threading.Barrier(sessions + 1)
+    records, errors = [], []
+    threads = [
+        threading.Thread(
+            target=run_session, name=f'cfa-session-{number}',
+            args=(app_path, upload, clicks, seed * 1000 + number, think, timeout, start, records, errors),
+        )
+        for number in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    rss_before = current_rss()
+    with RssSampler() as sampler:
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+    latencies = np.array([seconds for _, seconds in records]) * 1000
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    by_action = {}
+    for action, seconds in records:
+        by_action.setdefault(action, []).append(seconds * 1000)
+    return {
+        'sessions': sessions,
+        'reruns': len(records),
+        'p50_ms': round(float(p50), 1),
+        'p95_ms': round(float(p95), 1),
+        'p99_ms': round(float(p99), 1),
+        'max_ms': round(float(latencies.max()), 1) if len(latencies) else None,
+        'reruns_per_second': round(len(records) / elapsed, 2) if elapsed > 0 else None,
+        'rss_before_mb': _mb(rss_before),
+        'rss_peak_mb': _mb(sampler.peak),
+        'actions_p95_ms': {
+            action: round(float(np.percentile(values, 95)), 1) for action, values in sorted(by_action.items())
+        },
+        'errors': errors,
+    }
+
+
+def _format(value, spec):
+    return '-' if value is None or value != value else format(value, spec)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 재실행 지연 시간 부하 테스트")
+    parser.add_argument('--sessions', default='1,2,4,8', help="동시 세션 수 목록 (기본: 1,2,4,8)")
+    parser.add_argument('--clicks', type=int, default=10, help="세션마다 위젯을 바꾸는 횟수 (기본: 10)")
+    parser.add_argument('--rows', default='10k', help="합성 데이터 행 수 (--file이 없을 때, 기본: 10k)")
+    parser.add_argument('--file', help="업로드할 데이터 파일 (.csv, .xlsx, .parquet)")
+    parser.add_argument('--think', type=float, default=0.0, help="위젯을 바꾸기 전 최대 대기 시간(초, 기본: 0)")
+    parser.add_argument('--timeout', type=float, default=300.0, help="재실행 한 번의 제한 시간(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="결과 JSON 파일")
+    args = parser.parse_args()
+
+    try:
+        server_state = SharedServerState()
+    except RuntimeError as e:
+        print(e)
+        sys.exit(2)
+
+    if args.file:
+        name = os.path.basename(args.file)
+        with open(args.file, 'rb') as f:
+            data = f.read()
+    else:
+        name = 'synthetic.csv'
+        data = build_feedback(parse_rows(args.rows), seed=args.seed).to_csv(index=False).encode('utf-8')
+    upload = (name, data, MIME_TYPES.get(os.path.splitext(name)[1].lower(), 'application/octet-stream'))
+    # 재실행마다 나오는 Streamlit 사용 중단 예정 경고와 스크립트 밖 스레드 경고가 결과 표를
+    # 가리지 않도록 (AppTest가 실행마다 로그 수준을 설정값으로 되돌리므로 필터로 막음)
+    for logger in ('streamlit.deprecation_util', 'streamlit.runtime.scriptrunner_utils.script_run_context'):
+        logging.getLogger(logger).addFilter(lambda record: False)
+    # 앱은 샘플 데이터, 폰트 파일을 저장소 루트 기준 경로로 읽음
+    out_path = os.path.abspath(args.out) if args.out else None
+    os.chdir(ROOT)
+
+    print(f"app.py: {name} ({len(data) / 1024**2:.1f} MB), 세션마다 위젯 {args.clicks}회 변경", flush=True)
+    warm_up = run_level(APP_PATH, upload, 1, 1, args.seed, 0, args.timeout)
+    if warm_up['errors']:
+        print(f"준비 실행 실패: {warm_up['errors'][0]}")
+        sys.exit(1)
+    state_error = server_state.check()
+    if state_error is not None:
+        print(f"준비 실행 실패: {state_error}")
+        sys.exit(1)
+
+    print(f"{'세션':>6} {'재실행':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'p99(ms)':>9} {'최대(ms)':>9} "
+          f"{'재실행/초':>9} {'RSS(MB)':>9}")
+    levels = []
+    for sessions in (int(value) for value in args.sessions.split(',')):
+        level = run_level(APP_PATH, upload, sessions, args.clicks, args.seed, args.think, args.timeout)
+        levels.append(level)
+        print(f"{sessions:>6} {level['reruns']:>6} {_format(level['p50_ms'], '9.1f')} "
+              f"{_format(level['p95_ms'], '9.1f')} {_format(level['p99_ms'], '9.1f')} "
+              f"{_format(level['max_ms'], '9.1f')} {_format(level['reruns_per_second'], '9.2f')} "
+              f"{_format(level['rss_peak_mb'], '9.1f')}", flush=True)
+        for error in level['errors'][:3]:
+            print(f"  오류: {error}")
+
+    if out_path:
+        result = {'file': name, 'clicks': args.clicks, 'think': args.think, 'levels': levels}
+        with open(out_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {out_path}")
+
+    errors = sum(len(level['errors']) for level in levels)
+    print(f"errors: {errors}")
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
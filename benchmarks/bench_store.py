@@ -0,0 +1,105 @@
+"""피드백 저장소 증분 추가 속도 및 집계 결과 일치 검사
+
+사용법: python benchmarks/bench_store.py [행 수] [새 행 비율]
+
+지난 파일(행 수 × (1 - 새 행 비율))을 저장소에 넣은 뒤, 새 행이 섞인 이번 파일을
+추가할 때 걸리는 시간을 전체 재분석과 비교하고, 저장소 집계가 스트리밍 집계와 같은지 확인한다.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.store import FeedbackStore
+from cfa.streaming import StreamingAggregates
+
+WORDS = ['배송', '빠르고', '만족합니다', '앱이', '자주', '멈춰요', '가격이', '비싸요', '디자인이', '깔끔합니다']
+
+
+def build_frame(n_rows, seed=0):
+    """행마다 내용이 다른 n_rows 크기의 피드백 데이터"""
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS, dtype=object)
+    texts = [
+        ' '.join(words[rng.integers(0, len(WORDS), size=5)]) + f' {number}'
+        for number in range(n_rows)
+    ]
+    dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=n_rows), unit='D')
+    return pd.DataFrame({
+        'date': dates.strftime('%Y-%m-%d'),
+        'product': rng.choice(['모바일앱', '웹사이트'], size=n_rows),
+        'category': rng.choice(['UI', '기능', '버그', '성능'], size=n_rows),
+        'feedback_text': texts,
+        'rating': rng.integers(1, 6, size=n_rows),
+    })
+
+
+def compare(store_aggregates, reference):
+    """저장소 집계와 스트리밍 집계의 다른 항목 목록"""
+    mismatches = []
+    checks = {
+        'rows': (store_aggregates.rows, reference.rows),
+        'avg_rating': (round(store_aggregates.avg_rating, 9), round(reference.avg_rating, 9)),
+        'sentiment_counts': (store_aggregates.sentiment_counts, reference.sentiment_counts),
+        'keywords': (store_aggregates.keywords(20), reference.keywords(20)),
+        'length_stats': (store_aggregates.length_stats(), reference.length_stats()),
+    }
+    for name, (left, right) in checks.items():
+        if left != right:
+            mismatches.append(name)
+    for column in ('product', 'category'):
+        if not store_aggregates.group_table(column).equals(reference.group_table(column)):
+            mismatches.append(f'group_table({column})')
+    if not store_aggregates.monthly_positive_ratio().equals(reference.monthly_positive_ratio()):
+        mismatches.append('monthly_positive_ratio')
+    return mismatches
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    new_ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    df = build_frame(n_rows)
+    n_old = int(n_rows * (1 - new_ratio))
+
+    path = os.path.join(tempfile.mkdtemp(), 'feedback.sqlite')
+    store = FeedbackStore(path)
+    start = time.perf_counter()
+    store.import_frame(df.iloc[:n_old], 'last-week')
+    full_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = store.import_frame(df, 'this-week')
+    incremental_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    aggregates = store.aggregates()
+    aggregate_time = time.perf_counter() - start
+
+    reference = StreamingAggregates()
+    start = time.perf_counter()
+    reference.update(df)
+    reanalysis_time = time.perf_counter() - start
+
+    print(f"rows: {n_rows:,} (new {result['added']:,})")
+    print(f"  first import ({n_old:,} rows):   {full_time:.2f}s")
+    print(f"  incremental import:          {incremental_time:.2f}s")
+    print(f"  full re-analysis (in memory): {reanalysis_time:.2f}s")
+    print(f"  aggregates from store (SQL):  {aggregate_time:.3f}s")
+    print(f"  store size: {os.path.getsize(path) / 1024**2:.1f} MB")
+
+    mismatches = compare(aggregates, reference)
+    if result['added'] != n_rows - n_old:
+        mismatches.append('added rows')
+    print(f"  mismatches: {len(mismatches)} {mismatches or ''}")
+    os.remove(path)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""단계별 성능 벤치마크 모음 (합성 데이터 규모별 시간·최대 메모리, 기준 결과와 비교)
+
+사용법: python benchmarks/bench_suite.py [--sizes 10k,100k,1m,10m] [--out 결과.json]
+                                         [--baseline 기준.json] [--tolerance 0.2] [--no-memory]
+
+규모마다 `synthetic.build_feedback`으로 데이터를 만든 뒤 파일 로드부터 내보내기까지
+앱과 같은 함수로 각 단계를 실행해 시간(초, 초당 행 수)과 최대 메모리(MB, tracemalloc)를
+JSON으로 저장한다. 기준 결과 파일을 주면 단계별 시간 비율을 보여 주고, 허용 범위보다
+느려진 단계가 있으면 실패로 처리한다. 시간을 잰 뒤 같은 입력으로 한 번 더 실행해
+메모리를 재므로(추적 부담이 시간에 섞이지 않게) --no-memory로 생략할 수 있다.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from cfa.analysis import read_table
+from cfa.cube import RollupCube
+from cfa.dtypes import compact_frame, parse_dates
+from cfa.export import export_rows
+from cfa.sentiment import analyze_sentiment_batch
+from cfa.term_matrix import TermMatrix
+from cfa.text import tokenize
+from cfa.wordcloud_render import render_png
+from synthetic import build_feedback, parse_rows
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# Excel 내보내기는 느리므로 이 행 수까지만 측정
+EXCEL_MAX_ROWS = 100_000
+
+WORDCLOUD_OPTIONS = {
+    'width': 800,
+    'height': 400,
+    'background_color': 'white',
+    'max_words': 50,
+}
+
+
+def _load_data(state):
+    return {'df': compact_frame(read_table(state['csv'], 'synthetic.csv'))}
+
+
+def _normalize(state):
+    dates = parse_dates(state['df']['date'])
+    return {'df': state['df'].assign(date=dates, month=dates.dt.to_period('M'))}
+
+
+def _analyze_sentiment(state):
+    sentiments = analyze_sentiment_batch(state['df']['feedback_text'], categorical=True)
+    return {'df': state['df'].assign(sentiment=sentiments)}
+
+
+def _tokenize(state):
+    return {'tokens': tokenize(state['df']['feedback_text'])}
+
+
+def _extract_keywords(state):
+    matrix = TermMatrix.from_tokens(state['tokens'])
+    return {
+        'keywords': matrix.top_terms(top_n=WORDCLOUD_OPTIONS['max_words']),
+        'segment_keywords': matrix.top_terms_by(state['df']['product'], top_n=5),
+    }
+
+
+def _groupbys(state):
+    cube = RollupCube.from_frame(state['df'])
+    return {'groups': [cube.group_table('product'), cube.group_table('category'), cube.monthly_positive_ratio()]}
+
+
+def _wordcloud(state):
+    font_path = os.path.join(ROOT, 'malgun.ttf')
+    options = dict(WORDCLOUD_OPTIONS, font_path=font_path if os.path.exists(font_path) else None)
+    return {'wordcloud': render_png(state['keywords'], **options)}
+
+
+def _export(export_format):
+    def stage(state):
+        return {f'export_{export_format}': export_rows(state['df'], export_format=export_format)}
+    return stage
+
+
+# (단계 이름, 함수, 행 수에 비례하는 단계인지)
+STAGES = [
+    ('load_data', _load_data, True),
+    ('normalize', _normalize, True),
+    ('analyze_sentiment', _analyze_sentiment, True),
+    ('tokenize', _tokenize, True),
+    ('extract_keywords', _extract_keywords, True),
+    ('groupbys', _groupbys, True),
+    ('wordcloud', _wordcloud, False),
+    ('export_csv', _export('csv'), True),
+    ('export_parquet', _export('parquet'), True),
+    ('export_xlsx', _export('xlsx'), True),
+]
+
+
+def warm_up(n_rows=1000):
+    """처음 호출할 때만 드는 비용(지연 import, 폰트 로드 등)이 첫 규모 결과에 섞이지 않도록 한 번 실행"""
+    state = {'csv': build_feedback(n_rows).to_csv(index=False).encode('utf-8')}
+    for _, stage, _ in STAGES:
+        state.update(stage(state))
+
+
+def run_size(n_rows, seed=0, repeat=3, memory=True):
+    """한 규모의 단계별 결과 {단계: {'seconds', 'rows_per_second', 'peak_mb'}}"""
+    df = build_feedback(n_rows, seed=seed)
+    state = {'csv': df.to_csv(index=False).encode('utf-8')}
+    del df
+    results = {}
+    for name, stage, per_row in STAGES:
+        if name == 'export_xlsx' and n_rows > EXCEL_MAX_ROWS:
+            continue
+        inputs = dict(state)
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            output = stage(inputs)
+            timings.append(time.perf_counter() - start)
+        seconds = min(timings)
+        result = {
+            'seconds': round(seconds, 4),
+            'rows_per_second': round(n_rows / seconds) if per_row and seconds > 0 else None,
+            'peak_mb': None,
+        }
+        if memory:
+            del output
+            gc.collect()
+            tracemalloc.start()
+            output = stage(inputs)
+            result['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024**2, 1)
+            tracemalloc.stop()
+        state.update(output)
+        results[name] = result
+        print(f"  {name:<18} {seconds:8.3f}s"
+              + (f"  {result['rows_per_second']:>12,}행/초" if result['rows_per_second'] else ' ' * 18)
+              + (f"  {result['peak_mb']:8.1f} MB" if memory else ''), flush=True)
+    return results
+
+
+def environment():
+    """결과를 만든 환경 (다른 환경의 기준 결과와 비교할 때 참고)"""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': revision,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline, tolerance, min_seconds=0.05):
+    """기준 결과 대비 시간 비율을 출력하고 허용 범위보다 느려진 (규모, 단계) 목록 반환
+
+    기준과 현재 모두 min_seconds보다 짧은 단계는 측정 잡음이 커서 판정에서 제외한다.
+    """
+    regressions = []
+    print(f"\n기준 결과 비교 (허용 범위 +{tolerance:.0%})")
+    for size, stages in results['sizes'].items():
+        baseline_stages = baseline.get('sizes', {}).get(size, {})
+        for name, result in stages.items():
+            if name not in baseline_stages:
+                continue
+            old, new = baseline_stages[name]['seconds'], result['seconds']
+            ratio = new / old if old else float('inf')
+            slower = ratio > 1 + tolerance and max(old, new) >= min_seconds
+            print(f"  {int(size):>12,}행 {name:<18} {old:8.3f}s -> {new:8.3f}s  x{ratio:5.2f}"
+                  + ('  느려짐' if slower else ''))
+            if slower:
+                regressions.append((size, name))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="단계별 성능 벤치마크 모음")
+    parser.add_argument('--sizes', default='10k,100k', help="행 수 목록 (기본: 10k,100k)")
+    parser.add_argument('--out', default='bench_results.json', help="결과 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON 파일")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="느려짐으로 판정하는 시간 증가 비율")
+    parser.add_argument('--repeat', type=int, default=3, help="단계별 반복 횟수 (가장 빠른 시간 사용, 기본: 3)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="최대 메모리 측정 생략")
+    args = parser.parse_args()
+
+    results = {'environment': environment(), 'sizes': {}}
+    warm_up()
+    for size in args.sizes.split(','):
+        n_rows = parse_rows(size)
+        print(f"rows={n_rows:,}", flush=True)
+        results['sizes'][str(n_rows)] = run_size(n_rows, args.seed, args.repeat, not args.no_memory)
+
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        print(f"regressions: {len(regressions)}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
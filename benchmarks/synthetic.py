@@ -0,0 +1,105 @@
+"""샘플 데이터 분포를 따르는 대용량 합성 피드백 데이터 생성
+
+사용법: python benchmarks/synthetic.py [행 수] [출력 파일(.csv 또는 .parquet)]
+
+행 수는 10000, 100k, 1m, 10M처럼 줄여 쓸 수 있다. 다른 벤치마크에서는
+`from synthetic import build_feedback`으로 불러 쓴다.
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+# 텍스트 앞뒤에 붙이는 짧은 문구 (실제 피드백처럼 길이와 어휘를 다양하게)
+PREFIXES = ['', '', '', '요즘', '업데이트 후', '처음 써봤는데', '전체적으로', '솔직히']
+SUFFIXES = ['', '', '', '개선 부탁드립니다', '감사합니다', '다시 사용할게요', '참고해주세요', '!!']
+
+
+def parse_rows(value):
+    """10k, 1m, 10M 같은 행 수 표기를 정수로"""
+    value = str(value).strip().lower().replace('_', '').replace(',', '')
+    for suffix, scale in (('k', 1_000), ('m', 1_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-len(suffix)]) * scale)
+    return int(value)
+
+
+def _text_pool(sample, size, rng):
+    """피드백 텍스트 후보 (샘플 문장에 다른 문장·어휘·문구를 섞어 size개 생성)
+
+    후보마다 바탕이 된 샘플 행 번호도 함께 반환해 평점·제품·카테고리와 어울리게 한다.
+    """
+    sentences = sample['feedback_text'].to_numpy(dtype=object)
+    vocabulary = np.array(sorted({word for text in sentences for word in text.split()}), dtype=object)
+    ratings = sample['rating'].to_numpy()
+    # 평점이 비슷한(±1) 샘플 문장끼리만 섞어 감성이 뒤바뀌지 않게 함
+    similar = [np.flatnonzero(np.abs(ratings - rating) <= 1) for rating in ratings]
+
+    bases = rng.integers(0, len(sample), size=size)
+    extra_counts = rng.choice([0, 0, 1, 1, 2], size=size)
+    prefixes = rng.choice(PREFIXES, size=size)
+    suffixes = rng.choice(SUFFIXES, size=size)
+    word_counts = rng.integers(0, 3, size=size)
+    texts = np.empty(size, dtype=object)
+    for i in range(size):
+        base = bases[i]
+        parts = [prefixes[i], sentences[base]]
+        parts.extend(sentences[rng.choice(similar[base], size=extra_counts[i])])
+        parts.extend(vocabulary[rng.integers(0, len(vocabulary), size=word_counts[i])])
+        parts.append(suffixes[i])
+        texts[i] = ' '.join(part for part in parts if part)
+    return texts, bases
+
+
+def build_feedback(n_rows, seed=0, unique_texts=200_000, days=365, missing_ratio=0.001):
+    """샘플과 같은 컬럼·분포의 합성 피드백 데이터
+
+    - 제품, 카테고리, 평점: 샘플 행을 골라 그대로 가져오고 평점은 20% 확률로 ±1 변경
+    - 텍스트: 바탕 샘플 문장에 비슷한 평점의 문장, 샘플 어휘, 짧은 문구를 섞음
+      (고유 텍스트는 최대 unique_texts개, 나머지 행은 반복되는 실제 피드백처럼 재사용)
+    - 날짜: 샘플 첫 날짜부터 days일 동안 고르게 분포
+    - 텍스트와 평점에 missing_ratio 비율의 결측값
+    """
+    rng = np.random.default_rng(seed)
+    sample = pd.read_csv(SAMPLE_PATH)
+    texts, bases = _text_pool(sample, min(n_rows, unique_texts), rng)
+    picks = rng.integers(0, len(texts), size=n_rows) if n_rows > len(texts) else np.arange(n_rows)
+    rows = bases[picks]
+
+    ratings = sample['rating'].to_numpy()[rows].astype(float)
+    jitter = rng.choice([-1, 0, 0, 0, 0, 0, 0, 0, 0, 1], size=n_rows)
+    ratings = np.clip(ratings + jitter, 1, 5)
+
+    start = pd.Timestamp(sample['date'].min())
+    dates = pd.date_range(start, periods=days, freq='D').strftime('%Y-%m-%d').to_numpy(dtype=object)
+
+    df = pd.DataFrame({
+        'date': dates[rng.integers(0, days, size=n_rows)],
+        'product': sample['product'].to_numpy(dtype=object)[rows],
+        'category': sample['category'].to_numpy(dtype=object)[rows],
+        'feedback_text': texts[picks],
+        'rating': ratings,
+    })
+    n_missing = int(n_rows * missing_ratio)
+    if n_missing:
+        df.loc[rng.choice(n_rows, size=n_missing, replace=False), 'feedback_text'] = np.nan
+        df.loc[rng.choice(n_rows, size=n_missing, replace=False), 'rating'] = np.nan
+    return df
+
+
+def main():
+    n_rows = parse_rows(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    path = sys.argv[2] if len(sys.argv) > 2 else f'synthetic_{n_rows}.csv'
+    df = build_feedback(n_rows)
+    if path.endswith('.parquet'):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+    print(f"{path}: {len(df):,}행, {os.path.getsize(path) / 1024**2:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""고객 피드백 분석 공용 모듈"""
@@ -0,0 +1,8 @@
+"""`python -m cfa` 명령행 진입점"""
+import sys
+
+from cfa.cli import main
+
+# 분석 프로세스 풀이 spawn으로 이 모듈을 다시 불러올 때는 실행하지 않음
+if __name__ == '__main__':
+    sys.exit(main())
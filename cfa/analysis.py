@@ -0,0 +1,189 @@
+"""두 앱과 명령행 도구가 함께 쓰는 분석 단계 (파일 로드, 텍스트 파생 컬럼, 문서-단어 행렬, 세그먼트별 빈도, 역색인, 유사 중복 묶음)"""
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from cfa.cache import cached_stage, content_hash, stage_cache
+from cfa.dataset_cache import dataset_cache
+from cfa.dtypes import compact_frame, memory_report
+from cfa.duplicates import cluster_sizes, duplicate_clusters, representative_rows
+from cfa.excel import read_excel_columns
+from cfa.parallel import analyze_texts
+from cfa.search_index import SearchIndex
+from cfa.sentiment import DEFAULT_BACKEND, SENTIMENT_LABELS
+from cfa.term_matrix import TermMatrix
+from cfa.text import text_features
+
+# 분석 결과 파일(`python -m cfa analyze` 출력)에 붙이는 컬럼 {파생 컬럼: 파일 컬럼}
+RESULT_COLUMNS = {'sentiment': 'sentiment', 'tokens': 'tokens', 'length': 'text_length'}
+
+# 분석 결과 컬럼이 텍스트 컬럼과 맞는지 다시 계산해 확인하는 앞부분 행 수
+RESULT_CHECK_ROWS = 1000
+
+# 내용 해시 키를 기억해 두는 업로드 파일 수 (재실행마다 파일 전체를 다시 해시하지 않음)
+MAX_UPLOAD_KEYS = 64
+
+_upload_keys = OrderedDict()
+_upload_keys_lock = threading.Lock()
+
+
+def read_table(data, file_name, sheet=None, columns=None):
+    """파일 내용을 DataFrame으로 변환 (sheet, columns는 Excel 시트와 읽을 컬럼, None이면 첫 시트 전체)"""
+    if file_name.endswith('.csv'):
+        return pd.read_csv(io.BytesIO(data))
+    elif file_name.endswith('.xlsx'):
+        return read_excel_columns(data, sheet, columns)
+    elif file_name.endswith('.xls'):
+        return pd.read_excel(io.BytesIO(data), sheet_name=0 if sheet is None else sheet, usecols=columns)
+    elif file_name.endswith('.parquet'):
+        return pd.read_parquet(io.BytesIO(data))
+    raise ValueError("지원되지 않는 파일 형식입니다. CSV, Excel 또는 Parquet 파일을 업로드해주세요.")
+
+
+def upload_key(uploaded_file):
+    """업로드 파일의 내용 해시 키 (같은 업로드는 파일 ID·이름·크기로 기억해 다시 해시하지 않음)"""
+    file_id = getattr(uploaded_file, 'file_id', None)
+    if file_id is None:
+        return dataset_cache.key_for(uploaded_file.getvalue())
+    upload = (file_id, uploaded_file.name, uploaded_file.size)
+    with _upload_keys_lock:
+        key = _upload_keys.get(upload)
+        if key is not None:
+            _upload_keys.move_to_end(upload)
+            return key
+    key = dataset_cache.key_for(uploaded_file.getvalue())
+    with _upload_keys_lock:
+        _upload_keys[upload] = key
+        while len(_upload_keys) > MAX_UPLOAD_KEYS:
+            _upload_keys.popitem(last=False)
+    return key
+
+
+def load_dataset(uploaded_file, sheet=None, columns=None):
+    """업로드 파일 로드 (메모리 → 디스크 캐시 → 파일 파싱 순으로 확인)
+
+    타입을 압축한 데이터, 내용 해시 키, 타입 변환 전후 메모리 비교 표를 반환한다.
+    sheet, columns는 Excel 파일에서 읽을 시트와 컬럼이다. 파일 내용은 메모리와 디스크
+    캐시에 없을 때만 읽는다.
+    """
+    dataset_key = upload_key(uploaded_file)
+    if sheet is not None or columns is not None:
+        # 같은 파일도 시트·컬럼 선택이 다르면 다른 데이터로 캐시
+        dataset_key = content_hash(dataset_key, sheet, columns)
+    stage_key = content_hash('load', dataset_key)
+    entry = stage_cache.get(stage_key)
+    if entry is None:
+        raw = dataset_cache.load(dataset_key)
+        if raw is None:
+            raw = read_table(uploaded_file.getvalue(), uploaded_file.name, sheet, columns)
+            dataset_cache.store(dataset_key, raw, uploaded_file.name)
+        df = compact_frame(raw)
+        entry = (df, memory_report(raw, df))
+        stage_cache.put(stage_key, entry)
+    df, report = entry
+    return df, dataset_key, report
+
+
+def result_frame(df, features):
+    """원본 컬럼에 분석 결과 컬럼을 붙인 표 (명령행 도구 출력 형식)"""
+    return df.assign(**{
+        column: features[name].astype(object) if name == 'sentiment' else features[name]
+        for name, column in RESULT_COLUMNS.items()
+    })
+
+
+def stored_features(df, text_column):
+    """분석 결과 파일에 저장된 감성/토큰/길이 (`text_features`와 같은 형식)
+
+    결과 컬럼이 없거나 앞부분 행을 다시 분석한 값과 다르면(다른 텍스트 컬럼의
+    결과 등) None을 반환한다.
+    """
+    if text_column not in df.columns or not all(column in df.columns for column in RESULT_COLUMNS.values()):
+        return None
+    sentiments = df[RESULT_COLUMNS['sentiment']].astype(object)
+    if not sentiments.dropna().isin(SENTIMENT_LABELS).all():
+        return None
+    tokens = df[RESULT_COLUMNS['tokens']].astype(object)
+    lengths = pd.to_numeric(df[RESULT_COLUMNS['length']], errors='coerce')
+    # 결측 텍스트가 없으면 정수 길이 (`text_features`와 같은 타입)
+    lengths = lengths.astype('int64') if lengths.notna().all() else lengths.astype(float)
+    features = pd.DataFrame({
+        'sentiment': pd.Categorical(sentiments, categories=SENTIMENT_LABELS),
+        # CSV로 저장했다 읽으면 빈 토큰 문자열이 결측값이 됨
+        'tokens': tokens.where(tokens.notna(), ''),
+        'length': lengths,
+    }, index=df.index)
+    expected = text_features(df[text_column].iloc[:RESULT_CHECK_ROWS])
+    if not features.iloc[:RESULT_CHECK_ROWS].astype(object).equals(expected.astype(object)):
+        return None
+    return features
+
+
+def _features_name(text_column):
+    """디스크 캐시에 텍스트 파생 컬럼을 저장하는 이름 (키워드 사전이 아닌 감성 분석 방식은 따로 저장)"""
+    return text_column if DEFAULT_BACKEND == 'lexicon' else (text_column, DEFAULT_BACKEND)
+
+
+@cached_stage('features')
+def column_features(df, text_column, dataset_key=None):
+    """텍스트 컬럼의 감성/토큰/길이 (디스크 캐시나 분석 결과 파일에 있으면 재사용)"""
+    if dataset_key is not None:
+        features = dataset_cache.load_derived(dataset_key, _features_name(text_column))
+        if features is not None and len(features) == len(df):
+            features.index = df.index
+            return features
+    features = stored_features(df, text_column)
+    if features is None:
+        features, _ = analyze_texts(df[text_column])
+    if dataset_key is not None:
+        dataset_cache.store_derived(dataset_key, _features_name(text_column), features)
+    return features
+
+
+@cached_stage('tokens.matrix')
+def term_matrix(df, text_column, dataset_key=None):
+    """텍스트 컬럼의 문서-단어 행렬 (토큰화는 한 번만 수행)"""
+    return TermMatrix.from_tokens(column_features(df, text_column, dataset_key)['tokens'])
+
+
+@cached_stage('tokens.groups')
+def segment_counts(df, text_column, segments, dataset_key=None):
+    """세그먼트 값(행 순서와 같은 Series)별 단어 빈도 희소 행렬 (세그먼트 컬럼마다 한 번만 합산)"""
+    return term_matrix(df, text_column, dataset_key).group_counts(segments)
+
+
+@cached_stage('search.index')
+def search_index(df, text_column, dataset_key=None):
+    """텍스트 컬럼의 전문 검색 역색인 (문서-단어 행렬의 열을 압축해 만듦)"""
+    return SearchIndex(term_matrix(df, text_column, dataset_key))
+
+
+@cached_stage('duplicates')
+def duplicate_groups(df, text_column):
+    """텍스트 컬럼의 행별 유사 중복 묶음 번호 (결측·빈 텍스트는 -1)"""
+    return duplicate_clusters(df[text_column])
+
+
+@cached_stage('duplicates.collapse')
+def collapse_duplicates(df, text_column, dataset_key=None):
+    """유사 중복 피드백을 묶음마다 첫 행만 남긴 (데이터, 디스크 캐시 키)
+
+    남긴 행에는 묶음 번호와 묶음 행 수 컬럼을 붙인다. 원본 데이터의 텍스트 파생 컬럼이
+    디스크 캐시에 있으면 남긴 행만 골라 `<캐시 키>.duplicates` 키로 저장하므로(원본과 함께
+    목록에 표시되고 삭제됨) 묶은 데이터를 다시 분석하지 않는다.
+    """
+    clusters = duplicate_groups(df, text_column)
+    keep = representative_rows(clusters)
+    collapsed = df.iloc[keep].assign(
+        duplicate_group=clusters[keep], duplicate_count=cluster_sizes(clusters)[keep]
+    )
+    if dataset_key is None:
+        return collapsed, None
+    collapsed_key = f"{dataset_key}.duplicates"
+    if dataset_cache.load_derived(collapsed_key, _features_name(text_column)) is None:
+        features = dataset_cache.load_derived(dataset_key, _features_name(text_column))
+        if features is not None and len(features) == len(df):
+            dataset_cache.store_derived(collapsed_key, _features_name(text_column), features.iloc[keep])
+    return collapsed, collapsed_key
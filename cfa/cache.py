@@ -0,0 +1,232 @@
+"""분석 단계별 결과 캐시 (내용 해시 키, 메모리 한도, LRU 제거)"""
+import functools
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from cfa.profiling import active_profiler, profile_stage, row_count
+
+# 캐시 메모리 한도 (MB), 환경 변수로 변경 가능
+DEFAULT_MAX_MB = float(os.environ.get('CFA_CACHE_MAX_MB', 512))
+
+# 같은 객체를 다시 해시하지 않도록 id 기준으로 해시값을 기억
+# (캐시에서 돌려준 객체는 수정하지 않는다는 전제)
+_hash_memo = {}
+_hash_memo_lock = threading.Lock()
+
+
+def _memo_hash(obj, compute):
+    """pandas/numpy 객체의 해시값을 객체 수명 동안 재사용"""
+    key = id(obj)
+    with _hash_memo_lock:
+        entry = _hash_memo.get(key)
+        if entry is not None and entry[0]() is obj:
+            return entry[1]
+    digest = compute(obj)
+    try:
+        ref = weakref.ref(obj, lambda _, key=key: _hash_memo.pop(key, None))
+    except TypeError:
+        return digest
+    with _hash_memo_lock:
+        _hash_memo[key] = (ref, digest)
+    return digest
+
+
+def _hash_pandas(obj):
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(type(obj).__name__.encode())
+    if isinstance(obj, pd.DataFrame):
+        hasher.update(repr(list(obj.columns)).encode())
+        hasher.update(repr(list(obj.dtypes.astype(str))).encode())
+    else:
+        hasher.update(repr((obj.name, str(obj.dtype))).encode())
+    try:
+        values = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+        hasher.update(values.tobytes())
+    except TypeError:
+        # 리스트 등 해시할 수 없는 값이 들어 있는 경우
+        hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    return hasher.hexdigest()
+
+
+def _hash_array(obj):
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr((obj.dtype.str, obj.shape)).encode())
+    if obj.dtype == object:
+        hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    else:
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    return hasher.hexdigest()
+
+
+def _update(hasher, obj):
+    if obj is None or isinstance(obj, (bool, int, float, complex, str)):
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        hasher.update(b"bytes:")
+        hasher.update(obj)
+    elif isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        hasher.update(_memo_hash(obj, _hash_pandas).encode())
+    elif isinstance(obj, np.ndarray):
+        hasher.update(_memo_hash(obj, _hash_array).encode())
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for item in obj:
+            _update(hasher, item)
+    elif isinstance(obj, (set, frozenset)):
+        hasher.update(f"set[{len(obj)}]".encode())
+        for item in sorted(obj, key=repr):
+            _update(hasher, item)
+    elif isinstance(obj, dict):
+        hasher.update(f"dict[{len(obj)}]".encode())
+        for name, value in obj.items():
+            _update(hasher, name)
+            _update(hasher, value)
+    else:
+        hasher.update(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def content_hash(*parts):
+    """입력 값들의 내용 기반 해시"""
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        _update(hasher, part)
+    return hasher.hexdigest()
+
+
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 사용량 (bytes)"""
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(name) + estimate_size(item) for name, item in value.items()
+        )
+    if hasattr(value, 'indptr') and hasattr(value, 'indices'):
+        # scipy 희소 행렬
+        return value.data.nbytes + value.indices.nbytes + value.indptr.nbytes
+    if hasattr(value, '__dict__') and type(value).__module__.startswith('cfa.'):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in vars(value).values())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class StageCache:
+    """메모리 한도가 있는 LRU 캐시 (여러 세션/재실행에서 공유)"""
+
+    def __init__(self, max_mb=DEFAULT_MAX_MB):
+        self.max_bytes = int(max_mb * 1024**2)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            # 한도보다 큰 값은 저장하지 않음
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            self._evict()
+
+    def set_budget(self, max_mb):
+        """메모리 한도 변경 (초과분은 오래된 항목부터 제거)"""
+        with self._lock:
+            self.max_bytes = int(max_mb * 1024**2)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'size_mb': self.total_bytes / 1024**2,
+            'max_mb': self.max_bytes / 1024**2,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+_MISSING = object()
+
+# 프로세스 전체에서 공유하는 기본 캐시
+stage_cache = StageCache()
+
+
+def cached_stage(name, cache=None):
+    """분석 단계 함수의 결과를 입력 내용 해시 기준으로 캐시하는 데코레이터
+
+    캐시된 결과는 여러 재실행에서 같은 객체로 반환되므로 호출한 쪽에서
+    수정하지 말고 새 객체를 만들어 사용해야 한다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if active_profiler() is None:
+                return lookup(args, kwargs)[0]
+            # 성능 측정 중이면 단계 시간과 캐시 적중 여부를 기록
+            with profile_stage(name, kind='cache') as span:
+                value, hit = lookup(args, kwargs)
+                span['cache'] = 'hit' if hit else 'miss'
+                span['rows'] = row_count(value)
+                return value
+
+        def lookup(args, kwargs):
+            """(결과, 캐시 적중 여부)"""
+            target = stage_cache if cache is None else cache
+            key = content_hash(name, args, sorted(kwargs.items()))
+            value = target.get(key, _MISSING)
+            if value is not _MISSING:
+                return value, True
+            value = func(*args, **kwargs)
+            target.put(key, value)
+            return value, False
+
+        wrapper.stage_name = name
+        return wrapper
+
+    return decorator
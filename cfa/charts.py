@@ -0,0 +1,159 @@
+"""서버에서 미리 집계한 차트 (행 수와 관계없이 일정한 크기의 데이터만 전송)"""
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# 그룹마다 표시할 이상값 최대 개수
+MAX_OUTLIERS = 200
+
+# 점이 이보다 많으면 SVG 대신 WebGL(Scattergl)로 그림
+WEBGL_THRESHOLD = 1000
+
+
+def _quantile(levels, cumulative, p):
+    """값/빈도 표에서 선형 보간 분위수 (numpy.percentile 기본 방식과 같음)"""
+    position = p * (cumulative[-1] - 1)
+    lower = int(np.floor(position))
+    fraction = position - lower
+    below = levels[np.searchsorted(cumulative, lower, side='right')]
+    above = levels[np.searchsorted(cumulative, min(lower + 1, cumulative[-1] - 1), side='right')]
+    return below + fraction * (above - below)
+
+
+def _sample_evenly(values, size):
+    """정렬된 값에서 양 끝을 포함해 고르게 size개 선택"""
+    if len(values) <= size:
+        return values
+    return values[np.linspace(0, len(values) - 1, size).round().astype(int)]
+
+
+def box_stats(levels, counts, max_outliers=MAX_OUTLIERS):
+    """값별 빈도로 상자 그림 통계 계산 (사분위수, 1.5 IQR 수염, 이상값 표본)"""
+    levels = np.asarray(levels, dtype=float)
+    counts = np.asarray(counts, dtype=np.int64)
+    present = counts > 0
+    levels, counts = levels[present], counts[present]
+    if len(levels) == 0:
+        return None
+    order = np.argsort(levels)
+    levels, counts = levels[order], counts[order]
+    cumulative = np.cumsum(counts)
+    q1, median, q3 = (_quantile(levels, cumulative, p) for p in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    inside = (levels >= q1 - 1.5 * iqr) & (levels <= q3 + 1.5 * iqr)
+    outliers = levels[~inside]
+    return {
+        'count': int(cumulative[-1]),
+        'mean': float((levels * counts).sum() / cumulative[-1]),
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': levels[inside].min(),
+        'upperfence': levels[inside].max(),
+        'outliers': _sample_evenly(outliers, max_outliers),
+        'outlier_count': int(counts[~inside].sum()),
+    }
+
+
+def box_summary(values, groups=None, max_outliers=MAX_OUTLIERS):
+    """그룹별 상자 그림 통계 표 (그룹은 처음 나온 순서, 결측값 제외)"""
+    values = pd.Series(values).reset_index(drop=True)
+    if groups is None:
+        codes, names = np.zeros(len(values), dtype=np.intp), ['']
+    else:
+        codes, names = pd.factorize(pd.Series(groups).reset_index(drop=True))
+    array = values.to_numpy(dtype=float)
+    valid = ~np.isnan(array) & (codes >= 0)
+    array, codes = array[valid], codes[valid]
+    stats = {}
+    for code, name in enumerate(names):
+        levels, counts = np.unique(array[codes == code], return_counts=True)
+        summary = box_stats(levels, counts, max_outliers)
+        if summary is not None:
+            stats[name] = summary
+    return pd.DataFrame.from_dict(stats, orient='index')
+
+
+def box_summary_from_histogram(histogram, max_outliers=MAX_OUTLIERS):
+    """그룹별 값 분포 표(행 = 그룹, 열 = 값)로 상자 그림 통계 표 계산"""
+    stats = {}
+    levels = histogram.columns.to_numpy(dtype=float)
+    for name, counts in histogram.iterrows():
+        summary = box_stats(levels, counts.to_numpy(), max_outliers)
+        if summary is not None:
+            stats[name] = summary
+    return pd.DataFrame.from_dict(stats, orient='index')
+
+
+def histogram_bins(values, nbins=30, weights=None):
+    """히스토그램 구간 경계와 빈도 (정수 값이면 구간 경계도 정수로 맞춤)
+
+    weights를 주면 values를 값 목록, weights를 값별 빈도로 본다 (누적 집계용).
+    """
+    array = pd.Series(values).to_numpy(dtype=float)
+    valid = ~np.isnan(array)
+    array = array[valid]
+    if weights is not None:
+        weights = np.asarray(weights)[valid]
+    if len(array) == 0:
+        return np.array([0.0, 1.0]), np.zeros(1, dtype=np.int64)
+    low, high = array.min(), array.max()
+    if np.array_equal(array, np.floor(array)):
+        width = max(1, int(np.ceil((high - low + 1) / nbins)))
+        edges = np.arange(low, high + width + 1, width, dtype=float)
+        edges = edges[:int(np.searchsorted(edges, high, side='right')) + 1]
+    else:
+        edges = np.histogram_bin_edges(array, bins=nbins)
+    counts, edges = np.histogram(array, bins=edges, weights=weights)
+    return edges, counts.astype(np.int64)
+
+
+def scatter_trace(x, y, **kwargs):
+    """점 수에 따라 SVG 또는 WebGL 산점도 trace"""
+    trace = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace(x=x, y=y, mode='markers', **kwargs)
+
+
+def box_figure(summary, title, x_title, y_title, color_map=None, default_color=None):
+    """미리 계산한 상자 그림 통계로 차트 생성 (그룹마다 trace 하나, 이상값은 점으로 표시)"""
+    fig = go.Figure()
+    for name, row in summary.iterrows():
+        color = (color_map or {}).get(name, default_color)
+        fig.add_trace(go.Box(
+            name=str(name),
+            x=[str(name)],
+            q1=[row['q1']],
+            median=[row['median']],
+            q3=[row['q3']],
+            lowerfence=[row['lowerfence']],
+            upperfence=[row['upperfence']],
+            mean=[row['mean']],
+            marker_color=color,
+            legendgroup=str(name),
+            showlegend=color_map is not None,
+        ))
+        outliers = row['outliers']
+        if len(outliers):
+            fig.add_trace(scatter_trace(
+                [str(name)] * len(outliers),
+                outliers,
+                marker=dict(color=color, size=5),
+                legendgroup=str(name),
+                showlegend=False,
+                hovertemplate=f"이상값 %{{y}} (전체 {row['outlier_count']}개)<extra></extra>",
+            ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title)
+    return fig
+
+
+def histogram_figure(edges, counts, title, x_title, y_title='빈도'):
+    """미리 계산한 구간 빈도로 히스토그램 차트 생성"""
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.column_stack([edges[:-1], edges[1:]]),
+        hovertemplate="%{customdata[0]} - %{customdata[1]}: %{y}<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title, bargap=0)
+    return fig
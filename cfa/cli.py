@@ -0,0 +1,326 @@
+"""명령행 일괄 분석 (Streamlit 없이 대용량 파일을 청크 단위로 분석)
+
+사용법: python -m cfa analyze input.csv --out results.parquet --stats stats.json
+       python -m cfa train-sentiment input.csv --out cfa/models/sentiment_ngram.npz
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cfa.analysis import result_frame
+from cfa.excel import iter_excel_chunks
+from cfa.parallel import analyze_texts, resolve_workers
+from cfa.sentiment_model import DEFAULT_HASH_BITS, DEFAULT_MODEL_PATH
+from cfa.streaming import DEFAULT_CHUNK_SIZE, StreamingAggregates
+
+# 통계 파일에 넣는 상위 키워드 수
+DEFAULT_TOP_KEYWORDS = 50
+
+# 분석하는 동안 미리 읽어 두는 청크 수
+PREFETCH_CHUNKS = 2
+
+
+def iter_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, sheet=None, columns=None):
+    """입력 파일을 청크 단위 DataFrame으로 읽기 (.xls 외에는 파일 전체를 메모리에 올리지 않음)
+
+    columns를 주면 그 컬럼만 읽고, sheet는 Excel 파일의 시트 이름이다 (None이면 첫 시트).
+    """
+    if path.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunk_size, usecols=columns)
+    elif path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    elif path.endswith('.xlsx'):
+        yield from iter_excel_chunks(path, sheet, columns, chunk_size)
+    elif path.endswith('.xls'):
+        df = pd.read_excel(path, sheet_name=0 if sheet is None else sheet, usecols=columns)
+        for start in range(0, len(df), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    else:
+        raise ValueError("지원되지 않는 파일 형식입니다. CSV, Excel 또는 Parquet 파일을 지정해주세요.")
+
+
+def prefetch(chunks, depth=PREFETCH_CHUNKS):
+    """별도 스레드에서 다음 청크를 미리 읽음 (읽기와 분석·쓰기를 겹쳐 실행)"""
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+
+    def read():
+        try:
+            for chunk in chunks:
+                buffer.put(chunk)
+        except Exception as e:
+            buffer.put(e)
+        buffer.put(done)
+
+    threading.Thread(target=read, name='cfa-reader', daemon=True).start()
+    while True:
+        item = buffer.get()
+        if item is done:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+def _is_string(data_type):
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+class ResultWriter:
+    """분석 결과를 청크마다 이어 쓰는 파일 (.parquet 또는 .csv)
+
+    임시 파일에 쓰고 `close()`할 때 제자리로 옮기므로 중간에 실패해도
+    이전 결과 파일이 깨지지 않는다.
+    """
+
+    def __init__(self, path):
+        if not path.endswith(('.parquet', '.csv')):
+            raise ValueError("출력 파일은 .parquet 또는 .csv 형식이어야 합니다.")
+        self.path = path
+        self.rows = 0
+        self._temp_path = f"{path}.{os.getpid()}.tmp"
+        self._schema = None
+        self._writer = None
+        self._file = None
+
+    def write(self, frame):
+        if self.path.endswith('.csv'):
+            if self._file is None:
+                # BOM은 파일 처음에 한 번만 (Excel에서 한글이 깨지지 않도록)
+                self._file = open(self._temp_path, 'w', encoding='utf-8-sig', newline='')
+                frame.to_csv(self._file, index=False)
+            else:
+                frame.to_csv(self._file, index=False, header=False)
+        else:
+            if self._writer is None:
+                self._schema = self._first_schema(frame)
+                self._writer = pq.ParquetWriter(self._temp_path, self._schema)
+            table = pa.Table.from_pandas(self._conform(frame), schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        self.rows += len(frame)
+
+    @staticmethod
+    def _first_schema(frame):
+        """첫 청크의 스키마 (값이 모두 비어 타입을 알 수 없는 컬럼은 문자열)"""
+        schema = pa.Schema.from_pandas(frame, preserve_index=False)
+        fields = [
+            field.with_type(pa.string())
+            if pa.types.is_null(field.type) or (frame[field.name].isna().all() and not _is_string(field.type))
+            else field
+            for field in schema
+        ]
+        return pa.schema(fields)
+
+    def _conform(self, frame):
+        """청크마다 다르게 추론된 타입을 첫 청크 스키마에 맞춤 (문자열 컬럼에 숫자가 읽힌 경우 등)"""
+        changes = {}
+        for field in self._schema:
+            values = frame[field.name]
+            if _is_string(field.type) and not pd.api.types.is_string_dtype(values):
+                changes[field.name] = values.astype(str).where(values.notna(), None)
+        return frame.assign(**changes) if changes else frame
+
+    def close(self):
+        """파일을 마무리하고 출력 경로로 옮김"""
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+        elif self.path.endswith('.csv'):
+            # 빈 입력도 빈 결과 파일을 남김
+            open(self._temp_path, 'w').close()
+        else:
+            pq.write_table(pa.table({}), self._temp_path)
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """쓰던 임시 파일 삭제"""
+        if self._file is not None:
+            self._file.close()
+        elif self._writer is not None:
+            self._writer.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+def analyze_file(input_path, output_path=None, text_column='feedback_text', chunk_size=DEFAULT_CHUNK_SIZE,
+                 workers=None, on_progress=None, sheet=None, columns=None):
+    """파일을 청크 단위로 분석해 결과 파일을 쓰고 (누적 집계, 처리 정보 dict)를 반환
+
+    on_progress(처리한 행 수, 경과 초)는 청크마다 호출된다. sheet, columns는 읽을 시트와 컬럼이다 (`iter_chunks`).
+    """
+    workers = resolve_workers(workers)
+    aggregates = StreamingAggregates(text_column=text_column)
+    writer = ResultWriter(output_path) if output_path else None
+    start = time.perf_counter()
+    chunks = 0
+    try:
+        for chunk in prefetch(iter_chunks(input_path, chunk_size, sheet, columns)):
+            if text_column not in chunk.columns:
+                raise ValueError(f"텍스트 컬럼 '{text_column}'이(가) 입력 파일에 없습니다.")
+            # 청크 하나를 작업 프로세스 수만큼 나눠 분석
+            features, keyword_counts = analyze_texts(
+                chunk[text_column], workers=workers,
+                partition_size=math.ceil(len(chunk) / workers), keywords=True,
+            )
+            aggregates.update(chunk, features, keyword_counts)
+            if writer is not None:
+                writer.write(result_frame(chunk, features))
+            chunks += 1
+            if on_progress is not None:
+                on_progress(aggregates.rows, time.perf_counter() - start)
+        if writer is not None:
+            writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    elapsed = time.perf_counter() - start
+    run = {
+        'input': input_path,
+        'output': output_path,
+        'text_column': text_column,
+        'rows': aggregates.rows,
+        'chunks': chunks,
+        'workers': workers,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(aggregates.rows / elapsed, 1) if elapsed > 0 else None,
+    }
+    return aggregates, run
+
+
+def summary_stats(aggregates, top_keywords=DEFAULT_TOP_KEYWORDS):
+    """누적 집계를 JSON으로 저장할 수 있는 dict로 변환"""
+    avg_rating = aggregates.avg_rating
+    stats = {
+        'avg_rating': None if np.isnan(avg_rating) else avg_rating,
+        'sentiment_counts': dict(aggregates.sentiment_counts),
+        'keywords': aggregates.keywords(top_keywords),
+        'length_stats': aggregates.length_stats(),
+        'groups': {},
+        'monthly_positive_ratio': None,
+    }
+    for column in aggregates.group_columns:
+        if aggregates.has_dimension(column):
+            stats['groups'][column] = aggregates.group_table(column).reset_index().to_dict('records')
+    if aggregates.has_dimension('month') and aggregates.has_dimension('sentiment'):
+        stats['monthly_positive_ratio'] = aggregates.monthly_positive_ratio().to_dict('records')
+    return stats
+
+
+def _json_default(value):
+    """numpy 값과 기간(Period)을 JSON 값으로"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def run_analyze(args):
+    def report(rows, elapsed):
+        if not args.quiet:
+            print(f"  {rows:,}행 처리 ({rows / elapsed:,.0f}행/초)", file=sys.stderr, flush=True)
+
+    aggregates, run = analyze_file(
+        args.input, args.out, text_column=args.text_column, chunk_size=args.chunk_size,
+        workers=args.workers, on_progress=report, sheet=args.sheet,
+        columns=args.columns.split(',') if args.columns else None,
+    )
+    if args.stats:
+        stats = {'run': run, **summary_stats(aggregates, args.top_keywords)}
+        with open(args.stats, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, ensure_ascii=False, indent=2, default=_json_default)
+    rate = f"{run['rows_per_second']:,.0f}행/초" if run['rows_per_second'] else '-'
+    print(f"{run['rows']:,}행 분석 완료: {run['seconds']:.2f}초, {rate} "
+          f"(청크 {run['chunks']}개, 작업 프로세스 {run['workers']}개)")
+    return 0
+
+
+def run_train_sentiment(args):
+    # scikit-learn은 학습할 때만 불러옴
+    from cfa.sentiment_model import rating_labels, train_model
+
+    columns = [args.text_column, args.rating_column]
+    df = pd.concat(iter_chunks(args.input, args.chunk_size, args.sheet, columns), ignore_index=True)
+    texts = df[args.text_column].where(df[args.text_column].notna(), '').astype(str).tolist()
+    ratings = pd.to_numeric(df[args.rating_column], errors='coerce').to_numpy(dtype=float)
+    # 무작위로 고른 검증 행은 학습에서 빼고 평점 라벨과 일치율을 확인
+    holdout = np.random.default_rng(args.seed).random(len(df)) < args.holdout
+    train = np.flatnonzero(~holdout)
+    start = time.perf_counter()
+    model = train_model(
+        [texts[i] for i in train], ratings[train], hash_bits=args.hash_bits, alpha=args.alpha, seed=args.seed
+    )
+    elapsed = time.perf_counter() - start
+    model.save(args.out)
+    print(f"{len(train):,}행으로 학습: {elapsed:.2f}초, 모델 {args.out} ({os.path.getsize(args.out) / 1024:,.0f} KB)")
+
+    checked = np.flatnonzero(holdout & (rating_labels(ratings) >= 0))
+    if len(checked):
+        predicted = model.predict_codes([texts[i] for i in checked])
+        agreement = (predicted == rating_labels(ratings[checked])).mean()
+        print(f"검증 {len(checked):,}행 평점 라벨 일치율: {agreement:.1%}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cfa', description="고객 피드백 일괄 분석")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    analyze = commands.add_parser(
+        'analyze', help="파일을 청크 단위로 분석해 결과 파일과 통계를 저장",
+        description="행마다 감성/토큰/텍스트 길이를 붙인 결과 파일(대시보드에서 바로 열 수 있음)과 전체 통계 JSON을 만든다.",
+    )
+    analyze.add_argument('input', help="입력 파일 (.csv, .xlsx, .xls, .parquet)")
+    analyze.add_argument('--out', help="행 단위 결과 파일 (.parquet 또는 .csv)")
+    analyze.add_argument('--stats', help="전체 통계 JSON 파일")
+    analyze.add_argument('--text-column', default='feedback_text', help="분석할 텍스트 컬럼 (기본: feedback_text)")
+    analyze.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                         help=f"한 번에 읽는 행 수 (기본: {DEFAULT_CHUNK_SIZE:,})")
+    analyze.add_argument('--sheet', help="Excel 파일에서 읽을 시트 이름 (기본: 첫 시트)")
+    analyze.add_argument('--columns', help="읽을 컬럼 이름을 쉼표로 구분 (기본: 전체, 예: date,product,feedback_text)")
+    analyze.add_argument('--workers', type=int, default=None,
+                         help="분석 프로세스 수 (기본: CFA_ANALYSIS_WORKERS, 0이면 CPU 코어 수)")
+    analyze.add_argument('--top-keywords', type=int, default=DEFAULT_TOP_KEYWORDS,
+                         help=f"통계에 넣는 상위 키워드 수 (기본: {DEFAULT_TOP_KEYWORDS})")
+    analyze.add_argument('--quiet', action='store_true', help="청크별 진행 상황을 출력하지 않음")
+    analyze.set_defaults(run=run_analyze)
+
+    train = commands.add_parser(
+        'train-sentiment', help="평점을 약한 라벨로 문자 n-gram 감성 모델 학습",
+        description="평점 4 이상은 긍정, 2 이하는 부정, 3은 중립으로 보고 텍스트의 문자 n-gram 해시 특징으로 "
+                    "선형 모델을 학습해 CFA_SENTIMENT_BACKEND=model에서 쓰는 모델 파일(.npz)을 만든다.",
+    )
+    train.add_argument('input', help="학습 파일 (.csv, .xlsx, .xls, .parquet)")
+    train.add_argument('--out', default=DEFAULT_MODEL_PATH, help=f"모델 파일 (기본: {DEFAULT_MODEL_PATH})")
+    train.add_argument('--text-column', default='feedback_text', help="텍스트 컬럼 (기본: feedback_text)")
+    train.add_argument('--rating-column', default='rating', help="평점 컬럼 (기본: rating)")
+    train.add_argument('--sheet', help="Excel 파일에서 읽을 시트 이름 (기본: 첫 시트)")
+    train.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                       help=f"한 번에 읽는 행 수 (기본: {DEFAULT_CHUNK_SIZE:,})")
+    train.add_argument('--hash-bits', type=int, default=DEFAULT_HASH_BITS,
+                       help=f"해시 공간 크기 2^N (기본: {DEFAULT_HASH_BITS})")
+    train.add_argument('--alpha', type=float, default=1e-5, help="L2 규제 강도 (기본: 1e-5)")
+    train.add_argument('--holdout', type=float, default=0.1, help="평점 라벨 일치율을 확인할 검증 비율 (기본: 0.1)")
+    train.add_argument('--seed', type=int, default=0, help="검증 행 선택과 학습 난수 시드 (기본: 0)")
+    train.set_defaults(run=run_train_sentiment)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.run(args)
+    except (ValueError, OSError) as e:
+        print(f"오류: {e}", file=sys.stderr)
+        return 1
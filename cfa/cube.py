@@ -0,0 +1,212 @@
+"""월/제품/카테고리/감성 집계 큐브 (롤업으로 그룹별 통계 계산)"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ('month', 'product', 'category', 'sentiment')
+MEASURES = ['rows', 'positive', 'rating_count', 'rating_sum', 'rating_sumsq']
+
+# 평점 값 종류가 이보다 많으면 (연속 값) 평점 히스토그램을 만들지 않음
+MAX_RATING_LEVELS = 64
+
+
+class RollupCube:
+    """차원 값 조합(셀)별 행 수, 긍정 수, 평점 합/제곱합/히스토그램
+
+    원본 데이터는 한 번만 훑어 셀 단위로 집계하고, 제품·카테고리·월별 표는
+    셀을 다시 더해서(롤업) 구한다. 셀 수는 차원 값 조합 수로 제한되므로
+    원본 행 수와 관계없이 작다.
+    """
+
+    def __init__(self, cells, dimensions, levels=None, histogram=None):
+        self.cells = cells
+        self.dimensions = tuple(dimensions)
+        self.levels = levels
+        self.histogram = histogram
+
+    @classmethod
+    def from_frame(cls, df, dimensions=DIMENSIONS, rating_column='rating',
+                   max_levels=MAX_RATING_LEVELS, weights=None):
+        """데이터에서 큐브 생성 (없는 차원 컬럼은 건너뜀)
+
+        weights를 주면 각 행을 그 수만큼의 행으로 본다 (이미 묶어 센 데이터용).
+        """
+        dimensions = [column for column in dimensions if column in df.columns]
+        cells, cell = _cells([df[column] for column in dimensions], dimensions, len(df))
+        n_cells = len(cells)
+
+        if rating_column in df.columns:
+            ratings = df[rating_column].to_numpy(dtype=float)
+        else:
+            ratings = np.full(len(df), np.nan)
+        valid = ~np.isnan(ratings)
+        rated_cell, rated = cell[valid], ratings[valid]
+        if weights is None:
+            row_weights = rated_weights = None
+        else:
+            row_weights = np.asarray(weights, dtype=float)
+            rated_weights = row_weights[valid]
+
+        cells['rows'] = _count(cell, row_weights, n_cells)
+        cells['rating_count'] = _count(rated_cell, rated_weights, n_cells)
+        scale = 1 if rated_weights is None else rated_weights
+        cells['rating_sum'] = np.bincount(rated_cell, weights=rated * scale, minlength=n_cells)
+        cells['rating_sumsq'] = np.bincount(rated_cell, weights=rated**2 * scale, minlength=n_cells)
+        if 'sentiment' in dimensions:
+            cells['positive'] = np.where(cells['sentiment'] == '긍정', cells['rows'], 0)
+        else:
+            cells['positive'] = 0
+
+        levels = histogram = None
+        levels, level_index = _rating_levels(rated, max_levels)
+        if levels is not None:
+            histogram = _count(
+                rated_cell * len(levels) + level_index, rated_weights, n_cells * len(levels)
+            ).reshape(n_cells, len(levels))
+        return cls(cells, dimensions, levels, histogram)
+
+    def merge(self, other):
+        """두 큐브의 같은 셀을 합친 새 큐브 (청크별 큐브 누적용)"""
+        if self.dimensions != other.dimensions:
+            raise ValueError("차원이 다른 큐브는 합칠 수 없습니다.")
+        dimensions = list(self.dimensions)
+        columns = [
+            pd.concat([self.cells[column].astype(object), other.cells[column].astype(object)],
+                      ignore_index=True)
+            for column in dimensions
+        ]
+        n_rows = self.n_cells + other.n_cells
+        cells, cell = _cells(columns, dimensions, n_rows)
+        n_cells = len(cells)
+        for measure in MEASURES:
+            values = np.concatenate([self.cells[measure].to_numpy(), other.cells[measure].to_numpy()])
+            summed = np.bincount(cell, weights=values, minlength=n_cells)
+            cells[measure] = summed if measure in ('rating_sum', 'rating_sumsq') else summed.astype(np.int64)
+        cells = cells[dimensions + MEASURES]
+
+        levels = histogram = None
+        if self.histogram is not None and other.histogram is not None:
+            level_values = np.union1d(self.levels, other.levels)
+            if len(level_values) <= MAX_RATING_LEVELS:
+                levels = level_values
+                stacked = np.zeros((n_rows, len(levels)), dtype=np.int64)
+                stacked[:self.n_cells, np.searchsorted(levels, self.levels)] = self.histogram
+                stacked[self.n_cells:, np.searchsorted(levels, other.levels)] = other.histogram
+                histogram = np.zeros((n_cells, len(levels)), dtype=np.int64)
+                np.add.at(histogram, cell, stacked)
+        return RollupCube(cells, dimensions, levels, histogram)
+
+    @property
+    def n_cells(self):
+        return len(self.cells)
+
+    def rollup(self, by=()):
+        """차원별 합계와 평균/표준편차 (by가 비어 있으면 전체 합계 한 행)
+
+        결측값 그룹은 pandas groupby와 같이 제외한다.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        if any(column not in self.dimensions for column in by):
+            return None
+        if by:
+            totals = self.cells.groupby(by, observed=True)[MEASURES].sum()
+        else:
+            totals = self.cells[MEASURES].sum().to_frame().T
+        count = totals['rating_count'].to_numpy(dtype=float)
+        count[count == 0] = np.nan
+        rating_sum = totals['rating_sum'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = rating_sum / count
+            variance = (totals['rating_sumsq'].to_numpy() - rating_sum * mean) / (count - 1)
+        totals['rating_mean'] = mean
+        totals['rating_std'] = np.sqrt(np.clip(variance, 0, None))
+        return totals
+
+    def rating_histogram(self, by=()):
+        """차원별 평점 값 분포 (열 = 평점 값, 평점이 연속 값이면 None)"""
+        if self.histogram is None:
+            return None
+        by = [by] if isinstance(by, str) else list(by)
+        frame = pd.DataFrame(self.histogram, columns=self.levels, index=self.cells.index)
+        if not by:
+            return frame.sum().to_frame().T
+        return frame.groupby([self.cells[column] for column in by], observed=True).sum()
+
+    def group_table(self, column):
+        """그룹별 평균 평점, 피드백 수, 긍정 비율"""
+        totals = self.rollup(column)
+        if totals is None:
+            return None
+        return pd.DataFrame({
+            '평균 평점': totals['rating_mean'],
+            '피드백 수': totals['rating_count'],
+            '긍정 비율(%)': totals['positive'] / totals['rows'] * 100,
+        }).round(2)
+
+    def monthly_positive_ratio(self):
+        """월별 긍정 비율"""
+        totals = self.rollup('month')
+        if totals is None:
+            return None
+        return pd.DataFrame({
+            'month': totals.index.astype(str),
+            'sentiment': (totals['positive'] / totals['rows'] * 100).to_numpy(),
+        })
+
+
+def _cells(columns, dimensions, n_rows):
+    """차원 값 조합별 셀 표와 행마다의 셀 번호
+
+    차원별 코드(0은 결측값)를 하나의 번호로 합친 뒤 실제로 나오는 조합만 남긴다.
+    """
+    codes, categories = [], []
+    for values in columns:
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # 범주형은 이미 코드가 있으므로 다시 해시하지 않음
+            column_codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            column_codes, uniques = pd.factorize(values, sort=True)
+        codes.append(column_codes.astype(np.intp) + 1)
+        categories.append(uniques)
+    shape = [len(uniques) + 1 for uniques in categories]
+    if columns:
+        cell_numbers = np.ravel_multi_index(codes, shape)
+    else:
+        cell_numbers = np.zeros(n_rows, dtype=np.intp)
+    size = int(np.prod(shape))
+    if size <= max(n_rows, 1 << 20):
+        # 가능한 조합 수가 작으면 정렬 없이 빈도표로 실제 셀만 골라 번호를 다시 매김
+        present = np.bincount(cell_numbers, minlength=size) > 0
+        occupied = np.flatnonzero(present)
+        cell = (np.cumsum(present) - 1)[cell_numbers]
+    else:
+        occupied, cell = np.unique(cell_numbers, return_inverse=True)
+    cells = pd.DataFrame({
+        column: pd.Categorical.from_codes(coordinates - 1, categories=uniques)
+        for column, coordinates, uniques in zip(
+            dimensions, np.unravel_index(occupied, shape), categories
+        )
+    }, index=pd.RangeIndex(len(occupied)))
+    return cells, cell
+
+
+def _count(index, weights, size):
+    """위치별 행 수 (weights가 있으면 가중 합, 결과는 정수)"""
+    counts = np.bincount(index, weights=weights, minlength=size)
+    return counts if weights is None else counts.round().astype(np.int64)
+
+
+def _rating_levels(rated, max_levels):
+    """평점 값 목록과 행별 값 위치 (값 종류가 max_levels보다 많으면 None)"""
+    if len(rated) and np.array_equal(rated, np.floor(rated)):
+        # 정수 평점은 정렬 없이 값 위치를 바로 계산
+        offset = rated.min()
+        if rated.max() - offset < 1 << 16:
+            shifted = (rated - offset).astype(np.intp)
+            present = np.bincount(shifted) > 0
+            if present.sum() > max_levels:
+                return None, None
+            return np.flatnonzero(present) + offset, (np.cumsum(present) - 1)[shifted]
+    levels = np.unique(rated)
+    if len(levels) > max_levels:
+        return None, None
+    return levels, np.searchsorted(levels, rated)
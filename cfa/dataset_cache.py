@@ -0,0 +1,155 @@
+"""업로드 데이터의 디스크 캐시 (Arrow IPC 파일, 메모리 맵 재사용)"""
+import hashlib
+import os
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+DEFAULT_DIRECTORY = os.environ.get('CFA_DATASET_CACHE_DIR', os.path.join('.cfa_cache', 'datasets'))
+DEFAULT_MAX_MB = float(os.environ.get('CFA_DATASET_CACHE_MAX_MB', 2048))
+
+_SUFFIX = '.arrow'
+
+
+class DatasetCache:
+    """내용 해시로 식별하는 Arrow 파일 캐시
+
+    업로드 파일은 `<키>.arrow`로, 텍스트 컬럼별 파생 컬럼(감성, 토큰 등)은
+    `<키>.<컬럼 해시>.arrow`로 저장한다. 사용 시각은 파일 수정 시각으로
+    기록하며, 전체 크기가 한도를 넘으면 오래 사용하지 않은 데이터부터 지운다.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_mb=DEFAULT_MAX_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024**2)
+
+    @staticmethod
+    def key_for(data):
+        """파일 내용 해시"""
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def _path(self, key, column=None):
+        if column is None:
+            return os.path.join(self.directory, key + _SUFFIX)
+        column_key = hashlib.blake2b(str(column).encode(), digest_size=4).hexdigest()
+        return os.path.join(self.directory, f"{key}.{column_key}{_SUFFIX}")
+
+    def _read(self, path):
+        try:
+            with pa.memory_map(path, 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+                frame = table.to_pandas()
+        except (FileNotFoundError, pa.ArrowInvalid):
+            return None
+        os.utime(path)
+        return frame
+
+    def _write(self, path, frame, metadata):
+        try:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            # 여러 타입이 섞인 컬럼 등 Arrow로 변환할 수 없는 데이터는 캐시하지 않음
+            return False
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            **{name.encode(): str(value).encode() for name, value in metadata.items()},
+        })
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+        self.evict()
+        return True
+
+    def load(self, key):
+        """캐시된 데이터 (없으면 None)"""
+        return self._read(self._path(key))
+
+    def store(self, key, frame, source_name=''):
+        """데이터 저장 (저장하지 못하면 False)"""
+        return self._write(self._path(key), frame, {
+            'cfa.source_name': source_name,
+            'cfa.rows': len(frame),
+        })
+
+    def load_derived(self, key, column):
+        """텍스트 컬럼의 파생 컬럼 (없으면 None)"""
+        return self._read(self._path(key, column))
+
+    def store_derived(self, key, column, frame):
+        """텍스트 컬럼의 파생 컬럼 저장"""
+        return self._write(self._path(key, column), frame, {
+            'cfa.dataset': key,
+            'cfa.column': column,
+            'cfa.rows': len(frame),
+        })
+
+    def _files(self):
+        if not os.path.isdir(self.directory):
+            return []
+        return [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(_SUFFIX)
+        ]
+
+    def entries(self):
+        """캐시된 데이터 목록 (파생 컬럼 크기 포함, 최근 사용 순)"""
+        datasets = {}
+        for path in self._files():
+            key = os.path.basename(path).split('.')[0]
+            try:
+                stat = os.stat(path)
+                with pa.memory_map(path, 'r') as source:
+                    metadata = pa.ipc.open_file(source).schema.metadata or {}
+            except (FileNotFoundError, pa.ArrowInvalid):
+                continue
+            entry = datasets.setdefault(key, {
+                'key': key, 'name': '', 'rows': 0, 'size_mb': 0.0, 'last_used': 0.0,
+            })
+            entry['size_mb'] += stat.st_size / 1024**2
+            entry['last_used'] = max(entry['last_used'], stat.st_mtime)
+            if b'cfa.source_name' in metadata:
+                entry['name'] = metadata[b'cfa.source_name'].decode()
+                entry['rows'] = int(metadata[b'cfa.rows'])
+        return sorted(datasets.values(), key=lambda entry: entry['last_used'], reverse=True)
+
+    def total_bytes(self):
+        return sum(os.path.getsize(path) for path in self._files() if os.path.exists(path))
+
+    def purge(self, key=None):
+        """캐시 삭제 (key가 없으면 전체)"""
+        for path in self._files():
+            if key is None or os.path.basename(path).split('.')[0] == key:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def evict(self):
+        """전체 크기가 한도를 넘으면 오래 사용하지 않은 데이터부터 삭제"""
+        entries = self.entries()
+        total = sum(entry['size_mb'] for entry in entries) * 1024**2
+        while entries and total > self.max_bytes:
+            entry = entries.pop()
+            self.purge(entry['key'])
+            total -= entry['size_mb'] * 1024**2
+
+
+def format_entries(entries):
+    """사이드바 표시용 캐시 목록"""
+    return pd.DataFrame([
+        {
+            '파일': entry['name'],
+            '행 수': entry['rows'],
+            '크기(MB)': round(entry['size_mb'], 2),
+            '최근 사용': time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['last_used'])),
+        }
+        for entry in entries
+    ])
+
+
+dataset_cache = DatasetCache()
@@ -0,0 +1,98 @@
+"""데이터 타입 압축 (범주형 변환, 숫자 다운캐스트, 날짜 파싱)"""
+import numpy as np
+import pandas as pd
+
+# 고유 값 비율이 이 값 이하인 문자열 컬럼은 범주형으로 변환
+MAX_CATEGORY_RATIO = 0.5
+
+# 날짜 형식 후보 (표본 전체가 맞는 첫 형식으로 한 번에 파싱)
+DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y/%m/%d', '%Y.%m.%d', '%Y%m%d')
+
+
+def _is_text(values):
+    return values.dtype == object or isinstance(values.dtype, pd.StringDtype)
+
+
+def compact_column(values, max_category_ratio=MAX_CATEGORY_RATIO):
+    """컬럼 하나를 더 작은 타입으로 변환 (변환할 필요가 없으면 그대로 반환)"""
+    if _is_text(values):
+        sample = values.iloc[:10_000]
+        if sample.nunique(dropna=False) > len(sample) * max_category_ratio:
+            return values
+        if values.nunique(dropna=False) > len(values) * max_category_ratio:
+            return values
+        # 숫자와 문자열이 섞인 컬럼은 범주 정렬이 되지 않으므로 제외
+        if pd.api.types.infer_dtype(values, skipna=True) != 'string':
+            return values
+        return values.astype('category')
+    if pd.api.types.is_bool_dtype(values):
+        return values
+    if pd.api.types.is_integer_dtype(values):
+        return pd.to_numeric(values, downcast='integer')
+    if pd.api.types.is_float_dtype(values) and len(values) and values.notna().all():
+        # 결측값 없이 모두 정수인 실수 컬럼 (예: 엑셀의 평점)
+        array = values.to_numpy()
+        if np.isfinite(array).all() and np.array_equal(array, np.floor(array)):
+            return pd.to_numeric(values.astype(np.int64), downcast='integer')
+    return values
+
+
+def compact_frame(df, exclude=('date',), max_category_ratio=MAX_CATEGORY_RATIO):
+    """저카디널리티 문자열은 범주형, 정수는 가장 작은 정수형으로 변환"""
+    changes = {}
+    for column in df.columns:
+        if column in exclude:
+            continue
+        values = df[column]
+        compact = compact_column(values, max_category_ratio)
+        if compact.dtype != values.dtype:
+            changes[column] = compact
+    return df.assign(**changes) if changes else df
+
+
+def memory_mb(df):
+    """DataFrame 메모리 사용량 (MB, 문자열 포함)"""
+    return df.memory_usage(deep=True, index=False).sum() / 1024**2
+
+
+def memory_report(before, after):
+    """컬럼별 타입 변환 전후 메모리 비교 표"""
+    before_usage = before.memory_usage(deep=True, index=False)
+    after_usage = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        '원래 타입': before.dtypes.astype(str),
+        '변환 타입': after.dtypes.astype(str),
+        '원래(MB)': before_usage / 1024**2,
+        '변환(MB)': after_usage / 1024**2,
+    })
+    report['절감(%)'] = (1 - report['변환(MB)'] / report['원래(MB)'].replace(0, np.nan)) * 100
+    report.index.name = '컬럼'
+    return report.round({'원래(MB)': 4, '변환(MB)': 4, '절감(%)': 1})
+
+
+def detect_date_format(values, sample_size=100):
+    """표본 값이 모두 맞는 날짜 형식 (없으면 None)"""
+    sample = values.dropna().iloc[:sample_size].astype(str)
+    if sample.empty:
+        return None
+    for date_format in DATE_FORMATS:
+        try:
+            pd.to_datetime(sample, format=date_format)
+        except (ValueError, TypeError):
+            continue
+        return date_format
+    return None
+
+
+def parse_dates(values):
+    """날짜 컬럼 변환 (형식을 한 번 정해 전체를 파싱, 정하지 못하면 자동 추론)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    date_format = detect_date_format(values)
+    if date_format is not None:
+        try:
+            return pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError):
+            # 표본 이후에 다른 형식이 섞여 있는 경우
+            pass
+    return pd.to_datetime(values)
@@ -0,0 +1,190 @@
+"""유사 중복 피드백 찾기 (문자 shingle MinHash 서명과 LSH 버킷)
+
+복사해 붙인 글이나 틀에 맞춘 불만처럼 거의 같은 피드백을 한 묶음으로 모은다.
+행끼리 모두 비교하지 않고 서로 다른 텍스트마다 MinHash 서명을 만든 뒤, 서명을 나눈
+구간(band)이 같은 텍스트끼리만 비교하므로 시간과 메모리가 행 수에 거의 비례한다.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+# 문자 shingle 길이 (한글은 음절마다 정보가 많아 짧게)
+DEFAULT_SHINGLE_SIZE = 3
+
+# MinHash 서명 길이와 LSH 구간 수 (구간마다 서명 값 4개, 약 0.6 이상이면 후보)
+DEFAULT_NUM_PERM = 32
+DEFAULT_BANDS = 8
+
+# 같은 묶음으로 보는 추정 Jaccard 유사도 (서명 값이 같은 비율)
+DEFAULT_THRESHOLD = 0.8
+
+# 서명을 한 번에 계산하는 텍스트 수 (shingle 배열 메모리 제한)
+DEFAULT_CHUNK_SIZE = 20_000
+
+_non_word = re.compile(r'[\W_]+')
+
+
+def _mix(values):
+    """64비트 값 섞기 (splitmix64 마무리 단계, uint64 배열)"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def normalize_text(text):
+    """비교용 텍스트 (소문자, 띄어쓰기와 특수문자는 지움, 결측값은 빈 문자열)"""
+    if not isinstance(text, str):
+        return ''
+    return _non_word.sub('', text.lower())
+
+
+def normalized_codes(texts):
+    """행별 정규화 텍스트 번호와 번호별 정규화 텍스트 (원문이 같은 행은 한 번만 정규화)"""
+    raw_codes, raw_uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
+    codes, uniques = pd.factorize(pd.Series([normalize_text(text) for text in raw_uniques], dtype=object))
+    return codes[raw_codes], list(uniques)
+
+
+def _shingle_hashes(texts, shingle_size):
+    """텍스트 목록의 문자 shingle 해시와 텍스트별 shingle 개수
+
+    텍스트를 한 배열로 이어 붙여(뒤에 shingle 길이 - 1개의 빈 문자) 한꺼번에 계산한다.
+    shingle 길이보다 짧은 텍스트는 텍스트 전체를 shingle 하나로 사용한다.
+    """
+    padding = '\0' * (shingle_size - 1)
+    codes = np.frombuffer(padding.join(texts).encode('utf-32-le') + padding.encode('utf-32-le'), dtype=np.uint32)
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    starts = np.concatenate(([0], np.cumsum(lengths + shingle_size - 1)[:-1]))
+    counts = np.maximum(lengths - shingle_size + 1, 1)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    positions = np.repeat(starts, counts) + offsets
+
+    hashes = np.zeros(len(positions), dtype=np.uint64)
+    for j in range(shingle_size):
+        hashes = hashes * np.uint64(0x100000001B3) + codes[positions + j].astype(np.uint64)
+    return _mix(hashes), counts
+
+
+def minhash_signatures(texts, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                       shingle_size=DEFAULT_SHINGLE_SIZE, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """비어 있지 않은 텍스트 목록의 (서명 지문, LSH 구간 키)
+
+    서명 지문은 텍스트마다 num_perm개의 MinHash 값 상위 16비트(uint16, 유사도 추정용),
+    구간 키는 서명을 bands개로 나눈 구간마다 값들을 섞은 uint64이다.
+    """
+    if num_perm % bands:
+        raise ValueError("서명 길이는 구간 수의 배수여야 합니다.")
+    rng = np.random.default_rng(seed)
+    # 해시 값을 순열처럼 바꾸는 a * h + b (a는 홀수, uint64 범위에서 순환)
+    multipliers = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    increments = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+    rows_per_band = num_perm // bands
+
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint16)
+    band_keys = np.empty((len(texts), bands), dtype=np.uint64)
+    for chunk_start in range(0, len(texts), chunk_size):
+        chunk = texts[chunk_start:chunk_start + chunk_size]
+        hashes, counts = _shingle_hashes(chunk, shingle_size)
+        group_starts = np.cumsum(counts) - counts
+        minima = np.empty((len(chunk), num_perm), dtype=np.uint64)
+        for perm in range(num_perm):
+            minima[:, perm] = np.minimum.reduceat(hashes * multipliers[perm] + increments[perm], group_starts)
+        rows = slice(chunk_start, chunk_start + len(chunk))
+        signatures[rows] = (minima >> np.uint64(48)).astype(np.uint16)
+        for band in range(bands):
+            key = np.full(len(chunk), np.uint64(band), dtype=np.uint64)
+            for column in range(band * rows_per_band, (band + 1) * rows_per_band):
+                key = _mix(key ^ minima[:, column])
+            band_keys[rows, band] = key
+    return signatures, band_keys
+
+
+def _candidate_pairs(band_keys):
+    """구간 키가 같은 텍스트 쌍 (앞선 번호, 뒤 번호)
+
+    버킷마다 모든 쌍을 만들면 큰 버킷에서 쌍 수가 제곱으로 늘어나므로, 버킷의 첫 텍스트
+    (번호가 가장 작은 텍스트)와 나머지만 연결해 쌍 수를 텍스트 수에 비례하게 둔다.
+    """
+    lower, higher = [], []
+    for band in range(band_keys.shape[1]):
+        order = np.argsort(band_keys[:, band], kind='stable')
+        keys = band_keys[order, band]
+        new_bucket = np.concatenate(([True], keys[1:] != keys[:-1]))
+        bucket_first = order[new_bucket][np.cumsum(new_bucket) - 1]
+        linked = ~new_bucket
+        lower.append(bucket_first[linked])
+        higher.append(order[linked])
+    return np.concatenate(lower), np.concatenate(higher)
+
+
+def _leaders(lower, higher, n_texts):
+    """텍스트별 대표 텍스트 번호 (앞선 텍스트가 먼저 대표가 됨)
+
+    앞에서부터 보면서 자신보다 앞선 대표와 비슷하면 그중 가장 앞선 대표를 따르고, 없으면
+    스스로 대표가 된다. 비슷한 쌍을 이어 붙이기만 하면 조금씩 다른 텍스트가 끝없이 이어져
+    서로 다른 피드백이 한 묶음이 되므로, 묶음의 모든 텍스트가 대표와 직접 비슷하도록 한다.
+    """
+    is_leader = np.ones(n_texts, dtype=bool)
+    # 대표 여부가 바뀌지 않을 때까지 반복 (앞선 텍스트부터 확정되므로 연결 길이만큼 반복)
+    while True:
+        follows = np.zeros(n_texts, dtype=bool)
+        follows[higher[is_leader[lower]]] = True
+        if np.array_equal(~follows, is_leader):
+            break
+        is_leader = ~follows
+    leaders = np.arange(n_texts)
+    to_leader = is_leader[lower]
+    np.minimum.at(leaders, higher[to_leader], lower[to_leader])
+    return leaders
+
+
+def duplicate_clusters(texts, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                       shingle_size=DEFAULT_SHINGLE_SIZE, seed=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """행별 유사 중복 묶음 번호 (첫 등장 순서로 0부터, 결측·빈 텍스트는 -1)
+
+    정규화한 텍스트가 같은 행은 서명을 한 번만 만들고, LSH 후보 쌍 중 서명이 같은 비율
+    (추정 Jaccard 유사도)이 threshold 이상인 텍스트를 묶음 대표(묶음에서 처음 나온 텍스트)에
+    붙인다. 후보 쌍은 버킷마다 첫 텍스트와만 만들므로 비슷해도 비교하지 않는 쌍이 있다.
+    """
+    codes, uniques = normalized_codes(texts)
+    labels = np.full(len(uniques), -1, dtype=np.int64)
+    present = np.fromiter((bool(text) for text in uniques), dtype=bool, count=len(uniques))
+    candidates = np.flatnonzero(present)
+    if len(candidates):
+        signatures, band_keys = minhash_signatures(
+            [uniques[i] for i in candidates], num_perm, bands, shingle_size, seed, chunk_size
+        )
+        lower, higher = _candidate_pairs(band_keys)
+        similar = (signatures[lower] == signatures[higher]).mean(axis=1) >= threshold
+        labels[candidates] = _leaders(lower[similar], higher[similar], len(candidates))
+
+    clusters = labels[codes]
+    # 묶음 번호를 행에 처음 나오는 순서로 다시 매김
+    valid = clusters >= 0
+    _, first_rows, inverse = np.unique(clusters[valid], return_index=True, return_inverse=True)
+    rank = np.empty(len(first_rows), dtype=np.int64)
+    rank[np.argsort(first_rows, kind='stable')] = np.arange(len(first_rows))
+    clusters[valid] = rank[inverse]
+    return clusters
+
+
+def cluster_sizes(clusters):
+    """행별 자신이 속한 묶음의 행 수 (묶음이 없는 행은 1)"""
+    clusters = np.asarray(clusters)
+    sizes = np.ones(len(clusters), dtype=np.int64)
+    valid = clusters >= 0
+    sizes[valid] = np.bincount(clusters[valid])[clusters[valid]]
+    return sizes
+
+
+def representative_rows(clusters):
+    """묶음마다 첫 행만 남긴 행 위치 (묶음이 없는 행은 모두 유지, 원래 순서)"""
+    clusters = np.asarray(clusters)
+    valid = clusters >= 0
+    _, first_rows = np.unique(clusters[valid], return_index=True)
+    keep = ~valid
+    keep[np.flatnonzero(valid)[first_rows]] = True
+    return np.flatnonzero(keep)
@@ -0,0 +1,133 @@
+"""Excel(.xlsx) 파일 스트리밍 읽기 (openpyxl 읽기 전용 모드, 시트·컬럼 선택)
+
+`pd.read_excel`은 시트의 모든 행과 컬럼을 파이썬 값 목록으로 만든 뒤 DataFrame으로
+바꾸므로 큰 파일에서는 메모리를 많이 쓴다. 여기서는 행을 하나씩 읽어 필요한 컬럼만
+골라 청크 크기만큼 모일 때마다 DataFrame으로 넘기므로 메모리 사용량이 청크 크기에 비례한다.
+"""
+import io
+from operator import itemgetter
+
+import pandas as pd
+
+# 한 번에 DataFrame으로 바꾸는 행 수
+DEFAULT_CHUNK_SIZE = 50_000
+
+# 시트·컬럼을 고를 때 기본으로 선택하는 분석 컬럼 (시트에 있는 것만)
+DEFAULT_COLUMNS = ('date', 'product', 'category', 'feedback_text', 'rating')
+
+
+def _open(source):
+    """읽기 전용 통합 문서 (source는 파일 경로, 파일 객체 또는 파일 내용 bytes)"""
+    # openpyxl은 Excel 파일을 읽을 때만 불러옴
+    from openpyxl import load_workbook
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    return load_workbook(source, read_only=True, data_only=True, keep_links=False)
+
+
+def _sheet(workbook, sheet):
+    """이름 또는 번호로 시트 선택 (None이면 첫 시트)"""
+    if sheet is None:
+        sheet = 0
+    if isinstance(sheet, int):
+        return workbook.worksheets[sheet]
+    if sheet not in workbook.sheetnames:
+        raise ValueError(f"시트 '{sheet}'이(가) 파일에 없습니다.")
+    return workbook[sheet]
+
+
+def _header_names(values):
+    """머리글 행 값을 컬럼 이름으로 (빈 칸은 'Unnamed: 번호', 같은 이름은 '.1'처럼 번호를 붙임)"""
+    names = []
+    seen = {}
+    for position, value in enumerate(values):
+        name = f'Unnamed: {position}' if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _rows(worksheet):
+    """시트의 행 값 튜플 (읽기 전용 시트의 크기 정보가 틀릴 수 있으므로 끝까지 읽음)"""
+    worksheet.reset_dimensions()
+    return worksheet.iter_rows(values_only=True)
+
+
+def sheet_columns(source):
+    """시트별 컬럼 이름 {시트 이름: [컬럼 이름]} (시트마다 머리글 행만 읽음)"""
+    workbook = _open(source)
+    try:
+        layout = {}
+        for worksheet in workbook.worksheets:
+            header = next(_rows(worksheet), ())
+            layout[worksheet.title] = _header_names(header)
+        return layout
+    finally:
+        workbook.close()
+
+
+def sheet_rows(source, sheet=None):
+    """시트 정보(dimension)에 적힌 데이터 행 수 (머리글 행 제외, 적혀 있지 않으면 None)
+
+    행을 읽지 않고 파일에 적힌 크기만 보므로 실제 행 수와 다를 수 있다 (진행률 표시용).
+    """
+    workbook = _open(source)
+    try:
+        max_row = _sheet(workbook, sheet).max_row
+        return None if max_row is None else max(max_row - 1, 0)
+    finally:
+        workbook.close()
+
+
+def iter_excel_chunks(source, sheet=None, columns=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """시트를 청크 단위 DataFrame으로 읽기 (columns를 주면 그 컬럼만 변환, 빈 행은 건너뜀)
+
+    첫 행은 머리글로 사용한다. 행마다 필요한 칸만 골라 두고, 값 타입은 청크마다
+    DataFrame을 만들 때 추론한다.
+    """
+    workbook = _open(source)
+    try:
+        rows = _rows(_sheet(workbook, sheet))
+        names = _header_names(next(rows, ()))
+        if columns is None:
+            positions = list(range(len(names)))
+        else:
+            missing = [column for column in columns if column not in names]
+            if missing:
+                raise ValueError(f"컬럼 {', '.join(map(str, missing))}이(가) 시트에 없습니다.")
+            positions = [names.index(column) for column in columns]
+        selected = [names[position] for position in positions]
+        width = max(positions, default=-1) + 1
+        # itemgetter는 칸이 하나면 값 하나를 반환하므로 길이 1 구간으로 골라 튜플로 맞춤
+        pick = itemgetter(*positions) if len(positions) > 1 else itemgetter(slice(width - 1, width))
+
+        chunk = []
+        yielded = False
+        for row in rows:
+            # 뒤쪽 빈 칸이 잘린 행은 빈 값으로 채움
+            if len(row) < width:
+                row = row + (None,) * (width - len(row))
+            values = pick(row)
+            if all(value is None for value in values):
+                continue
+            chunk.append(values)
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame.from_records(chunk, columns=selected)
+                chunk = []
+                yielded = True
+        # 행이 없는 시트도 컬럼만 있는 빈 DataFrame 하나를 넘김
+        if chunk or not yielded:
+            yield pd.DataFrame.from_records(chunk, columns=selected)
+    finally:
+        workbook.close()
+
+
+def read_excel_columns(source, sheet=None, columns=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """시트 전체를 DataFrame 하나로 (필요한 컬럼만 청크 단위로 읽어 합침)"""
+    chunks = list(iter_excel_chunks(source, sheet, columns, chunk_size))
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
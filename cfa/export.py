@@ -0,0 +1,93 @@
+"""결과 내보내기 (요청할 때만 청크 단위로 생성, CSV / Excel / Parquet)"""
+import codecs
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+# 형식별 (버튼 이름, 파일 확장자, MIME 타입)
+EXPORT_FORMATS = {
+    'csv': ('CSV', 'csv', 'text/csv'),
+    'xlsx': ('Excel', 'xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ('Parquet', 'parquet', 'application/vnd.apache.parquet'),
+}
+
+
+def _chunks(df, rows, chunk_size):
+    """행 위치 순서대로 청크 단위 데이터 (rows가 None이면 전체)"""
+    if rows is None:
+        rows = np.arange(len(df))
+    for start in range(0, len(rows), chunk_size):
+        yield df.iloc[rows[start:start + chunk_size]]
+
+
+def iter_csv(df, rows=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """UTF-8(BOM) CSV 바이트를 청크 단위로 생성 (머리글은 첫 청크에만)"""
+    yield codecs.BOM_UTF8
+    yield df.head(0).to_csv(index=False).encode('utf-8')
+    for chunk in _chunks(df, rows, chunk_size):
+        yield chunk.to_csv(index=False, header=False).encode('utf-8')
+
+
+def _excel_values(chunk):
+    """openpyxl이 쓸 수 있는 값으로 변환 (결측값은 빈 셀, 기간·범주는 문자열)"""
+    columns = {}
+    for column in chunk.columns:
+        values = chunk[column]
+        if isinstance(values.dtype, pd.PeriodDtype):
+            values = values.astype(str).where(values.notna(), None)
+        elif isinstance(values.dtype, pd.DatetimeTZDtype):
+            # Excel 셀은 시간대를 저장하지 못함
+            values = values.dt.tz_localize(None)
+        values = values.astype(object)
+        columns[column] = values.where(values.notna(), None)
+    return pd.DataFrame(columns, index=chunk.index)
+
+
+def write_xlsx(df, rows=None, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name='Feedback Data'):
+    """쓰기 전용 모드 Excel 파일 (행을 순서대로 흘려 써서 메모리 사용량이 일정)"""
+    # openpyxl은 Excel 파일을 만들 때만 불러옴
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(column) for column in df.columns])
+    for chunk in _chunks(df, rows, chunk_size):
+        for record in _excel_values(chunk).itertuples(index=False, name=None):
+            sheet.append(record)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def write_parquet(df, rows=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Parquet 파일 (청크마다 행 그룹 하나)
+
+    스키마는 전체 데이터에서 한 번 정해 모든 청크에 쓴다. 청크마다 추론하면 첫 청크에서
+    값이 모두 비어 있던 컬럼처럼 청크끼리 타입이 달라져 쓰기가 실패한다.
+    """
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    buffer = io.BytesIO()
+    with pq.ParquetWriter(buffer, schema) as writer:
+        chunks = 0
+        for chunk in _chunks(df, rows, chunk_size):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            chunks += 1
+        if not chunks:
+            writer.write_table(pa.Table.from_pandas(df.head(0), schema=schema, preserve_index=False))
+    return buffer.getvalue()
+
+
+def export_rows(df, rows=None, export_format='csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    """행 위치에 해당하는 데이터를 지정한 형식의 파일 바이트로 변환"""
+    if export_format == 'csv':
+        return b''.join(iter_csv(df, rows, chunk_size))
+    if export_format == 'xlsx':
+        return write_xlsx(df, rows, chunk_size)
+    if export_format == 'parquet':
+        return write_parquet(df, rows, chunk_size)
+    raise ValueError(f"지원되지 않는 내보내기 형식입니다: {export_format}")
@@ -0,0 +1,94 @@
+"""고급 필터링용 비트맵 인덱스"""
+import numpy as np
+import pandas as pd
+
+# 값이 이보다 많은 컬럼은 값별 비트맵 대신 범주 코드로 필터링
+MAX_BITMAPS = 256
+
+
+class FilterIndex:
+    """컬럼 값별 비트맵(packbits)을 미리 만들어 두고 선택 조합을 비트 연산으로 처리
+
+    같은 컬럼 안의 선택 값은 OR, 컬럼 사이는 AND로 결합하며 결과는
+    데이터 복사 없이 행 위치 배열로 반환한다.
+    """
+
+    def __init__(self, df, columns=('product', 'category', 'sentiment'), rating_column='rating'):
+        self.n_rows = len(df)
+        self.options = {}
+        self._bitmaps = {}
+        self._codes = {}
+        for column in columns:
+            if column not in df.columns:
+                continue
+            # 결측값도 하나의 선택지로 유지 (Series.unique / isin과 같은 동작)
+            codes, uniques = pd.factorize(df[column], use_na_sentinel=False)
+            self.options[column] = list(uniques)
+            if len(uniques) <= MAX_BITMAPS:
+                self._bitmaps[column] = {
+                    value: np.packbits(codes == code) for code, value in enumerate(uniques)
+                }
+            else:
+                self._codes[column] = (codes, {value: code for code, value in enumerate(uniques)})
+
+        self.rating_bounds = None
+        self._rating_bitmaps = None
+        self._ratings = None
+        if rating_column in df.columns:
+            ratings = df[rating_column].to_numpy(dtype=float)
+            valid = ratings[~np.isnan(ratings)]
+            if len(valid):
+                self.rating_bounds = (valid.min(), valid.max())
+                levels = np.unique(valid)
+                if len(levels) <= MAX_BITMAPS:
+                    self._rating_bitmaps = {level: np.packbits(ratings == level) for level in levels}
+                else:
+                    self._ratings = ratings
+
+    def _all(self):
+        return np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def _none(self):
+        return np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+
+    def value_bitmap(self, column, values):
+        """컬럼에서 선택한 값 중 하나라도 해당하는 행 (OR)"""
+        if column in self._bitmaps:
+            bitmaps = self._bitmaps[column]
+            result = self._none()
+            for value in values:
+                if value in bitmaps:
+                    np.bitwise_or(result, bitmaps[value], out=result)
+            return result
+        codes, lookup = self._codes[column]
+        selected = [lookup[value] for value in values if value in lookup]
+        return np.packbits(np.isin(codes, selected))
+
+    def rating_bitmap(self, low, high):
+        """평점이 [low, high] 범위인 행"""
+        if self._rating_bitmaps is not None:
+            result = self._none()
+            for level, bitmap in self._rating_bitmaps.items():
+                if low <= level <= high:
+                    np.bitwise_or(result, bitmap, out=result)
+            return result
+        if self._ratings is not None:
+            return np.packbits((self._ratings >= low) & (self._ratings <= high))
+        return self._none()
+
+    def query(self, selections=None, rating_range=None):
+        """선택 조건을 AND로 결합한 행 위치 (빈 선택은 조건 없음으로 처리)"""
+        result = self._all()
+        for column, values in (selections or {}).items():
+            if column in self.options and values:
+                np.bitwise_and(result, self.value_bitmap(column, values), out=result)
+        if rating_range is not None and self.rating_bounds is not None:
+            np.bitwise_and(result, self.rating_bitmap(*rating_range), out=result)
+        return np.flatnonzero(np.unpackbits(result, count=self.n_rows))
+
+
+def take_rows(df, rows):
+    """행 위치 배열에 해당하는 데이터 (전체 행이면 복사하지 않음)"""
+    if len(rows) == len(df):
+        return df
+    return df.iloc[rows]
@@ -0,0 +1,48 @@
+"""결과 표 페이지 나누기 (정렬 순서·검색 결과는 행 위치 배열로 계산)"""
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = (25, 50, 100, 200)
+
+
+def sort_order(values, ascending=True):
+    """정렬된 행 위치 (같은 값은 원래 순서 유지, 결측값은 마지막)"""
+    values = pd.Series(values).reset_index(drop=True)
+    order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index
+    return order.to_numpy(dtype=np.int64)
+
+
+def search_mask(texts, query):
+    """검색어를 포함하는 행 (대소문자 무시, 결측값 제외)"""
+    texts = pd.Series(texts)
+    if isinstance(texts.dtype, pd.CategoricalDtype):
+        # 범주 값에서만 찾고 행으로 펼침
+        matches = texts.cat.categories.astype(str).str.contains(query, case=False, regex=False)
+        codes = texts.cat.codes.to_numpy()
+        return np.append(np.asarray(matches, dtype=bool), False)[codes]
+    matches = texts.astype(str).str.contains(query, case=False, regex=False, na=False)
+    return matches.to_numpy(dtype=bool) & texts.notna().to_numpy()
+
+
+def visible_rows(n_rows, rows=None, order=None, mask=None):
+    """표시할 행 위치 (rows: 필터 결과, order: 정렬 순서, mask: 검색 결과)"""
+    if rows is None and mask is None:
+        return np.arange(n_rows) if order is None else order
+    selected = np.zeros(n_rows, dtype=bool)
+    if rows is None:
+        selected[:] = True
+    else:
+        selected[rows] = True
+    if mask is not None:
+        selected &= mask
+    if order is None:
+        return np.flatnonzero(selected)
+    return order[selected[order]]
+
+
+def page_slice(positions, page, page_size):
+    """한 페이지의 행 위치와 (보정한 페이지 번호, 전체 페이지 수)"""
+    page_count = max(1, -(-len(positions) // page_size))
+    page = min(max(1, page), page_count)
+    start = (page - 1) * page_size
+    return positions[start:start + page_size], page, page_count
@@ -0,0 +1,107 @@
+"""세션별 백그라운드 분석 작업 (단계별 결과를 준비되는 대로 공개, 취소 가능)"""
+import threading
+import time
+
+SESSION_KEY = 'analysis_job'
+
+
+class AnalysisJob:
+    """분석 단계를 순서대로 백그라운드 스레드에서 실행하는 작업
+
+    stages는 (이름, 함수) 목록이며 함수는 지금까지의 결과 dict를 받아 그 단계의
+    결과를 반환한다. 각 단계 결과는 끝나는 즉시 `results`에 공개되므로 화면은
+    기다리지 않고 준비된 부분부터 그릴 수 있다. 취소하면 다음 단계로 넘어가지
+    않고 결과를 비운다 (진행 중인 단계는 끝난 뒤 버림).
+    """
+
+    def __init__(self, key, stages):
+        self.key = key
+        self.stage_names = [name for name, _ in stages]
+        self.results = {}
+        self.error = None
+        self.started_at = None
+        self._stages = list(stages)
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='analysis-job', daemon=True)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            for name, stage in self._stages:
+                if self._cancelled.is_set():
+                    break
+                value = stage(self.results)
+                with self._condition:
+                    if self._cancelled.is_set():
+                        break
+                    self.results[name] = value
+                    self._condition.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._stages = []
+            with self._condition:
+                self._finished.set()
+                self._condition.notify_all()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def progress(self):
+        """끝난 단계 비율"""
+        return len(self.results) / len(self.stage_names) if self.stage_names else 1.0
+
+    @property
+    def elapsed(self):
+        return 0.0 if self.started_at is None else time.perf_counter() - self.started_at
+
+    def wait(self, name, timeout=None):
+        """단계 결과가 나오거나 작업이 끝날 때까지 대기 (timeout 안에 준비되면 True)"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: name in self.results or self._finished.is_set(), timeout
+            ) and name in self.results
+
+    def cancel(self):
+        """남은 단계를 실행하지 않고 결과를 비움 (데이터 참조를 놓아 메모리 반환)"""
+        with self._condition:
+            self._cancelled.set()
+            self.results = {}
+            self._condition.notify_all()
+
+
+def session_job(state, key, build_stages):
+    """세션의 분석 작업 (key가 바뀌면 이전 작업을 취소하고 새로 시작)
+
+    state는 세션 상태 dict(`st.session_state`), build_stages는 새 작업을 시작할 때만
+    호출해 단계 목록을 만드는 함수다.
+    """
+    job = state.get(SESSION_KEY)
+    # 입력이 바뀌었거나 실패한 작업은 새로 시작
+    if job is not None and (job.key != key or job.error is not None):
+        job.cancel()
+        job = None
+    if job is None:
+        job = AnalysisJob(key, build_stages()).start()
+        state[SESSION_KEY] = job
+    return job
+
+
+def cancel_session_job(state):
+    """세션의 분석 작업 취소 (파일을 닫은 경우 등)"""
+    job = state.get(SESSION_KEY)
+    if job is not None:
+        job.cancel()
+        del state[SESSION_KEY]
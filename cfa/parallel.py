@@ -0,0 +1,99 @@
+"""텍스트 분석 병렬 처리 (프로세스 풀, 파티션 단위로 나눠 분석 후 합침)"""
+import multiprocessing
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from cfa.text import count_token_strings, text_features
+
+# 분석 프로세스 수 (1이면 직렬, 0이면 CPU 코어 수), 환경 변수로 변경 가능
+DEFAULT_WORKERS = int(os.environ.get('CFA_ANALYSIS_WORKERS', 1))
+
+# 프로세스 하나에 한 번에 보내는 행 수
+DEFAULT_PARTITION_SIZE = int(os.environ.get('CFA_ANALYSIS_PARTITION_ROWS', 50_000))
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def resolve_workers(workers=None):
+    """실제 사용할 프로세스 수 (None이면 기본값, 0 이하면 CPU 코어 수)"""
+    workers = DEFAULT_WORKERS if workers is None else int(workers)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _pool(workers):
+    """프로세스 수별로 한 번만 만들어 재사용하는 프로세스 풀
+
+    Streamlit 서버처럼 스레드가 있는 프로세스에서 fork하지 않도록 spawn으로 시작한다.
+    """
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+            )
+            _pools[workers] = pool
+        return pool
+
+
+def _discard_pool(workers):
+    with _pools_lock:
+        pool = _pools.pop(workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _analyze_partition(values, keywords):
+    """파티션 하나의 감성/토큰/길이와 (keywords=True이면) 토큰 빈도"""
+    features = text_features(pd.Series(values, dtype=object))
+    counts = count_token_strings(features['tokens']) if keywords else None
+    return features, counts
+
+
+def _analyze_serial(texts, keywords):
+    features = text_features(texts)
+    counts = count_token_strings(features['tokens']) if keywords else None
+    return features, counts
+
+
+def analyze_texts(texts, workers=None, partition_size=None, keywords=False):
+    """텍스트 컬럼 분석 (`text_features`와 같은 결과, 행이 많으면 프로세스 풀로 병렬 처리)
+
+    (파생 컬럼 표, 토큰 빈도 Counter 또는 None)을 반환한다. 파티션 결과는 원래 행 순서대로
+    이어 붙이고 토큰 빈도는 더하므로 직렬 처리 결과와 정확히 같다.
+    프로세스 풀을 쓸 수 없으면 직렬로 처리한다.
+    """
+    texts = pd.Series(texts)
+    workers = resolve_workers(workers)
+    partition_size = max(1, int(partition_size or DEFAULT_PARTITION_SIZE))
+    if workers <= 1 or len(texts) <= partition_size:
+        return _analyze_serial(texts, keywords)
+
+    if isinstance(texts.dtype, pd.CategoricalDtype):
+        texts = texts.astype(object)
+    partitions = [
+        texts.iloc[start:start + partition_size].tolist()
+        for start in range(0, len(texts), partition_size)
+    ]
+    try:
+        results = list(_pool(workers).map(
+            _analyze_partition, partitions, [keywords] * len(partitions)
+        ))
+    except (BrokenProcessPool, OSError):
+        # 작업 프로세스가 종료되었거나 만들 수 없는 환경
+        _discard_pool(workers)
+        return _analyze_serial(texts, keywords)
+
+    features = pd.concat([frame for frame, _ in results], ignore_index=True)
+    features.index = texts.index
+    counts = None
+    if keywords:
+        counts = Counter()
+        for _, partition_counts in results:
+            counts.update(partition_counts)
+    return features, counts
@@ -0,0 +1,239 @@
+"""단계별 성능 측정 (앱 실행 한 번의 단계별 시간, 행 수, 메모리 변화, 캐시 적중 여부)
+
+측정은 `profile_run`으로 켠 스레드(세션의 스크립트 실행)에서만 기록되고, 꺼져 있으면
+`profile_stage`와 `profiled`는 아무 일도 하지 않는다.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# 세션마다 보관하는 최근 실행 기록 수
+MAX_RUNS = 20
+
+_local = threading.local()
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = None
+
+
+def current_rss():
+    """현재 프로세스 상주 메모리 (바이트, 확인할 수 없는 환경이면 None)"""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def row_count(value):
+    """단계 결과의 행 수 (DataFrame/Series 또는 그것을 담은 튜플, 그 외에는 None)"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return len(value)
+    if isinstance(value, tuple):
+        for item in value:
+            if isinstance(item, (pd.DataFrame, pd.Series)):
+                return len(item)
+    return None
+
+
+class Profiler:
+    """실행 한 번의 단계 기록
+
+    단계마다 이름, 종류('section' 또는 'cache'), 시작 시각(실행 시작 기준 초), 소요 시간,
+    행 수, 상주 메모리 변화(MB), 캐시 적중 여부, 중첩 깊이를 dict로 남긴다.
+    """
+
+    def __init__(self, label=None):
+        self.label = label
+        self.started_at = time.time()
+        self.spans = []
+        self.duration = None
+        self._origin = time.perf_counter()
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name, rows=None, kind='section'):
+        """단계 하나를 측정 (yield한 dict의 'rows', 'cache'는 단계 안에서 채울 수 있음)"""
+        rss_before = current_rss()
+        span = {
+            'name': name,
+            'kind': kind,
+            'start': time.perf_counter() - self._origin,
+            'duration': None,
+            'rows': rows,
+            'memory_mb': None,
+            'cache': None,
+            'depth': self._depth,
+        }
+        self.spans.append(span)
+        self._depth += 1
+        try:
+            yield span
+        finally:
+            self._depth -= 1
+            span['duration'] = time.perf_counter() - self._origin - span['start']
+            rss_after = current_rss()
+            if rss_before is not None and rss_after is not None:
+                span['memory_mb'] = (rss_after - rss_before) / 1024**2
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._origin
+        return self
+
+    @property
+    def cache_hits(self):
+        return sum(span['cache'] == 'hit' for span in self.spans)
+
+    @property
+    def cache_misses(self):
+        return sum(span['cache'] == 'miss' for span in self.spans)
+
+    def to_frame(self):
+        """단계 기록 표 (시작 순서)"""
+        frame = pd.DataFrame(self.spans, columns=[
+            'name', 'kind', 'start', 'duration', 'rows', 'memory_mb', 'cache', 'depth',
+        ])
+        frame['start'] = frame['start'] * 1000
+        frame['duration'] = frame['duration'] * 1000
+        return frame
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'started_at': self.started_at,
+            'duration': self.duration,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'spans': self.spans,
+        }
+
+
+def active_profiler():
+    """현재 스레드에서 측정 중인 Profiler (없으면 None)"""
+    return getattr(_local, 'profiler', None)
+
+
+@contextmanager
+def profile_run(enabled=True, label=None):
+    """스크립트 실행 한 번을 측정 (enabled=False이면 None을 yield하고 기록하지 않음)"""
+    if not enabled:
+        yield None
+        return
+    profiler = Profiler(label)
+    previous = active_profiler()
+    _local.profiler = profiler
+    try:
+        yield profiler
+    finally:
+        _local.profiler = previous
+        profiler.finish()
+
+
+@contextmanager
+def profile_stage(name, rows=None, kind='section'):
+    """측정 중이면 단계를 기록하는 context manager (아니면 빈 dict를 yield)"""
+    profiler = active_profiler()
+    if profiler is None:
+        yield {}
+        return
+    with profiler.stage(name, rows=rows, kind=kind) as span:
+        yield span
+
+
+def profiled(name=None):
+    """함수 호출을 단계로 기록하는 데코레이터 (반환값이 DataFrame이면 행 수도 기록)"""
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if active_profiler() is None:
+                return func(*args, **kwargs)
+            with profile_stage(stage_name) as span:
+                value = func(*args, **kwargs)
+                span['rows'] = row_count(value)
+                return value
+
+        return wrapper
+
+    return decorator
+
+
+def remember_run(history, profiler, max_runs=MAX_RUNS):
+    """세션의 최근 실행 기록 목록에 추가 (오래된 것부터 버림)"""
+    history.append(profiler)
+    del history[:-max_runs]
+    return history
+
+
+def to_json(profilers):
+    """실행 기록 목록을 JSON 문자열로"""
+    return json.dumps([profiler.to_dict() for profiler in profilers], ensure_ascii=False, indent=2)
+
+
+def to_chrome_trace(profilers):
+    """실행 기록 목록을 Chrome trace 형식(chrome://tracing, Perfetto) JSON 문자열로
+
+    실행마다 별도 스레드 줄(tid)로 표시하고, 시각은 첫 실행 시작 기준 마이크로초다.
+    """
+    events = []
+    origin = min((profiler.started_at for profiler in profilers), default=0.0)
+    for run, profiler in enumerate(profilers, start=1):
+        offset = (profiler.started_at - origin) * 1e6
+        events.append({
+            'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': run,
+            'args': {'name': f"run {run}" + (f" ({profiler.label})" if profiler.label else '')},
+        })
+        for span in profiler.spans:
+            if span['duration'] is None:
+                continue
+            events.append({
+                'name': span['name'],
+                'cat': span['kind'],
+                'ph': 'X',
+                'pid': 1,
+                'tid': run,
+                'ts': offset + span['start'] * 1e6,
+                'dur': span['duration'] * 1e6,
+                'args': {key: span[key] for key in ('rows', 'memory_mb', 'cache') if span[key] is not None},
+            })
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}, ensure_ascii=False)
+
+
+def waterfall_figure(profiler):
+    """단계별 시작 시각·소요 시간 폭포 차트 (중첩 단계는 들여 써서 표시)"""
+    import plotly.graph_objects as go
+
+    frame = profiler.to_frame().dropna(subset=['duration'])
+    colors = {'hit': '#2E8B57', 'miss': '#DC143C'}
+    # 같은 단계가 여러 번 호출될 수 있으므로 순번을 붙여 줄을 나눔
+    labels = [
+        f"{'· ' * depth}{number}. {name}"
+        for number, (name, depth) in enumerate(zip(frame['name'], frame['depth']), start=1)
+    ]
+    fig = go.Figure(go.Bar(
+        y=labels,
+        x=frame['duration'],
+        base=frame['start'],
+        orientation='h',
+        marker_color=[colors.get(cache, '#636efa') for cache in frame['cache']],
+        customdata=frame[['rows', 'cache']].astype(object).where(frame[['rows', 'cache']].notna(), '-'),
+        hovertemplate="%{y}<br>시작 %{base:.1f}ms, %{x:.1f}ms<br>행 %{customdata[0]}, 캐시 %{customdata[1]}<extra></extra>",
+    ))
+    fig.update_layout(
+        height=max(200, 22 * len(frame) + 60),
+        margin=dict(l=0, r=0, t=10, b=30),
+        xaxis_title="ms",
+        yaxis=dict(autorange='reversed'),
+        showlegend=False,
+    )
+    return fig
@@ -0,0 +1,242 @@
+"""근사 분석용 층화 표본 (제품/카테고리/월 층별 저장 표본과 95% 신뢰구간 추정)"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# 층을 나누는 컬럼 (월은 date 컬럼에서 계산, 없는 컬럼은 건너뜀)
+DEFAULT_STRATA = ('product', 'category', 'month')
+
+# 층마다 유지하는 최대 표본 행 수, 환경 변수로 변경 가능
+DEFAULT_PER_STRATUM = int(os.environ.get('CFA_SAMPLE_PER_STRATUM', 2000))
+
+# 95% 신뢰구간의 표준 정규 분위수
+Z_95 = 1.959963984540054
+
+# 표본 DataFrame의 내부 컬럼 (층 번호, 난수 우선순위, 원래 행 번호)
+_STRATUM = '__stratum'
+_PRIORITY = '__priority'
+_ROW = '__row'
+
+
+class StratifiedSample:
+    """청크를 하나씩 받아 층마다 무작위 표본을 최대 per_stratum행씩 유지하는 저장 표본
+
+    행마다 균일 난수를 붙이고 층마다 난수가 가장 작은 행만 남기므로(bottom-k) 청크를
+    어떻게 나눠 읽어도 층별 단순 무작위 비복원 표본이 된다. 층별 전체 행 수는 모든 행을
+    세므로 정확하고, 모든 층이 표본에 한 행 이상 있어 층 컬럼의 값 목록도 정확하다.
+    """
+
+    def __init__(self, strata=DEFAULT_STRATA, per_stratum=DEFAULT_PER_STRATUM, seed=0):
+        self.strata = tuple(strata)
+        self.per_stratum = per_stratum
+        self.rows = 0
+        self._rng = np.random.default_rng(seed)
+        self._sample = None
+        self._values = {}
+        self._strata = {}
+        self._population = np.zeros(0, dtype=np.int64)
+        self._frame = None
+
+    def _value_ids(self, column, values):
+        """컬럼 값별 번호 (청크가 달라도 같은 값은 같은 번호, 결측값은 -1)"""
+        codes, uniques = pd.factorize(values)
+        known = self._values.setdefault(column, {})
+        ids = np.array([known.setdefault(value, len(known)) for value in uniques], dtype=np.int64)
+        return np.where(codes >= 0, ids[codes] if len(ids) else -1, -1)
+
+    def _stratum_ids(self, chunk):
+        """행별 층 번호 (층 컬럼 값 조합마다 처음 나온 순서로 번호)"""
+        keys = []
+        for column in self.strata:
+            if column in chunk.columns:
+                keys.append(self._value_ids(column, chunk[column]))
+            elif column == 'month' and 'date' in chunk.columns:
+                # 같은 날짜가 반복되므로 서로 다른 값만 변환
+                codes, dates = pd.factorize(chunk['date'])
+                dates = pd.to_datetime(pd.Series(dates, dtype=object), errors='coerce')
+                months = (dates.dt.year * 12 + dates.dt.month - 1).fillna(-1).astype('int64').to_numpy()
+                keys.append(np.where(codes >= 0, months[codes] if len(months) else -1, -1))
+        if not keys:
+            return np.zeros(len(chunk), dtype=np.int64)
+        # 컬럼별 번호(결측값 -1 → 0)를 정수 하나로 합쳐 청크 안의 조합을 구함
+        keys = [key + 1 for key in keys]
+        shape = [int(key.max()) + 1 for key in keys]
+        codes, combinations = pd.factorize(np.ravel_multi_index(keys, shape))
+        combinations = np.column_stack(np.unravel_index(combinations, shape)) - 1
+        ids = np.array(
+            [self._strata.setdefault(tuple(key), len(self._strata)) for key in combinations.tolist()],
+            dtype=np.int64,
+        )
+        return ids[codes]
+
+    def update(self, chunk):
+        """청크 하나를 표본과 층별 행 수에 반영"""
+        chunk = chunk.reset_index(drop=True)
+        ids = self._stratum_ids(chunk)
+        counts = np.bincount(ids, minlength=len(self._strata))
+        self._population = np.concatenate(
+            (self._population, np.zeros(len(counts) - len(self._population), dtype=np.int64))
+        ) + counts
+        candidates = chunk.assign(**{
+            _STRATUM: ids,
+            _PRIORITY: self._rng.random(len(chunk)),
+            _ROW: np.arange(self.rows, self.rows + len(chunk)),
+        })
+        self.rows += len(chunk)
+        if self._sample is not None:
+            candidates = pd.concat([self._sample, candidates], ignore_index=True)
+        candidates = candidates.sort_values(_PRIORITY, kind='stable')
+        self._sample = candidates[candidates.groupby(_STRATUM, sort=False).cumcount() < self.per_stratum]
+        self._frame = None
+        return self
+
+    def _prepare(self):
+        """표본 행(원래 순서)과 행별 층 번호, 층별 전체/표본 행 수"""
+        if self._frame is None:
+            sample = self._sample.sort_values(_ROW) if self._sample is not None else pd.DataFrame(
+                columns=[_STRATUM, _PRIORITY, _ROW]
+            )
+            codes = sample[_STRATUM].to_numpy(dtype=np.int64)
+            population = self._population.astype(float)
+            sizes = np.bincount(codes, minlength=len(population)).astype(float)
+            frame = sample.drop(columns=[_STRATUM, _PRIORITY, _ROW])
+            frame.index = pd.Index(sample[_ROW].to_numpy(), name=None)
+            self._frame = (frame, codes, population, sizes)
+        return self._frame
+
+    def frame(self):
+        """표본 행 (원래 순서, 인덱스는 전체 데이터의 행 번호)"""
+        return self._prepare()[0]
+
+    @property
+    def sample_rows(self):
+        return len(self.frame())
+
+    @property
+    def strata_count(self):
+        return len(self._population)
+
+    @property
+    def weights(self):
+        """표본 행별 가중치 (층 전체 행 수 / 층 표본 행 수)"""
+        _, codes, population, sizes = self._prepare()
+        return population[codes] / sizes[codes]
+
+    def estimate_total(self, values=None, domain=None):
+        """전체 데이터의 합계 추정 (values가 없으면 행 수, domain은 표본 행 불리언 마스크)"""
+        weights = self.weights
+        values = np.ones(len(weights)) if values is None else np.nan_to_num(np.asarray(values, dtype=float))
+        if domain is not None:
+            values = np.where(domain, values, 0.0)
+        return float((weights * values).sum())
+
+    def estimate_mean(self, values, domain=None):
+        """전체 데이터(또는 domain에 해당하는 부분)의 평균 추정과 95% 신뢰구간 반폭
+
+        층별 가중 비율 추정량이며, 분산은 선형화한 값의 층별 표본 분산에 유한 모집단
+        보정을 곱해 더한다. 결측값은 계산에서 빼고, 해당 행이 없으면 (nan, nan)을 반환한다.
+        """
+        _, codes, population, sizes = self._prepare()
+        values = np.asarray(values, dtype=float)
+        included = ~np.isnan(values)
+        if domain is not None:
+            included &= np.asarray(domain, dtype=bool)
+        weights = population[codes] / sizes[codes]
+        total_weight = weights[included].sum()
+        if total_weight == 0:
+            return np.nan, np.nan
+        mean = float((weights[included] * values[included]).sum() / total_weight)
+        linearized = np.where(included, np.nan_to_num(values) - mean, 0.0) / total_weight
+        sums = np.bincount(codes, weights=linearized, minlength=len(sizes))
+        squares = np.bincount(codes, weights=linearized ** 2, minlength=len(sizes))
+        # 표본이 한 행뿐인 층은 분산을 알 수 없으므로 0으로 둠
+        variances = np.divide(
+            squares - sums ** 2 / sizes, sizes - 1, out=np.zeros(len(sizes)), where=sizes > 1
+        )
+        variance = (population ** 2 * (1 - sizes / population) * variances / sizes).sum()
+        return mean, float(Z_95 * np.sqrt(max(variance, 0.0)))
+
+
+def sample_chunks(chunks, per_stratum=DEFAULT_PER_STRATUM, strata=DEFAULT_STRATA, seed=0, on_progress=None):
+    """청크를 읽으며 층화 표본 생성 (최대 메모리는 청크 크기와 표본 크기에 비례)
+
+    on_progress(처리한 행 수)는 청크마다 호출된다.
+    """
+    sample = StratifiedSample(strata=strata, per_stratum=per_stratum, seed=seed)
+    for chunk in chunks:
+        sample.update(chunk)
+        if on_progress is not None:
+            on_progress(sample.rows)
+    return sample
+
+
+def _positive(df):
+    """행별 긍정 여부 (감성 컬럼이 없으면 None)"""
+    if 'sentiment' not in df.columns:
+        return None
+    return (df['sentiment'] == '긍정').to_numpy(dtype=float)
+
+
+def _ratings(df):
+    if 'rating' not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=float)
+
+
+def estimate_summary(sample, df):
+    """전체 데이터의 평균 평점, 긍정 비율(%) 추정과 95% 신뢰구간 반폭
+
+    df는 표본 행(`StratifiedSample.frame`)에 감성 컬럼 등을 붙인 같은 순서의 데이터다.
+    """
+    summary = {'avg_rating': sample.estimate_mean(_ratings(df))}
+    positive = _positive(df)
+    if positive is not None:
+        ratio, margin = sample.estimate_mean(positive)
+        summary['positive_ratio'] = (ratio * 100, margin * 100)
+    return summary
+
+
+def estimate_group_table(sample, df, column):
+    """그룹별 평균 평점, 피드백 수, 긍정 비율 추정 (일반 모드 표에 95% 신뢰구간 반폭 컬럼 추가)
+
+    그룹 컬럼이 층 컬럼이면 그룹의 층별 전체 행 수는 정확하고, 피드백 수(평점이 있는 행 수)는
+    층별 평점 결측 비율로 추정한다.
+    """
+    ratings = _ratings(df)
+    positive = _positive(df)
+    records = {}
+    for value in pd.unique(df[column].dropna()):
+        domain = (df[column] == value).to_numpy()
+        mean, margin = sample.estimate_mean(ratings, domain)
+        record = {
+            '평균 평점': mean,
+            '평균 평점 ±': margin,
+            '피드백 수': int(round(sample.estimate_total(~np.isnan(ratings), domain))),
+        }
+        if positive is not None:
+            ratio, ratio_margin = sample.estimate_mean(positive, domain)
+            record['긍정 비율(%)'] = ratio * 100
+            record['긍정 비율 ±(%)'] = ratio_margin * 100
+        records[value] = record
+    table = pd.DataFrame.from_dict(records, orient='index').sort_index().round(2)
+    table.index.name = column
+    return table
+
+
+def estimate_monthly_positive_ratio(sample, df):
+    """월별 긍정 비율 추정과 95% 신뢰구간 반폭 (월 컬럼이나 감성 컬럼이 없으면 None)"""
+    positive = _positive(df)
+    if positive is None or 'month' not in df.columns:
+        return None
+    records = []
+    for month in sorted(df['month'].dropna().unique()):
+        ratio, margin = sample.estimate_mean(positive, (df['month'] == month).to_numpy())
+        records.append({'month': str(month), 'sentiment': ratio * 100, 'margin': margin * 100})
+    return pd.DataFrame(records, columns=['month', 'sentiment', 'margin'])
+
+
+def estimate_sentiment_counts(sample, df):
+    """감성별 전체 피드백 수 추정 (많은 순)"""
+    totals = pd.Series(sample.weights, index=df.index).groupby(df['sentiment'], observed=True).sum()
+    return totals[totals > 0].round().astype('int64').sort_values(ascending=False)
@@ -0,0 +1,242 @@
+"""피드백 텍스트 역색인 전문 검색 (AND/OR, 접두어, 구문 접두어 검색과 단어 빈도 순위)"""
+import re
+
+import numpy as np
+
+from cfa.text import preprocess_text
+
+# 검색어에서 OR로 취급하는 단어 (그 밖의 띄어 쓴 단어는 AND)
+OR_WORDS = ('OR', '|')
+
+_query_parts = re.compile(r'"([^"]*)"?|(\|)|([^\s"|]+)')
+_special_chars = re.compile(r'[^\w\s]')
+
+
+def encode_postings(rows, starts):
+    """행 번호 목록들을 이어 붙인 배열을 목록별 간격(delta) varint 바이트로 압축
+
+    rows는 목록마다 오름차순인 행 번호, starts는 각 목록의 시작 위치(목록 수 + 1개)이며
+    (바이트 배열, 목록별 바이트 시작 위치)를 반환한다.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    gaps = np.diff(rows, prepend=0)
+    # 목록의 첫 행은 간격 대신 행 번호 그대로 저장
+    firsts = starts[:-1][starts[:-1] < starts[1:]]
+    gaps[firsts] = rows[firsts]
+    gaps = gaps.astype(np.uint64)
+
+    # 값마다 7비트씩 나눠 담는 바이트 수
+    n_bytes = np.ones(len(gaps), dtype=np.int64)
+    shifted = gaps >> np.uint64(7)
+    while shifted.any():
+        n_bytes += shifted > 0
+        shifted >>= np.uint64(7)
+    ends = np.cumsum(n_bytes)
+    owner = np.repeat(np.arange(len(gaps)), n_bytes)
+    position = np.arange(ends[-1] if len(ends) else 0) - (ends - n_bytes)[owner]
+    data = (gaps[owner] >> (position * 7).astype(np.uint64)) & np.uint64(0x7F)
+    # 마지막 바이트가 아니면 최상위 비트를 켬
+    data |= (position < n_bytes[owner] - 1).astype(np.uint64) << np.uint64(7)
+    byte_starts = np.concatenate(([0], ends))[starts]
+    return data.astype(np.uint8), byte_starts
+
+
+def decode_postings(data):
+    """`encode_postings`로 압축한 목록 하나를 행 번호 배열로 복원"""
+    if len(data) == 0:
+        return np.empty(0, dtype=np.int64)
+    last = data < 0x80
+    group_starts = np.flatnonzero(np.concatenate(([True], last[:-1])))
+    owner = np.cumsum(np.concatenate(([0], last[:-1])))
+    shift = (np.arange(len(data)) - group_starts[owner]) * 7
+    gaps = np.add.reduceat((data & 0x7F).astype(np.int64) << shift, group_starts)
+    return np.cumsum(gaps)
+
+
+def _prefix_term(word):
+    """접두어 검색어 정리 (색인과 같이 특수문자를 지우고 소문자로, 한 글자도 허용)"""
+    return _special_chars.sub('', word).lower()
+
+
+def _phrase_clause(text):
+    """따옴표 구문 조건 (마지막 단어는 접두어, 나머지는 색인과 같게 전처리)"""
+    words = text.split()
+    if not words:
+        return None
+    terms = tuple(preprocess_text(' '.join(words[:-1])).split())
+    prefix = _prefix_term(words[-1])
+    if not prefix:
+        if not terms:
+            return None
+        terms, prefix = terms[:-1], terms[-1]
+    if not terms:
+        return ('prefix', prefix)
+    return ('phrase', terms, prefix)
+
+
+def parse_query(query):
+    """검색어를 OR로 묶인 조건 묶음 목록으로 변환 [[조건, ...], ...]
+
+    - 띄어 쓴 단어는 모두 포함(AND), OR 또는 | 로 나눈 묶음은 하나라도 포함(OR)
+    - 단어 끝의 *는 접두어 검색 (로그* → 로그인, 로그아웃 ...)
+    - "따옴표" 구문은 단어가 순서대로 이어 나오는 행이며 마지막 단어는 접두어로 찾음
+    단어는 색인과 같게 전처리하므로 불용어와 한 글자 단어는 무시된다.
+    """
+    groups = [[]]
+    for match in _query_parts.finditer(query):
+        phrase, bar, word = match.groups()
+        if bar is not None or word in OR_WORDS:
+            groups.append([])
+            continue
+        if phrase is not None:
+            clause = _phrase_clause(phrase)
+        elif word.endswith('*'):
+            prefix = _prefix_term(word.rstrip('*'))
+            clause = ('prefix', prefix) if prefix else None
+        else:
+            term = preprocess_text(word)
+            clause = ('term', term) if term else None
+        if clause is not None:
+            groups[-1].append(clause)
+    return [group for group in groups if group]
+
+
+def _union(results, n_rows):
+    """(행, 점수) 결과들의 합집합 (같은 행의 점수는 더함)"""
+    results = [result for result in results if len(result[0])]
+    if not results:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if len(results) == 1:
+        return results[0]
+    rows = np.concatenate([rows for rows, _ in results])
+    scores = np.concatenate([scores for _, scores in results])
+    if len(rows) > n_rows // 64:
+        # 결과가 크면 정렬 대신 행 번호별로 점수를 더함 (맞는 행의 점수는 1 이상)
+        totals = np.bincount(rows, weights=scores, minlength=n_rows)
+        rows = np.flatnonzero(totals)
+        return rows, totals[rows].astype(np.int64)
+    rows, inverse = np.unique(rows, return_inverse=True)
+    return rows, np.bincount(inverse, weights=scores).astype(np.int64)
+
+
+def _intersect(left, right):
+    """(행, 점수) 결과 두 개의 교집합 (점수는 더함, 작은 쪽 행을 큰 쪽에서 이진 탐색)"""
+    if len(left[0]) > len(right[0]):
+        left, right = right, left
+    positions = np.searchsorted(right[0], left[0])
+    found = positions < len(right[0])
+    found[found] = right[0][positions[found]] == left[0][found]
+    return left[0][found], left[1][found] + right[1][positions[found]]
+
+
+class SearchIndex:
+    """단어별 행 번호 목록(역색인)을 압축해 두고 검색어에 맞는 행을 단어 빈도 순으로 찾음
+
+    `cfa.term_matrix.TermMatrix`(`preprocess_text` 토큰으로 만든 문서-단어 행렬)의 열을
+    그대로 목록으로 사용하므로 토큰화를 다시 하지 않는다. 행 번호는 간격 varint로,
+    행 안의 단어 빈도는 uint16으로 저장한다.
+    """
+
+    def __init__(self, term_matrix):
+        columns = term_matrix.matrix.tocsc()
+        columns.sort_indices()
+        self.n_rows = term_matrix.n_rows
+        self.vocabulary = term_matrix.vocabulary
+        self.token_strings = term_matrix.token_strings
+        self._term_ids = {term: i for i, term in enumerate(self.vocabulary)}
+        self._starts = columns.indptr.astype(np.int64)
+        self._postings, self._byte_starts = encode_postings(columns.indices, self._starts)
+        self._frequencies = np.minimum(columns.data, np.iinfo(np.uint16).max).astype(np.uint16)
+
+    @classmethod
+    def from_tokens(cls, token_strings):
+        """`cfa.text.tokenize` 결과로 색인 생성"""
+        from cfa.term_matrix import TermMatrix
+
+        return cls(TermMatrix.from_tokens(token_strings))
+
+    @property
+    def nbytes(self):
+        """색인 크기 (바이트, 단어 목록 제외)"""
+        return self._postings.nbytes + self._byte_starts.nbytes + self._starts.nbytes + self._frequencies.nbytes
+
+    def document_frequency(self, term_id):
+        return int(self._starts[term_id + 1] - self._starts[term_id])
+
+    def postings(self, term_id):
+        """단어 하나의 (행 번호, 행 안의 빈도)"""
+        rows = decode_postings(self._postings[self._byte_starts[term_id]:self._byte_starts[term_id + 1]])
+        frequencies = self._frequencies[self._starts[term_id]:self._starts[term_id + 1]].astype(np.int64)
+        return rows, frequencies
+
+    def prefix_ids(self, prefix):
+        """접두어로 시작하는 단어 번호 (단어 목록이 정렬되어 있으므로 이진 탐색)"""
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        low, high = np.searchsorted(self.vocabulary, [prefix, upper])
+        return range(int(low), int(high))
+
+    def _term_ids_for(self, clause):
+        kind = clause[0]
+        if kind == 'term':
+            term_id = self._term_ids.get(clause[1])
+            return [] if term_id is None else [term_id]
+        return list(self.prefix_ids(clause[1]))
+
+    def _match_terms(self, term_ids):
+        return _union([self.postings(term_id) for term_id in term_ids], self.n_rows)
+
+    def _match_all(self, clauses):
+        """조건을 모두 만족하는 행 (예상 행 수가 작은 조건부터 교집합을 구하고 비면 멈춤)"""
+        result = None
+        for clause in sorted(clauses, key=self._estimate):
+            matched = self._match_clause(clause)
+            result = matched if result is None else _intersect(result, matched)
+            if not len(result[0]):
+                break
+        return result
+
+    def _match_phrase(self, terms, prefix):
+        """구문 조건: 단어가 모두 있는 행을 찾은 뒤 토큰 문자열에서 순서대로 이어지는지 확인"""
+        candidates = self._match_all([('term', term) for term in terms] + [('prefix', prefix)])
+        if not len(candidates[0]):
+            return candidates
+        # 앞을 내다보는 패턴으로 겹치는 구문도 모두 셈
+        pattern = re.compile(r'(?<![^ ])(?=' + re.escape(' '.join(terms) + ' ' + prefix) + ')')
+        # 같은 토큰 문자열(반복되는 피드백)은 한 번만 확인
+        seen = {}
+
+        def count(tokens):
+            if tokens not in seen:
+                seen[tokens] = len(pattern.findall(tokens))
+            return seen[tokens]
+
+        counts = np.fromiter(
+            (count(self.token_strings[row]) for row in candidates[0]), dtype=np.int64, count=len(candidates[0])
+        )
+        found = counts > 0
+        # 구문이 한 번 나올 때마다 구문 단어 수만큼 점수
+        return candidates[0][found], counts[found] * (len(terms) + 1)
+
+    def _estimate(self, clause):
+        """조건에 맞는 행 수 상한"""
+        if clause[0] == 'phrase':
+            return min(self._estimate(('term', term)) for term in clause[1])
+        return sum(self.document_frequency(term_id) for term_id in self._term_ids_for(clause))
+
+    def _match_clause(self, clause):
+        if clause[0] == 'phrase':
+            return self._match_phrase(clause[1], clause[2])
+        return self._match_terms(self._term_ids_for(clause))
+
+    def match(self, query):
+        """검색어에 맞는 (행 번호 오름차순, 단어 빈도 점수)"""
+        groups = parse_query(query) if isinstance(query, str) else query
+        return _union([self._match_all(group) for group in groups], self.n_rows)
+
+    def search(self, query, rows=None):
+        """검색어에 맞는 행 위치를 점수가 높은 순서로 (같은 점수는 원래 순서, rows가 있으면 그 안에서만)"""
+        matched, scores = self.match(query)
+        if rows is not None:
+            keep = np.isin(matched, rows)
+            matched, scores = matched[keep], scores[keep]
+        return matched[np.lexsort((matched, -scores))]
@@ -0,0 +1,175 @@
+"""감성 분석 (키워드 사전, 선택적으로 문자 n-gram 선형 모델)"""
+import os
+
+import numpy as np
+import pandas as pd
+
+# 컬럼 단위 감성 분석 방식 ('lexicon': 키워드 사전, 'model': 문자 n-gram 선형 모델), 환경 변수로 변경 가능
+SENTIMENT_BACKENDS = ('lexicon', 'model')
+DEFAULT_BACKEND = os.environ.get('CFA_SENTIMENT_BACKEND', 'lexicon')
+
+# 감성 사전 (모듈 로드 시 한 번만 생성)
+POSITIVE_WORDS = ('좋', '편', '빠르', '유용', '친절', '깔끔', '직관', '간단')
+NEGATIVE_WORDS = ('느리', '어렵', '오류', '충돌', '문제', '불편', '아프', '작')
+
+SENTIMENT_LABELS = np.array(['긍정', '부정', '중립'], dtype=object)
+
+
+def analyze_sentiment(text):
+    """감성 분석 (단일 텍스트)"""
+    if pd.isna(text) or text == "":
+        return "중립"
+
+    # 간단한 키워드 기반 감성 분석
+    # 실제 프로덕션에서는 한국어 전용 감성 분석 모델 사용 권장
+    text_lower = str(text).lower()
+
+    positive_count = sum(1 for word in POSITIVE_WORDS if word in text_lower)
+    negative_count = sum(1 for word in NEGATIVE_WORDS if word in text_lower)
+
+    if positive_count > negative_count:
+        return "긍정"
+    elif negative_count > positive_count:
+        return "부정"
+    else:
+        return "중립"
+
+
+class Lexicon:
+    """컬럼 단위 검색을 위해 미리 컴파일한 감성 사전"""
+
+    # 행 사이에 넣는 구분 문자 (사전 단어에 포함되지 않아야 함)
+    separator = '\x00'
+
+    def __init__(self, positive_words, negative_words):
+        self.groups = (tuple(positive_words), tuple(negative_words))
+        words = self.groups[0] + self.groups[1]
+        if any(self.separator in word for word in words):
+            raise ValueError("감성 사전 단어에 구분 문자를 사용할 수 없습니다.")
+        # 한글처럼 대소문자가 없는 사전이면 소문자 변환이 포함 여부에 영향을 주지 않음
+        self.needs_lower = any(ch.lower() != ch or ch.upper() != ch for word in words for ch in word)
+        # UTF-16 코드 단위로 변환한 단어와, 첫 코드 단위로 후보 위치를 찾는 조회 테이블
+        self.codes = {
+            word: np.frombuffer(word.encode('utf-16-le'), dtype=np.uint16) for word in words
+        }
+        self.first_units = np.zeros(0x10000, dtype=bool)
+        for code in self.codes.values():
+            self.first_units[code[0]] = True
+
+    def encode(self, values):
+        """텍스트 목록을 하나의 UTF-16 코드 단위 배열과 행 시작 위치로 변환"""
+        if self.needs_lower:
+            values = [value.lower() for value in values]
+        # 짝이 없는 서로게이트(깨진 Excel/CSV 텍스트)는 코드 단위 하나인 '?'로 바꿈 (사전 단어와 불일치)
+        units = np.frombuffer(
+            self.separator.join(values).encode('utf-16-le', errors='replace'), dtype=np.uint16
+        )
+        # 구분 문자 위치로 행 경계를 구하고, 텍스트 안에 구분 문자가 있으면 행별로 다시 계산
+        boundaries = np.flatnonzero(units == ord(self.separator))
+        if len(boundaries) != len(values) - 1:
+            lengths = np.array([len(value.encode('utf-16-le', errors='replace')) // 2 for value in values])
+            boundaries = np.cumsum(lengths[:-1] + 1) - 1
+        starts = np.concatenate(([0], boundaries + 1))
+        return units, starts
+
+    def count(self, units, starts):
+        """행별로 등장한 긍정/부정 단어 수 (같은 단어는 한 번만 셈)"""
+        positions = np.flatnonzero(self.first_units[units])
+        heads = units[positions]
+        rows = np.searchsorted(starts, positions, side='right') - 1
+        counts = []
+        for words in self.groups:
+            group_count = np.zeros(len(starts), dtype=np.int8)
+            for word in words:
+                code = self.codes[word]
+                matched = heads == code[0]
+                word_positions, word_rows = positions[matched], rows[matched]
+                # 나머지 글자를 순서대로 비교하며 후보를 좁힘 (행 경계를 넘으면 구분 문자에서 불일치)
+                for offset in range(1, len(code)):
+                    inside = word_positions + offset < len(units)
+                    word_positions, word_rows = word_positions[inside], word_rows[inside]
+                    matched = units[word_positions + offset] == code[offset]
+                    word_positions, word_rows = word_positions[matched], word_rows[matched]
+                found = np.zeros(len(starts), dtype=bool)
+                found[word_rows] = True
+                group_count += found
+            counts.append(group_count)
+        return counts
+
+
+DEFAULT_LEXICON = Lexicon(POSITIVE_WORDS, NEGATIVE_WORDS)
+
+
+def _should_deduplicate(texts, sample_size=10_000, max_unique_ratio=0.5):
+    """앞부분 표본의 중복 비율로 고유 텍스트만 분석할지 결정"""
+    sample = texts.iloc[:sample_size]
+    return sample.nunique(dropna=False) <= len(sample) * max_unique_ratio
+
+
+def _sentiment_column(texts, classify, categorical):
+    """텍스트 값 목록 → 감성 코드 함수(classify)를 컬럼에 적용 (결측값·빈 텍스트는 중립)
+
+    복사·템플릿 피드백처럼 중복이 많은 컬럼은 고유 텍스트만 분석한다.
+    """
+    texts = pd.Series(texts)
+    if texts.empty:
+        dtype = pd.CategoricalDtype(SENTIMENT_LABELS) if categorical else object
+        return pd.Series([], index=texts.index, dtype=dtype, name=texts.name)
+
+    if _should_deduplicate(texts):
+        # 결측값은 -1 코드가 되어 마지막 '중립' 라벨로 매핑됨
+        row_codes, values = pd.factorize(texts)
+    else:
+        row_codes, values = None, texts.tolist()
+
+    values = [
+        value if isinstance(value, str) else ("" if pd.isna(value) else str(value))
+        for value in values
+    ]
+    codes = classify(values) if values else np.zeros(0, dtype=np.int64)
+    if row_codes is not None:
+        codes = np.append(codes, 2)[row_codes]
+    if categorical:
+        values = pd.Categorical.from_codes(codes.astype(np.int8), SENTIMENT_LABELS)
+        return pd.Series(values, index=texts.index, name=texts.name)
+    return pd.Series(SENTIMENT_LABELS[codes], index=texts.index, name=texts.name)
+
+
+def analyze_sentiment_batch(texts, lexicon=DEFAULT_LEXICON, categorical=False):
+    """감성 분석 (컬럼 단위 일괄 처리)
+
+    행마다 `analyze_sentiment`를 호출한 것과 같은 라벨을 반환한다.
+    categorical=True이면 라벨 대신 작은 정수 코드의 범주형으로 반환한다.
+    '편'과 '불편'처럼 사전 단어가 서로 겹치므로 교대 정규식 대신
+    전체 컬럼을 하나의 UTF-16 배열로 만들어 단어별로 한 번씩 검색한다.
+    """
+    def classify(values):
+        positive_count, negative_count = lexicon.count(*lexicon.encode(values))
+        return np.where(
+            positive_count > negative_count, 0,
+            np.where(negative_count > positive_count, 1, 2)
+        )
+
+    return _sentiment_column(texts, classify, categorical)
+
+
+def analyze_sentiment_model(texts, model=None, categorical=False):
+    """문자 n-gram 선형 모델 감성 분석 (컬럼 단위, model이 없으면 배포한 모델)
+
+    반환 형식은 `analyze_sentiment_batch`와 같다.
+    """
+    if model is None:
+        # 모델 파일은 이 방식을 처음 쓸 때만 불러옴
+        from cfa.sentiment_model import default_model
+        model = default_model()
+    return _sentiment_column(texts, model.predict_codes, categorical)
+
+
+def classify_sentiment(texts, backend=None, categorical=False):
+    """설정한 방식(backend, 기본은 CFA_SENTIMENT_BACKEND)으로 컬럼 단위 감성 분석"""
+    backend = DEFAULT_BACKEND if backend is None else backend
+    if backend == 'lexicon':
+        return analyze_sentiment_batch(texts, categorical=categorical)
+    if backend == 'model':
+        return analyze_sentiment_model(texts, categorical=categorical)
+    raise ValueError(f"지원되지 않는 감성 분석 방식입니다: {backend} ({', '.join(SENTIMENT_BACKENDS)} 중 선택)")
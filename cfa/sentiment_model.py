@@ -0,0 +1,188 @@
+"""문자 n-gram 해시 특징 선형 감성 분류 모델 (평점을 약한 라벨로 학습)
+
+키워드 사전은 '작'이 '작동'에도 걸리는 것처럼 부분 문자열 포함 여부만 보므로, 텍스트의
+문자 1~3-gram을 고정 크기 해시 공간(2^hash_bits 칸)에 모아 선형 모델로 분류한다.
+특징은 numpy로 배치마다 한꺼번에 계산하고 가중치 조회와 행별 합으로 점수를 구하므로
+추론에는 scikit-learn이 필요 없다. 학습(`train_model`)에만 scikit-learn을 쓴다.
+"""
+import os
+
+import numpy as np
+
+from cfa.sentiment import SENTIMENT_LABELS
+
+# 배포하는 모델 파일, 환경 변수로 다른 파일 사용 가능
+DEFAULT_MODEL_PATH = os.environ.get(
+    'CFA_SENTIMENT_MODEL', os.path.join(os.path.dirname(__file__), 'models', 'sentiment_ngram.npz')
+)
+
+# 문자 n-gram 길이와 해시 공간 크기 (2^18칸, 칸 수가 고정이라 어휘가 늘어도 메모리 일정)
+DEFAULT_NGRAM_SIZES = (1, 2, 3)
+DEFAULT_HASH_BITS = 18
+
+# 한 번에 특징을 계산하는 텍스트 수 (n-gram 배열 메모리 제한)
+DEFAULT_BATCH_SIZE = 50_000
+
+# 평점 약한 라벨 기준 (이 값 이상 긍정, 이하 부정, 그 사이 중립)
+POSITIVE_RATING = 4
+NEGATIVE_RATING = 2
+
+_NEUTRAL = int(np.flatnonzero(SENTIMENT_LABELS == '중립')[0])
+
+
+def _bucket(keys, salt, hash_bits):
+    """정수 키의 해시 칸 (곱셈 해시의 상위 비트, salt로 n-gram 길이를 구분)"""
+    keys = keys + np.uint64(salt)
+    keys = (keys ^ (keys >> np.uint64(31))) * np.uint64(0x9E3779B97F4A7C15)
+    return (keys >> np.uint64(64 - hash_bits)).astype(np.int64)
+
+
+def ngram_buckets(texts, sizes=DEFAULT_NGRAM_SIZES, hash_bits=DEFAULT_HASH_BITS):
+    """텍스트 목록의 문자 n-gram (행 번호, 해시 칸) 배열과 행별 n-gram 수
+
+    소문자로 바꾼 텍스트를 한 배열로 이어 붙여(사이에 빈 문자) 길이별로 한꺼번에 해시한다.
+    유니코드 문자는 21비트 안에 들어가므로 3글자까지는 문자 코드를 64비트 정수 하나로
+    그대로 합친 뒤 해시 칸을 구한다. 텍스트 안에 완전히 들어가는 n-gram만 센다.
+    """
+    if max(sizes) > 3:
+        raise ValueError("문자 n-gram 길이는 3 이하여야 합니다.")
+    texts = [text.lower() for text in texts]
+    # 짝이 없는 서로게이트(깨진 Excel/CSV 텍스트)는 한 글자 '?'로 바꿔 글자 위치를 유지
+    codes = np.frombuffer(
+        '\0'.join(texts).encode('utf-32-le', errors='replace'), dtype=np.uint32
+    ).astype(np.uint64)
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    row_of = np.repeat(np.arange(len(texts)), lengths + 1)[:len(codes)]
+    # 위치별로 같은 행 안에서 이어지는 글자 수 (n-gram이 행 경계를 넘지 않게 함)
+    remaining = (np.cumsum(lengths + 1) - 1)[row_of] - np.arange(len(codes))
+
+    rows, buckets = [], []
+    keys = np.zeros(len(codes), dtype=np.uint64)
+    for size in range(1, max(sizes) + 1):
+        keys = (keys[:len(codes) - size + 1] << np.uint64(21)) | codes[size - 1:]
+        if size not in sizes:
+            continue
+        starts = np.flatnonzero(remaining[:len(keys)] >= size)
+        rows.append(row_of[starts])
+        buckets.append(_bucket(keys[starts], size << 61, hash_bits))
+    rows = np.concatenate(rows)
+    return rows, np.concatenate(buckets), np.bincount(rows, minlength=len(texts))
+
+
+class NgramSentimentModel:
+    """문자 n-gram 해시 특징의 선형 감성 분류 모델
+
+    특징은 행별 n-gram 칸 빈도를 n-gram 수의 제곱근으로 나눈 값이고, 라벨 점수는
+    특징과 라벨별 가중치의 곱에 절편을 더한 값이다. 가중치 열 순서는 SENTIMENT_LABELS와 같다.
+    """
+
+    def __init__(self, weights, intercept, sizes=DEFAULT_NGRAM_SIZES, hash_bits=DEFAULT_HASH_BITS):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.sizes = tuple(int(size) for size in sizes)
+        self.hash_bits = int(hash_bits)
+        if self.weights.shape != (2 ** self.hash_bits, len(SENTIMENT_LABELS)):
+            raise ValueError("모델 가중치 크기가 해시 공간·감성 라벨 수와 맞지 않습니다.")
+        # 라벨별 가중치를 연속 배열로 두어 칸 조회를 빠르게 함
+        self._label_weights = [np.ascontiguousarray(column) for column in self.weights.T]
+
+    def scores(self, texts):
+        """텍스트 목록(문자열)의 라벨별 점수 (행, 라벨) 배열"""
+        rows, buckets, counts = ngram_buckets(texts, self.sizes, self.hash_bits)
+        scale = 1 / np.sqrt(np.maximum(counts, 1))
+        scores = np.empty((len(texts), len(SENTIMENT_LABELS)))
+        for label, weights in enumerate(self._label_weights):
+            scores[:, label] = np.bincount(rows, weights=weights[buckets], minlength=len(texts))
+        return scores * scale[:, None] + self.intercept
+
+    def predict_codes(self, texts, batch_size=DEFAULT_BATCH_SIZE):
+        """텍스트 목록(문자열)의 SENTIMENT_LABELS 코드 (빈 텍스트는 중립, 배치 단위로 계산)"""
+        codes = np.full(len(texts), _NEUTRAL, dtype=np.int64)
+        for start in range(0, len(texts), batch_size):
+            batch = texts[start:start + batch_size]
+            codes[start:start + len(batch)] = self.scores(batch).argmax(axis=1)
+        empty = np.fromiter((not text for text in texts), dtype=bool, count=len(texts))
+        codes[empty] = _NEUTRAL
+        return codes
+
+    def save(self, path):
+        """압축 npz 파일로 저장 (학습하지 않은 칸은 0이라 작게 압축됨)"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            np.savez_compressed(
+                f, weights=self.weights.astype(np.float16), intercept=self.intercept,
+                sizes=np.array(self.sizes), hash_bits=np.array(self.hash_bits),
+            )
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        with np.load(path) as data:
+            return cls(data['weights'], data['intercept'], data['sizes'], data['hash_bits'])
+
+
+_default_model = None
+
+
+def default_model():
+    """배포한 모델 (프로세스마다 처음 사용할 때 한 번 불러옴)"""
+    global _default_model
+    if _default_model is None:
+        _default_model = NgramSentimentModel.load()
+    return _default_model
+
+
+def rating_labels(ratings):
+    """평점을 SENTIMENT_LABELS 코드 약한 라벨로 (결측 평점은 -1)"""
+    ratings = np.asarray(ratings, dtype=float)
+    labels = np.full(len(ratings), _NEUTRAL, dtype=np.int64)
+    labels[ratings >= POSITIVE_RATING] = int(np.flatnonzero(SENTIMENT_LABELS == '긍정')[0])
+    labels[ratings <= NEGATIVE_RATING] = int(np.flatnonzero(SENTIMENT_LABELS == '부정')[0])
+    labels[np.isnan(ratings)] = -1
+    return labels
+
+
+def feature_matrix(texts, sizes=DEFAULT_NGRAM_SIZES, hash_bits=DEFAULT_HASH_BITS, batch_size=DEFAULT_BATCH_SIZE):
+    """텍스트 목록의 희소 특징 행렬 (`NgramSentimentModel.scores`와 같은 특징, 학습용)"""
+    from scipy import sparse
+
+    blocks = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        rows, buckets, counts = ngram_buckets(batch, sizes, hash_bits)
+        values = 1 / np.sqrt(np.maximum(counts, 1))[rows]
+        # 같은 칸의 값은 더해짐
+        blocks.append(sparse.csr_matrix((values, (rows, buckets)), shape=(len(batch), 2 ** hash_bits)))
+    if not blocks:
+        return sparse.csr_matrix((0, 2 ** hash_bits))
+    return sparse.vstack(blocks, format='csr')
+
+
+def train_model(texts, ratings, sizes=DEFAULT_NGRAM_SIZES, hash_bits=DEFAULT_HASH_BITS, alpha=1e-5, seed=0):
+    """평점 약한 라벨로 학습한 모델 (텍스트나 평점이 없는 행은 제외)
+
+    로지스틱 손실 SGD 선형 분류기를 라벨 비율에 맞춘 가중치로 학습한다. 학습 데이터에
+    없는 라벨은 예측하지 않는다.
+    """
+    from sklearn.linear_model import SGDClassifier
+
+    texts = [text if isinstance(text, str) else '' for text in texts]
+    labels = rating_labels(ratings)
+    keep = np.flatnonzero((labels >= 0) & np.array([bool(text) for text in texts], dtype=bool))
+    if len(keep) == 0:
+        raise ValueError("학습에 쓸 텍스트와 평점이 있는 행이 없습니다.")
+    features = feature_matrix([texts[i] for i in keep], sizes, hash_bits)
+    classifier = SGDClassifier(
+        loss='log_loss', alpha=alpha, class_weight='balanced', max_iter=100, tol=1e-3, random_state=seed
+    ).fit(features, labels[keep])
+
+    weights = np.zeros((2 ** hash_bits, len(SENTIMENT_LABELS)))
+    intercept = np.full(len(SENTIMENT_LABELS), -np.inf)
+    if len(classifier.classes_) == 2:
+        # 이진 분류는 두 번째 라벨 점수 하나만 학습되므로 두 라벨에 반씩 나눔
+        first, second = classifier.classes_
+        weights[:, second], weights[:, first] = classifier.coef_[0] / 2, -classifier.coef_[0] / 2
+        intercept[second], intercept[first] = classifier.intercept_[0] / 2, -classifier.intercept_[0] / 2
+    else:
+        weights[:, classifier.classes_] = classifier.coef_.T
+        intercept[classifier.classes_] = classifier.intercept_
+    return NgramSentimentModel(weights, intercept, sizes, hash_bits)
@@ -0,0 +1,281 @@
+"""피드백 누적 저장소 (SQLite, 행 내용 해시로 중복 제거, 행 단위 분석 결과 저장)"""
+import os
+import sqlite3
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from cfa.cube import RollupCube
+from cfa.dtypes import parse_dates
+from cfa.parallel import analyze_texts
+from cfa.streaming import StreamingAggregates
+
+DEFAULT_PATH = os.environ.get('CFA_STORE_PATH', os.path.join('.cfa_cache', 'feedback.sqlite'))
+
+# 저장하는 원본 컬럼 (중복 판단 기준)
+COLUMNS = ('date', 'product', 'category', 'feedback_text', 'rating')
+
+# 한 번에 분석·저장하는 행 수
+BATCH_SIZE = 50_000
+
+# 집계에 불러오는 상위 키워드 수
+MAX_KEYWORDS = 1000
+
+# 다른 세션이 파일을 추가하는 동안 쓰기 잠금을 기다리는 최대 시간 (초), 환경 변수로 변경 가능
+LOCK_TIMEOUT = float(os.environ.get('CFA_STORE_LOCK_TIMEOUT', 600))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    row_hash INTEGER PRIMARY KEY,
+    date TEXT,
+    product TEXT,
+    category TEXT,
+    feedback_text TEXT,
+    rating REAL,
+    month TEXT,
+    sentiment TEXT,
+    tokens TEXT,
+    length INTEGER,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS keywords (
+    token TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS imports (
+    source TEXT PRIMARY KEY,
+    name TEXT,
+    rows INTEGER,
+    added INTEGER,
+    imported_at REAL
+);
+"""
+
+
+def normalize_rows(df):
+    """저장 형식으로 변환한 원본 컬럼 (없는 컬럼은 결측값, 날짜는 ISO 문자열, 월은 YYYY-MM)"""
+    columns = {}
+    for column in COLUMNS:
+        if column in df.columns:
+            values = df[column]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+        else:
+            values = pd.Series(None, index=df.index, dtype=object)
+        columns[column] = values
+
+    dates = columns['date']
+    try:
+        parsed = parse_dates(dates)
+    except (ValueError, TypeError):
+        parsed = pd.to_datetime(dates, errors='coerce')
+    date_format = '%Y-%m-%d' if (parsed.dropna() == parsed.dropna().dt.normalize()).all() else '%Y-%m-%d %H:%M:%S'
+    # 날짜로 읽지 못한 값은 원래 문자열 그대로 저장
+    columns['date'] = _format_dates(parsed, date_format).where(parsed.notna(), dates.astype(object))
+    columns['rating'] = pd.to_numeric(columns['rating'], errors='coerce').astype(float)
+    for column in ('date', 'product', 'category', 'feedback_text'):
+        # 숫자로 읽힌 값도 문자열로 맞춰 파일 형식이 달라도 같은 해시가 나오게 함
+        values = columns[column].astype(object)
+        columns[column] = values.astype(str).where(values.notna(), None)
+    frame = pd.DataFrame(columns, index=df.index)
+    frame['month'] = _format_dates(parsed, '%Y-%m')
+    return frame
+
+
+def _format_dates(parsed, date_format):
+    """날짜를 문자열로 (같은 날짜가 많으므로 고유 값만 변환, NaT는 None)"""
+    codes, uniques = pd.factorize(parsed)
+    labels = np.append(uniques.strftime(date_format).to_numpy(dtype=object), None)
+    return pd.Series(labels[codes], index=parsed.index, dtype=object)
+
+
+def row_hashes(rows):
+    """행 내용 해시 (64비트, SQLite 정수 키로 쓰도록 부호 있는 정수)"""
+    values = pd.util.hash_pandas_object(rows[list(COLUMNS)], index=False).to_numpy()
+    return values.view(np.int64)
+
+
+def _contains(sorted_values, values):
+    """values의 각 값이 정렬된 배열 sorted_values에 있는지 여부"""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[positions] == values
+
+
+def _records(frame, columns):
+    """executemany용 튜플 (결측값은 NULL)"""
+    values = frame[columns].astype(object)
+    return values.where(values.notna(), None).itertuples(index=False, name=None)
+
+
+class FeedbackStore:
+    """피드백 행을 누적하는 SQLite 저장소
+
+    행은 원본 컬럼 내용 해시를 키로 저장하므로 같은 행은 한 번만 들어간다.
+    새 행만 감성/토큰/길이를 계산해 함께 저장하고, 키워드 빈도는 별도 표에
+    누적한다. 대시보드 통계는 행을 불러오지 않고 SQL 집계로 구한다.
+    여러 세션이 동시에 파일을 추가하면 쓰기 잠금을 먼저 잡은 쪽부터 차례로 처리한다.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def __len__(self):
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+        finally:
+            connection.close()
+
+    def revision(self):
+        """저장소 내용이 바뀌면 달라지는 값 (집계 캐시 키용)"""
+        connection = self._connect()
+        try:
+            return connection.execute("SELECT COUNT(*), TOTAL(added), MAX(imported_at) FROM imports").fetchone()
+        finally:
+            connection.close()
+
+    def imports(self):
+        """추가한 파일 목록 (최근 순)"""
+        connection = self._connect()
+        try:
+            frame = pd.read_sql_query(
+                "SELECT name, rows, added, imported_at FROM imports ORDER BY imported_at DESC", connection
+            )
+        finally:
+            connection.close()
+        frame['imported_at'] = pd.to_datetime(frame['imported_at'], unit='s').dt.strftime('%Y-%m-%d %H:%M')
+        return frame.rename(columns={
+            'name': '파일', 'rows': '행 수', 'added': '새 행', 'imported_at': '추가 시각',
+        })
+
+    def import_frame(self, df, source=None, name=None, on_progress=None):
+        """데이터의 새 행만 분석해 저장 (source가 이미 추가한 파일이면 건너뜀)
+
+        반환값은 {'rows': 입력 행 수, 'added': 새 행 수, 'skipped': 이미 추가한 파일 여부}.
+        on_progress(진행률, 처리한 행 수)는 묶음마다 호출된다. 파일 기록과 저장된 해시를
+        읽기 전에 쓰기 잠금을 잡으므로, 겹치는 데이터를 동시에 추가해도 나중에 잠금을 얻은
+        쪽은 먼저 추가된 행을 보고 건너뛴다. 중간에 실패하면 행과 키워드 빈도 모두 되돌린다.
+        """
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            if source is not None:
+                recorded = connection.execute(
+                    "SELECT rows, added FROM imports WHERE source = ?", (source,)
+                ).fetchone()
+                if recorded is not None:
+                    return {'rows': recorded[0], 'added': recorded[1], 'skipped': True}
+
+            # 저장된 해시는 한 번만 읽음 (기본 키 순서라 이미 정렬되어 있음)
+            stored = np.fromiter(
+                (value for (value,) in connection.execute("SELECT row_hash FROM feedback ORDER BY row_hash")),
+                dtype=np.int64
+            )
+            imported = np.empty(0, dtype=np.int64)
+            for start in range(0, len(df), BATCH_SIZE):
+                hashes = self._import_batch(
+                    connection, df.iloc[start:start + BATCH_SIZE], source, (stored, imported)
+                )
+                imported = np.sort(np.concatenate([imported, hashes]))
+                if on_progress is not None:
+                    done = min(start + BATCH_SIZE, len(df))
+                    on_progress(done / len(df), done)
+            added = len(imported)
+
+            if source is not None:
+                connection.execute(
+                    "INSERT INTO imports VALUES (?, ?, ?, ?, ?)",
+                    (source, name, len(df), added, time.time()),
+                )
+            connection.commit()
+        finally:
+            connection.close()
+        return {'rows': len(df), 'added': added, 'skipped': False}
+
+    def _import_batch(self, connection, df, source, known):
+        """묶음 하나에서 저장소에 없는 행만 분석해 저장하고 새 행의 해시를 반환
+
+        known은 이미 있는 해시의 정렬된 배열 목록이다.
+        """
+        rows = normalize_rows(df)
+        rows['row_hash'] = row_hashes(rows)
+        rows = rows.drop_duplicates('row_hash')
+        hashes = rows['row_hash'].to_numpy()
+        rows = rows[~np.any([_contains(values, hashes) for values in known], axis=0)]
+        if rows.empty:
+            return rows['row_hash'].to_numpy()
+
+        features, keyword_counts = analyze_texts(rows['feedback_text'], keywords=True)
+        rows['sentiment'] = features['sentiment'].astype(object)
+        rows['tokens'] = features['tokens']
+        rows['length'] = features['length']
+        rows['source'] = source
+        columns = ['row_hash', *COLUMNS, 'month', 'sentiment', 'tokens', 'length', 'source']
+        connection.executemany(
+            f"INSERT INTO feedback ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            _records(rows, columns),
+        )
+        connection.executemany(
+            "INSERT INTO keywords VALUES (?, ?) "
+            "ON CONFLICT (token) DO UPDATE SET count = count + excluded.count",
+            keyword_counts.items(),
+        )
+        return rows['row_hash'].to_numpy()
+
+    def aggregates(self, max_keywords=MAX_KEYWORDS):
+        """저장소 전체 통계 (스트리밍 모드와 같은 형식, SQL 집계만 사용)"""
+        aggregates = StreamingAggregates()
+        connection = self._connect()
+        try:
+            rows, rating_sum, rating_count = connection.execute(
+                "SELECT COUNT(*), TOTAL(rating), COUNT(rating) FROM feedback"
+            ).fetchone()
+            aggregates.rows = rows
+            aggregates.rating_sum = rating_sum
+            aggregates.rating_count = rating_count
+            aggregates.sentiment_counts = Counter(dict(connection.execute(
+                "SELECT sentiment, COUNT(*) FROM feedback WHERE sentiment IS NOT NULL GROUP BY sentiment"
+            )))
+            aggregates.keyword_counts = Counter(dict(connection.execute(
+                "SELECT token, count FROM keywords ORDER BY count DESC LIMIT ?", (max_keywords,)
+            )))
+            aggregates.length_counts = Counter(dict(connection.execute(
+                "SELECT length, COUNT(*) FROM feedback WHERE length IS NOT NULL GROUP BY length"
+            )))
+            cells = pd.read_sql_query(
+                "SELECT month, product, category, sentiment, rating, COUNT(*) AS n FROM feedback "
+                "GROUP BY month, product, category, sentiment, rating",
+                connection,
+            )
+        finally:
+            connection.close()
+        if rows:
+            # 값이 하나도 없는 컬럼은 차원에서 제외 (스트리밍 모드에서 컬럼이 없는 경우와 같게)
+            dimensions = [column for column in ('month', 'product', 'category', 'sentiment')
+                          if cells[column].notna().any()]
+            aggregates.cube = RollupCube.from_frame(cells, dimensions=dimensions, weights=cells['n'])
+        return aggregates
+
+    def clear(self):
+        """저장소의 모든 행과 파일 기록 삭제"""
+        connection = self._connect()
+        try:
+            connection.executescript("DELETE FROM feedback; DELETE FROM keywords; DELETE FROM imports;")
+            connection.commit()
+        finally:
+            connection.close()
+
+
+feedback_store = FeedbackStore()
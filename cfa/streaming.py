@@ -0,0 +1,148 @@
+"""대용량 CSV 청크 단위 분석 (누적 집계)"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from cfa.cube import RollupCube
+from cfa.parallel import analyze_texts
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+class StreamingAggregates:
+    """청크를 하나씩 받아 누적하는 집계
+
+    전체 데이터를 메모리에 올리지 않고 감성 분포, 키워드 빈도,
+    제품/카테고리/월별 통계, 텍스트 길이 분포만 유지한다.
+    """
+
+    def __init__(self, text_column='feedback_text', group_columns=('product', 'category')):
+        self.text_column = text_column
+        self.group_columns = tuple(group_columns)
+        self.rows = 0
+        self.rating_sum = 0.0
+        self.rating_count = 0
+        self.sentiment_counts = Counter()
+        self.keyword_counts = Counter()
+        self.length_counts = Counter()
+        self.cube = None
+
+    def update(self, chunk, features=None, keyword_counts=None):
+        """청크 하나를 누적 집계에 반영
+
+        이미 분석한 청크는 features(`analyze_texts` 결과)와 keyword_counts를 넘기면
+        다시 분석하지 않는다.
+        """
+        self.rows += len(chunk)
+        has_rating = 'rating' in chunk.columns
+        ratings = chunk['rating'] if has_rating else pd.Series(np.nan, index=chunk.index)
+        self.rating_sum += float(ratings.sum())
+        self.rating_count += int(ratings.count())
+
+        if self.text_column in chunk.columns:
+            if features is None or keyword_counts is None:
+                # 청크가 파티션 크기보다 크면 프로세스 풀로 나눠 분석
+                features, keyword_counts = analyze_texts(chunk[self.text_column], keywords=True)
+            sentiments = features['sentiment']
+            sentiment_counts = sentiments.value_counts()
+            self.sentiment_counts.update(sentiment_counts[sentiment_counts > 0].to_dict())
+            self.keyword_counts.update(keyword_counts)
+            lengths = features['length'].dropna().astype(int)
+            self.length_counts.update(lengths.value_counts().to_dict())
+
+        # 청크별 큐브를 만들어 기존 큐브에 합침 (셀 수만큼의 메모리만 유지)
+        keys = {column: chunk[column] for column in self.group_columns if column in chunk.columns}
+        if 'date' in chunk.columns:
+            dates = pd.to_datetime(chunk['date'], errors='coerce')
+            keys['month'] = dates.dt.to_period('M')
+        if self.text_column in chunk.columns:
+            keys['sentiment'] = sentiments
+        keys['rating'] = ratings
+        dimensions = ('month', *self.group_columns, 'sentiment')
+        part = RollupCube.from_frame(pd.DataFrame(keys), dimensions=dimensions)
+        self.cube = part if self.cube is None else self.cube.merge(part)
+
+    @property
+    def avg_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else np.nan
+
+    def has_dimension(self, column):
+        """그룹 컬럼이 집계 큐브에 있는지 여부"""
+        return self.cube is not None and column in self.cube.dimensions
+
+    def unique_count(self, column):
+        """그룹 컬럼의 고유 값 수"""
+        totals = None if self.cube is None else self.cube.rollup(column)
+        return 0 if totals is None else len(totals)
+
+    def keywords(self, top_n=10):
+        """상위 키워드"""
+        return dict(self.keyword_counts.most_common(top_n))
+
+    def group_table(self, column):
+        """그룹별 평균 평점, 피드백 수, 긍정 비율 (일반 모드와 같은 형식)"""
+        return None if self.cube is None else self.cube.group_table(column)
+
+    def monthly_positive_ratio(self):
+        """월별 긍정 비율"""
+        return None if self.cube is None else self.cube.monthly_positive_ratio()
+
+    def length_distribution(self):
+        """텍스트 길이별 행 수 (길이 오름차순)"""
+        if not self.length_counts:
+            return pd.Series(dtype=int)
+        return pd.Series(self.length_counts).sort_index()
+
+    def length_stats(self):
+        """텍스트 길이 통계 (평균, 중앙값, 최소, 최대)"""
+        distribution = self.length_distribution()
+        if distribution.empty:
+            return None
+        lengths = distribution.index.to_numpy()
+        counts = distribution.to_numpy()
+        total = counts.sum()
+        cumulative = np.cumsum(counts)
+        # 중앙값: 정렬된 길이에서 가운데 한 값 또는 두 값의 평균
+        lower = lengths[np.searchsorted(cumulative, (total - 1) // 2 + 1)]
+        upper = lengths[np.searchsorted(cumulative, total // 2 + 1)]
+        return {
+            'mean': float((lengths * counts).sum() / total),
+            'median': (lower + upper) / 2,
+            'min': int(lengths[0]),
+            'max': int(lengths[-1]),
+        }
+
+
+def stream_csv(file, chunksize=DEFAULT_CHUNK_SIZE, text_column='feedback_text', on_progress=None):
+    """CSV를 청크 단위로 읽으며 누적 집계 (최대 메모리는 청크 크기에 비례)
+
+    on_progress(진행률, 처리한 행 수)는 청크마다 호출된다.
+    """
+    aggregates = StreamingAggregates(text_column=text_column)
+    total_size = _stream_size(file)
+    if hasattr(file, 'seek'):
+        file.seek(0)
+    for chunk in pd.read_csv(file, chunksize=chunksize):
+        aggregates.update(chunk)
+        if on_progress is not None:
+            fraction = min(file.tell() / total_size, 1.0) if total_size else 0.0
+            on_progress(fraction, aggregates.rows)
+    if on_progress is not None:
+        on_progress(1.0, aggregates.rows)
+    return aggregates
+
+
+def _stream_size(file):
+    """파일 객체의 전체 크기 (진행률 계산용)"""
+    size = getattr(file, 'size', None)
+    if size:
+        return size
+    try:
+        position = file.tell()
+        file.seek(0, 2)
+        size = file.tell()
+        file.seek(position)
+        return size
+    except (AttributeError, OSError):
+        return None
@@ -0,0 +1,148 @@
+"""공유 문서-단어 희소 행렬 (부분 집합별 키워드 집계)"""
+import numpy as np
+import pandas as pd
+
+# scipy/scikit-learn은 불러오는 데 오래 걸리므로 행렬을 처음 만들 때 불러옴
+
+
+class TermMatrix:
+    """행 = 피드백, 열 = 단어인 CSR 빈도 행렬과 단어 목록
+
+    토큰화는 한 번만 수행하고, 임의의 행 부분 집합(제품, 카테고리, 감성,
+    필터 결과 등)의 상위 키워드는 행렬 일부를 더해서 구한다.
+    """
+
+    def __init__(self, matrix, vocabulary, token_strings=None):
+        from scipy import sparse
+
+        self.matrix = sparse.csr_matrix(matrix)
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self.totals = np.asarray(self.matrix.sum(axis=0)).ravel()
+        # 빈도가 같으면 먼저 등장한 단어를 앞에 둠 (Counter.most_common과 같은 기준)
+        columns = self.matrix.tocsc()
+        columns.sort_indices()
+        self.first_row = columns.indices[columns.indptr[:-1]]
+        self.token_strings = token_strings
+
+    @classmethod
+    def from_tokens(cls, token_strings):
+        """`cfa.text.tokenize` 결과(공백으로 구분한 토큰 문자열)로 행렬 생성"""
+        from scipy import sparse
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        token_strings = list(token_strings)
+        if not any(token_strings):
+            return cls(sparse.csr_matrix((len(token_strings), 0), dtype=np.int32), [])
+        vectorizer = CountVectorizer(
+            tokenizer=str.split,
+            token_pattern=None,
+            lowercase=False,
+            dtype=np.int32,
+        )
+        matrix = vectorizer.fit_transform(token_strings)
+        return cls(matrix, vectorizer.get_feature_names_out(), token_strings)
+
+    @property
+    def n_rows(self):
+        return self.matrix.shape[0]
+
+    def counts(self, rows=None, weights=None):
+        """행 부분 집합의 단어별 빈도 (rows: 불리언 마스크 또는 행 위치, None이면 전체)
+
+        weights(행별 가중치, 근사 분석 표본 등)가 있으면 가중 빈도를 반올림한 정수다.
+        """
+        if weights is not None:
+            weights = np.asarray(weights, dtype=float)
+            if rows is not None:
+                selected = np.zeros(self.n_rows, dtype=bool)
+                selected[rows] = True
+                weights = np.where(selected, weights, 0.0)
+            return np.rint(self.matrix.T @ weights).astype(np.int64)
+        if rows is None:
+            return self.totals
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            weights = rows.astype(np.int32)
+        else:
+            weights = np.bincount(rows, minlength=self.n_rows).astype(np.int32)
+        return self.matrix.T @ weights
+
+    def _top(self, counts, top_n):
+        nonzero = np.flatnonzero(counts)
+        return self._top_entries(nonzero, counts[nonzero], top_n)
+
+    def _top_entries(self, terms, counts, top_n):
+        """단어 번호와 빈도(0이 아닌 값만) 목록에서 상위 키워드 {단어: 빈도}"""
+        if len(terms) > top_n:
+            # 상위 후보만 골라 정렬 (경계 값과 같은 빈도는 모두 포함)
+            threshold = counts[np.argpartition(counts, -top_n)[-top_n]]
+            keep = counts >= threshold
+            terms, counts = terms[keep], counts[keep]
+        order = np.lexsort((self.first_row[terms], -counts))
+        terms, counts = terms[order], counts[order]
+        selected = self._break_ties(terms, counts, top_n)
+        return dict(zip(self.vocabulary[terms[selected]].tolist(), counts[selected].tolist()))
+
+    def _break_ties(self, terms, counts, top_n):
+        """같은 빈도, 같은 첫 등장 행인 단어는 행 안의 등장 순서로 정렬 (정렬된 후보 안의 위치 반환)"""
+        end = min(top_n, len(terms))
+        if self.token_strings is None or end == 0:
+            return np.arange(end)
+        last = end - 1
+        while (end < len(terms) and counts[end] == counts[last]
+               and self.first_row[terms[end]] == self.first_row[terms[last]]):
+            end += 1
+        candidates = terms[:end]
+        positions = np.array([
+            self.token_strings[self.first_row[index]].split().index(self.vocabulary[index])
+            for index in candidates
+        ])
+        return np.lexsort((positions, self.first_row[candidates], -counts[:end]))[:top_n]
+
+    def top_terms(self, rows=None, top_n=10, weights=None):
+        """상위 키워드 {단어: 빈도}"""
+        return self._top(self.counts(rows, weights), top_n)
+
+    def group_counts(self, labels):
+        """그룹 라벨(행 순서와 같은 배열 또는 Series)별 단어 빈도 (그룹 목록, 그룹 × 단어 CSR 행렬)
+
+        결측 라벨 행은 제외한다. 라벨별 행 위치를 정렬해 지시 행렬을 CSR로 바로 만들고
+        희소 행렬 곱 한 번으로 합산하므로 결과도 희소 행렬이다.
+        """
+        from scipy import sparse
+
+        # 범주형 Series는 코드를 그대로 쓰고, 배열은 문자열 컬럼으로 바꾸지 않고 바로 코드화
+        codes, groups = pd.factorize(labels, sort=True)
+        # 작은 정수형 코드의 안정 정렬은 기수 정렬이라 빠름
+        codes = codes.astype(np.min_scalar_type(-len(groups) - 1))
+        order = np.argsort(codes, kind='stable')
+        order = order[np.searchsorted(codes[order], 0):]
+        indptr = np.zeros(len(groups) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[order], minlength=len(groups)), out=indptr[1:])
+        indicator = sparse.csr_matrix(
+            (np.ones(len(order), dtype=np.int32), order, indptr), shape=(len(groups), self.n_rows)
+        )
+        return list(groups), (indicator @ self.matrix).tocsr()
+
+    def top_terms_grouped(self, grouped, top_n=10):
+        """`group_counts` 결과의 그룹별 상위 키워드 {라벨: {단어: 빈도}} (그룹 행의 0이 아닌 값만 사용)"""
+        groups, counts = grouped
+        result = {}
+        for code, group in enumerate(groups):
+            start, end = counts.indptr[code], counts.indptr[code + 1]
+            result[group] = self._top_entries(counts.indices[start:end], counts.data[start:end], top_n)
+        return result
+
+    def top_terms_by(self, labels, top_n=10):
+        """그룹 라벨(행 순서와 같은 배열 또는 Series)별 상위 키워드 {라벨: {단어: 빈도}}"""
+        return self.top_terms_grouped(self.group_counts(labels), top_n)
+
+
+def keywords_frame(grouped_keywords):
+    """그룹별 키워드를 (그룹, 키워드, 빈도) 표로 변환"""
+    records = [
+        (group, word, count)
+        for group, keywords in grouped_keywords.items()
+        for word, count in keywords.items()
+    ]
+    return pd.DataFrame(records, columns=['그룹', '키워드', '빈도'])
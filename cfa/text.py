@@ -0,0 +1,65 @@
+"""텍스트 전처리 및 토큰 집계"""
+import re
+from collections import Counter
+
+import pandas as pd
+
+from cfa.sentiment import classify_sentiment
+
+# 한국어 불용어 설정
+korean_stopwords = set(['이', '그', '저', '것', '수', '등', '때', '곳', '말', '일', '년', '월', '일', '시', '분', '초'])
+
+_special_chars = re.compile(r'[^\w\s]')
+
+
+def preprocess_text(text):
+    """텍스트 전처리"""
+    if pd.isna(text):
+        return ""
+    
+    # 특수문자 제거 및 소문자 변환
+    text = _special_chars.sub('', str(text))
+    text = text.lower()
+    
+    # 간단한 공백 기반 토큰화 (NLTK 의존성 제거)
+    tokens = text.split()
+    
+    # 불용어 제거
+    tokens = [token for token in tokens if token not in korean_stopwords and len(token) > 1]
+    
+    return ' '.join(tokens)
+
+
+def count_tokens(texts):
+    """전처리한 토큰의 빈도"""
+    return Counter(
+        word
+        for text in texts if pd.notna(text)
+        for word in preprocess_text(text).split()
+    )
+
+
+def tokenize(texts):
+    """행별 전처리 결과 (결측값은 빈 문자열)"""
+    return pd.Series([preprocess_text(text) for text in texts], index=texts.index, dtype=object)
+
+
+def count_token_strings(token_strings):
+    """`tokenize` 결과에서 토큰 빈도 계산 (전처리 생략)"""
+    return Counter(word for tokens in token_strings for word in tokens.split())
+
+
+def text_features(texts):
+    """텍스트 컬럼의 파생 컬럼 (감성 코드, 토큰, 길이)"""
+    if isinstance(texts.dtype, pd.CategoricalDtype):
+        texts = texts.astype(object)
+    return pd.DataFrame({
+        'sentiment': classify_sentiment(texts, categorical=True),
+        'tokens': tokenize(texts),
+        'length': texts.astype(str).str.len(),
+    }, index=texts.index)
+
+
+def extract_keywords(texts, top_n=10):
+    """상위 키워드 [(단어, 빈도), ...]"""
+    return count_tokens(texts).most_common(top_n)
@@ -0,0 +1,173 @@
+"""두 앱이 함께 쓰는 Streamlit 화면 요소 (파일 로드, Excel 시트·컬럼 선택, 워드클라우드, 내보내기, 캐시·성능 패널)
+
+분석 단계는 `cfa.analysis`에 있고, 여기에는 위젯을 그리는 함수만 둔다.
+"""
+import streamlit as st
+
+from cfa.analysis import load_dataset
+from cfa.cache import cached_stage, content_hash, stage_cache
+from cfa.dataset_cache import dataset_cache, format_entries
+from cfa.excel import DEFAULT_COLUMNS, sheet_columns
+from cfa.export import EXPORT_FORMATS, export_rows
+from cfa.profiling import profiled, remember_run, to_chrome_trace, to_json, waterfall_figure
+from cfa.wordcloud_render import wordcloud_renderer
+
+# 성능 측정 켜기 체크박스와 최근 실행 기록의 세션 상태 키
+PROFILING_KEY = 'cfa_profiling'
+PROFILE_HISTORY_KEY = 'cfa_profile_runs'
+
+
+@profiled('load_data')
+def load_data(uploaded_file, sheet=None, columns=None):
+    """데이터 파일 로드 (데이터, 디스크 캐시 키, 메모리 비교 표 반환)"""
+    try:
+        return load_dataset(uploaded_file, sheet, columns)
+    except ValueError as e:
+        st.error(str(e))
+        return None, None, None
+    except Exception as e:
+        st.error(f"파일 로드 중 오류가 발생했습니다: {str(e)}")
+        return None, None, None
+
+
+@cached_stage('load.excel_layout')
+def excel_layout(data):
+    """Excel 파일의 시트별 컬럼 이름 (머리글 행만 읽음)"""
+    return sheet_columns(data)
+
+
+def excel_options(uploaded_file):
+    """Excel(.xlsx) 업로드 파일에서 읽을 시트와 컬럼 선택 (파싱 전에 골라 필요한 컬럼만 읽음)"""
+    if uploaded_file is None or not uploaded_file.name.endswith('.xlsx'):
+        return {}
+    try:
+        layout = excel_layout(uploaded_file.getvalue())
+    except Exception as e:
+        st.error(f"Excel 파일을 열 수 없습니다: {str(e)}")
+        return {}
+    with st.sidebar.expander("📑 Excel 시트·컬럼", expanded=True):
+        sheet = st.selectbox("시트", list(layout))
+        names = layout[sheet]
+        default = [column for column in DEFAULT_COLUMNS if column in names] or names
+        columns = st.multiselect(
+            "읽을 컬럼", names, default=default,
+            help="선택한 컬럼만 읽어 큰 파일도 빠르고 적은 메모리로 불러옵니다. 비우면 모든 컬럼을 읽습니다."
+        )
+    # 첫 시트 전체는 선택하지 않은 경우와 같은 데이터 (디스크 캐시 키 유지)
+    if sheet == next(iter(layout)) and (not columns or columns == names):
+        return {}
+    return {'sheet': sheet, 'columns': columns or None}
+
+
+def create_wordcloud(frequencies, options):
+    """워드클라우드 생성 (options는 `WordCloud` 설정)
+
+    캐시에 있으면 바로 표시하고, 없으면 백그라운드에서 그리는 동안 자리 표시를
+    남겨 두고 이미지로 바꾸는 함수를 반환한다 (페이지 나머지를 먼저 그린 뒤 호출).
+    """
+    if not frequencies:
+        return None
+    
+    future = wordcloud_renderer.submit(frequencies, **options)
+    placeholder = st.empty()
+    
+    def finish():
+        placeholder.image(future.result())
+    
+    if future.done():
+        finish()
+        return None
+    placeholder.info("☁️ 워드클라우드를 그리는 중입니다...")
+    return finish
+
+
+@profiled('show_export_buttons')
+def show_export_buttons(df, rows, export_key, file_stem):
+    """내보내기 버튼 (파일은 요청할 때만 만들고 데이터·필터 상태 해시로 캐시)
+
+    rows는 내보낼 행 위치 (None이면 전체), export_key는 데이터와 필터 상태를 나타내는 값이다.
+    """
+    columns = st.columns(len(EXPORT_FORMATS))
+    for column, (export_format, (label, extension, mime)) in zip(columns, EXPORT_FORMATS.items()):
+        cache_key = content_hash('export', export_format, export_key)
+        with column:
+            # 만들기 버튼 자리를 다운로드 버튼으로 교체
+            slot = st.empty()
+            data = stage_cache.get(cache_key)
+            if data is None and slot.button(f"{label} 파일 만들기", key=f"{file_stem}_{export_format}_prepare"):
+                try:
+                    with st.spinner(f"{label} 파일을 만드는 중입니다..."):
+                        data = export_rows(df, rows, export_format)
+                except Exception as e:
+                    st.error(f"{label} 파일을 만들 수 없습니다: {str(e)}")
+                else:
+                    stage_cache.put(cache_key, data)
+            if data is not None:
+                slot.download_button(
+                    label=f"{label} 다운로드",
+                    data=data,
+                    file_name=f"{file_stem}.{extension}",
+                    mime=mime,
+                    key=f"{file_stem}_{export_format}_download"
+                )
+
+
+def show_dataset_cache_panel():
+    """사이드바 디스크 캐시 목록 및 삭제"""
+    with st.sidebar.expander("🗄️ 데이터 캐시"):
+        entries = dataset_cache.entries()
+        if not entries:
+            st.caption("캐시된 데이터가 없습니다.")
+            return
+        
+        total_mb = sum(entry['size_mb'] for entry in entries)
+        st.caption(f"{len(entries)}개, {total_mb:.1f} MB / {dataset_cache.max_bytes / 1024**2:.0f} MB")
+        st.dataframe(format_entries(entries), hide_index=True, use_container_width=True)
+        
+        labels = {entry['key']: f"{entry['name'] or entry['key'][:8]} ({entry['size_mb']:.1f} MB)" for entry in entries}
+        selected_key = st.selectbox("삭제할 데이터", list(labels), format_func=labels.get)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("선택 삭제"):
+                dataset_cache.purge(selected_key)
+                st.rerun()
+        with col2:
+            if st.button("전체 삭제"):
+                dataset_cache.purge()
+                st.rerun()
+
+
+def show_profile_panel(profiler):
+    """사이드바 성능 패널 (이번 실행의 단계별 폭포 차트와 최근 실행 기록 내보내기)"""
+    with st.sidebar.expander("⏱️ 성능", expanded=profiler is not None):
+        st.checkbox(
+            "단계별 성능 측정", key=PROFILING_KEY,
+            help="실행마다 단계별 시간, 행 수, 메모리 변화, 캐시 적중 여부를 기록합니다."
+        )
+        if profiler is None:
+            return
+        history = remember_run(st.session_state.setdefault(PROFILE_HISTORY_KEY, []), profiler)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("실행 시간", f"{profiler.duration * 1000:,.0f} ms")
+        with col2:
+            st.metric("캐시 적중", f"{profiler.cache_hits} / {profiler.cache_hits + profiler.cache_misses}")
+        
+        if profiler.spans:
+            st.plotly_chart(waterfall_figure(profiler), use_container_width=True)
+            table = profiler.to_frame().drop(columns=['depth']).rename(columns={
+                'name': '단계', 'kind': '종류', 'start': '시작(ms)', 'duration': '시간(ms)',
+                'rows': '행 수', 'memory_mb': '메모리 변화(MB)', 'cache': '캐시',
+            })
+            st.dataframe(table.round(1), use_container_width=True, hide_index=True)
+        
+        st.caption(f"최근 {len(history)}회 실행 기록 내보내기")
+        st.download_button(
+            "JSON", to_json(history), file_name="cfa_profile.json", mime="application/json"
+        )
+        st.download_button(
+            "Chrome trace", to_chrome_trace(history), file_name="cfa_trace.json", mime="application/json",
+            help="chrome://tracing 또는 Perfetto에서 열 수 있습니다."
+        )
@@ -0,0 +1,79 @@
+"""워드클라우드 PNG 렌더링 (백그라운드 스레드, 결과 캐시)"""
+import io
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from cfa.cache import content_hash, stage_cache
+
+# 동시에 그리는 워드클라우드 수, 환경 변수로 변경 가능
+DEFAULT_WORKERS = int(os.environ.get('CFA_WORDCLOUD_WORKERS', 2))
+
+
+def render_png(frequencies, **options):
+    """단어 빈도로 워드클라우드를 그려 PNG 바이트로 반환 (options는 WordCloud 인자)"""
+    # wordcloud는 matplotlib까지 불러오므로 처음 그릴 때 불러옴
+    from wordcloud import WordCloud
+
+    wordcloud = WordCloud(**options).generate_from_frequencies(frequencies)
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _font_signature(font_path):
+    """폰트 파일이 바뀌면 캐시 키도 바뀌도록 크기와 수정 시각을 포함"""
+    if not font_path:
+        return None
+    try:
+        stat = os.stat(font_path)
+    except OSError:
+        return (font_path, None)
+    return (font_path, stat.st_size, stat.st_mtime)
+
+
+class WordCloudRenderer:
+    """워드클라우드를 백그라운드에서 그리고 PNG를 (빈도, 크기, 폰트) 기준으로 캐시
+
+    같은 요청이 진행 중이면 새로 그리지 않고 진행 중인 작업을 함께 기다린다.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, cache=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='wordcloud')
+        self._cache = cache
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def key(self, frequencies, options):
+        return content_hash(
+            'wordcloud.png', frequencies, sorted(options.items()),
+            _font_signature(options.get('font_path')),
+        )
+
+    def submit(self, frequencies, **options):
+        """PNG 렌더링 요청 (캐시에 있으면 이미 완료된 Future 반환)"""
+        cache = stage_cache if self._cache is None else self._cache
+        key = self.key(frequencies, options)
+        png = cache.get(key)
+        if png is not None:
+            future = Future()
+            future.set_result(png)
+            return future
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._render, key, dict(frequencies), options, cache)
+                self._pending[key] = future
+        return future
+
+    def _render(self, key, frequencies, options, cache):
+        try:
+            png = render_png(frequencies, **options)
+            cache.put(key, png)
+            return png
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+
+wordcloud_renderer = WordCloudRenderer()
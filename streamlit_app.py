@@ -1,17 +1,20 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from textblob import TextBlob
-import re
-from collections import Counter
-# NLTK 관련 import 제거 (한국어 처리에 불필요)
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
-import io
-import base64
+
+from cfa.analysis import collapse_duplicates, column_features, segment_counts, term_matrix
+from cfa.cache import cached_stage, content_hash, stage_cache
+from cfa.charts import box_figure, box_summary, histogram_bins, histogram_figure
+from cfa.dtypes import memory_mb
+from cfa.jobs import cancel_session_job, session_job
+from cfa.profiling import profile_run, profile_stage, profiled
+from cfa.streaming import DEFAULT_CHUNK_SIZE, stream_csv
+from cfa.term_matrix import keywords_frame
+from cfa.ui import (
+    PROFILING_KEY, create_wordcloud, excel_options, load_data, show_dataset_cache_panel, show_export_buttons,
+    show_profile_panel
+)
+
+# plotly.express는 앱 시작 시간을 줄이기 위해 차트를 만들 때 함수 안에서 불러옴
 
 # 페이지 설정
 st.set_page_config(
@@ -21,109 +24,321 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
+@cached_stage('tokens')
+def column_keywords(df, text_column, top_n=10, dataset_key=None):
+    """텍스트 컬럼의 상위 키워드"""
+    return list(term_matrix(df, text_column, dataset_key).top_terms(top_n=top_n).items())
 
-# NLTK 데이터 다운로드 제거 (한국어 처리에 불필요)
+@cached_stage('tokens.segments')
+def sentiment_keywords(df, text_column, sentiments, top_n=5, dataset_key=None):
+    """감성 값 컬럼별 상위 키워드 표"""
+    matrix = term_matrix(df, text_column, dataset_key)
+    grouped = segment_counts(df, text_column, sentiments, dataset_key)
+    return keywords_frame(matrix.top_terms_grouped(grouped, top_n=top_n))
 
-# 한국어 불용어 설정
-korean_stopwords = set(['이', '그', '저', '것', '수', '등', '때', '곳', '말', '일', '년', '월', '일', '시', '분', '초'])
+WORDCLOUD_OPTIONS = {
+    'font_path': 'malgun.ttf',  # Windows 기본 한글 폰트
+    'width': 800,
+    'height': 400,
+    'background_color': 'white',
+    'max_words': 100,
+    'colormap': 'viridis',
+}
 
-def load_data(uploaded_file):
-    """데이터 파일 로드"""
-    try:
-        if uploaded_file.name.endswith('.csv'):
-            df = pd.read_csv(uploaded_file)
-        elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-            df = pd.read_excel(uploaded_file)
-        else:
-            st.error("지원되지 않는 파일 형식입니다. CSV 또는 Excel 파일을 업로드해주세요.")
-            return None
-        return df
-    except Exception as e:
-        st.error(f"파일 로드 중 오류가 발생했습니다: {str(e)}")
-        return None
+@cached_stage('wordcloud.frequencies')
+def wordcloud_frequencies(df, text_column, dataset_key=None):
+    """워드클라우드용 단어 빈도 (토큰 행렬 재사용, 숫자만 있는 단어 제외)"""
+    matrix = term_matrix(df, text_column, dataset_key)
+    max_words = WORDCLOUD_OPTIONS['max_words']
+    numeric_words = sum(word.isdigit() for word in matrix.vocabulary)
+    keywords = matrix.top_terms(top_n=max_words + numeric_words)
+    frequencies = {}
+    for word, count in keywords.items():
+        if not word.isdigit():
+            frequencies[word] = count
+            if len(frequencies) == max_words:
+                break
+    return frequencies
 
-def preprocess_text(text):
-    """텍스트 전처리"""
-    if pd.isna(text):
-        return ""
-    
-    # 특수문자 제거 및 소문자 변환
-    text = re.sub(r'[^\w\s]', '', str(text))
-    text = text.lower()
+@cached_stage('sentiment')
+def add_sentiment(df, text_column, dataset_key=None):
+    """감성 및 텍스트 길이 컬럼 추가"""
+    features = column_features(df, text_column, dataset_key)
+    return df.assign(감성=features['sentiment'], 텍스트_길이=features['length'])
+
+@cached_stage('aggregates.sentiment')
+def sentiment_distribution(df, column='감성'):
+    """감성별 피드백 수"""
+    counts = df[column].value_counts()
+    # 범주형 감성 코드는 나오지 않은 감성도 0으로 포함하므로 제외
+    return counts[counts > 0]
+
+SENTIMENT_COLORS = {'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
+
+@cached_stage('charts.sentiment')
+def sentiment_chart(sentiment_counts):
+    """감성 분석 분포 파이 차트"""
+    import plotly.express as px
     
-    # 간단한 공백 기반 토큰화 (NLTK 의존성 제거)
-    tokens = text.split()
+    return px.pie(
+        values=sentiment_counts.values,
+        names=sentiment_counts.index,
+        title="감성 분석 분포",
+        color_discrete_map=SENTIMENT_COLORS
+    )
+
+@cached_stage('charts.keywords')
+def keyword_chart(keyword_df):
+    """상위 키워드 막대 차트"""
+    import plotly.express as px
     
-    # 불용어 제거
-    tokens = [token for token in tokens if token not in korean_stopwords and len(token) > 1]
+    return px.bar(
+        keyword_df,
+        x='빈도',
+        y='키워드',
+        orientation='h',
+        title="상위 키워드 빈도",
+        color='빈도',
+        color_continuous_scale='viridis'
+    )
+
+@cached_stage('charts.segment_keywords')
+def sentiment_keyword_chart(segment_frame):
+    """감성별 상위 키워드 막대 차트"""
+    import plotly.express as px
     
-    return ' '.join(tokens)
+    fig = px.bar(
+        segment_frame,
+        x='빈도',
+        y='키워드',
+        orientation='h',
+        facet_col='그룹',
+        color='그룹',
+        title="감성별 상위 키워드",
+        labels={'그룹': '감성'},
+        color_discrete_map=SENTIMENT_COLORS
+    )
+    fig.update_yaxes(matches=None, showticklabels=True)
+    fig.update_xaxes(matches=None)
+    return fig
 
-def analyze_sentiment(text):
-    """감성 분석 (TextBlob 사용)"""
-    if pd.isna(text) or text == "":
-        return "중립"
+@cached_stage('charts.length')
+def length_charts(df):
+    """텍스트 길이 분포 히스토그램과 감성별 상자 그림 (구간 빈도와 상자 통계만 전송)"""
+    edges, counts = histogram_bins(df['텍스트_길이'], nbins=30)
+    fig_length = histogram_figure(edges, counts, "텍스트 길이 분포", '텍스트 길이')
+    summary = box_summary(df['텍스트_길이'], df['감성'])
+    fig_sentiment_length = box_figure(
+        summary, "감성별 텍스트 길이 분포", '감성', '텍스트_길이', color_map=SENTIMENT_COLORS
+    )
+    return fig_length, fig_sentiment_length
+
+@cached_stage('aggregates.length')
+def length_stats(df):
+    """텍스트 길이 통계"""
+    lengths = df['텍스트_길이']
+    return {
+        'mean': lengths.mean(),
+        'median': lengths.median(),
+        'min': lengths.min(),
+        'max': lengths.max(),
+    }
+
+@profiled('load_streaming')
+def load_streaming(uploaded_file, text_column, chunk_size):
+    """CSV를 청크 단위로 읽어 누적 집계 (업로드 파일, 컬럼, 청크 크기 기준 캐시)"""
+    key = content_hash(
+        'stream', getattr(uploaded_file, 'file_id', None), uploaded_file.name,
+        uploaded_file.size, text_column, chunk_size
+    )
+    aggregates = stage_cache.get(key)
+    if aggregates is None:
+        progress = st.progress(0.0, text="청크 단위로 분석 중...")
+        aggregates = stream_csv(
+            uploaded_file,
+            chunksize=chunk_size,
+            text_column=text_column,
+            on_progress=lambda fraction, rows: progress.progress(
+                fraction, text=f"청크 단위로 분석 중... ({rows:,}행 처리)"
+            )
+        )
+        progress.empty()
+        stage_cache.put(key, aggregates)
+    return aggregates
+
+@profiled('show_streaming_analysis')
+def show_streaming_analysis(uploaded_file, chunk_size):
+    """스트리밍 모드 분석 (파일 전체를 메모리에 올리지 않음)"""
+    # 컬럼 목록은 앞부분 일부 행만 읽어 확인
+    uploaded_file.seek(0)
+    header = pd.read_csv(uploaded_file, nrows=100)
+    text_columns = header.select_dtypes(include=['object', 'string']).columns.tolist()
     
-    # 한국어 텍스트를 영어로 번역하여 감성 분석 (간단한 구현)
-    # 실제 프로덕션에서는 한국어 전용 감성 분석 모델 사용 권장
+    if not text_columns:
+        st.warning("분석할 수 있는 텍스트 컬럼이 없습니다.")
+        return
     
-    # 간단한 키워드 기반 감성 분석
-    positive_words = ['좋', '편', '빠르', '유용', '친절', '깔끔', '직관', '간단']
-    negative_words = ['느리', '어렵', '오류', '충돌', '문제', '불편', '아프', '작']
+    selected_text_column = st.sidebar.selectbox(
+        "분석할 텍스트 컬럼을 선택하세요",
+        text_columns
+    )
+    aggregates = load_streaming(uploaded_file, selected_text_column, chunk_size)
     
-    text_lower = str(text).lower()
+    st.success(f"✅ {uploaded_file.name} 파일을 청크 단위로 분석했습니다!")
+    st.info("대용량 스트리밍 모드: 누적 집계 결과만 표시합니다.")
     
-    positive_count = sum(1 for word in positive_words if word in text_lower)
-    negative_count = sum(1 for word in negative_words if word in text_lower)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("총 행 수", aggregates.rows)
+    with col2:
+        st.metric("총 열 수", len(header.columns))
     
-    if positive_count > negative_count:
-        return "긍정"
-    elif negative_count > positive_count:
-        return "부정"
-    else:
-        return "중립"
+    st.subheader(f"📝 {selected_text_column} 컬럼 분석")
+    
+    # 감성 분석
+    st.write("**감성 분석 결과**")
+    sentiment_counts = pd.Series(aggregates.sentiment_counts).sort_values(ascending=False)
+    st.plotly_chart(sentiment_chart(sentiment_counts), use_container_width=True)
+    
+    # 키워드 추출
+    st.write("**상위 키워드**")
+    keywords = aggregates.keyword_counts.most_common(15)
+    if keywords:
+        keyword_df = pd.DataFrame(keywords, columns=['키워드', '빈도'])
+        st.plotly_chart(keyword_chart(keyword_df), use_container_width=True)
+        st.dataframe(keyword_df, use_container_width=True)
+    
+    # 텍스트 길이 분석
+    st.write("**텍스트 길이 분석**")
+    length_stats = aggregates.length_stats()
+    if length_stats is not None:
+        distribution = aggregates.length_distribution()
+        edges, counts = histogram_bins(distribution.index, weights=distribution.to_numpy())
+        fig_length = histogram_figure(edges, counts, "텍스트 길이 분포", '텍스트 길이')
+        st.plotly_chart(fig_length, use_container_width=True)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("평균 길이", f"{length_stats['mean']:.1f}")
+        with col2:
+            st.metric("중앙값", f"{length_stats['median']:.1f}")
+        with col3:
+            st.metric("최소 길이", f"{length_stats['min']}")
+        with col4:
+            st.metric("최대 길이", f"{length_stats['max']}")
 
-def extract_keywords(texts, top_n=10):
-    """키워드 추출"""
-    all_words = []
-    for text in texts:
-        if pd.notna(text):
-            processed_text = preprocess_text(text)
-            words = processed_text.split()
-            all_words.extend(words)
+def analysis_stages(df, text_column, dataset_key=None):
+    """백그라운드 분석 단계 (감성 → 키워드 → 길이 차트 순서로 결과 공개)"""
+    def sentiment(results):
+        analyzed = add_sentiment(df, text_column, dataset_key)
+        return {'df': analyzed, 'chart': sentiment_chart(sentiment_distribution(analyzed))}
     
-    # 빈도 계산
-    word_freq = Counter(all_words)
+    def keywords(results):
+        # 키워드는 감성 단계에 넘긴 데이터로 구해 같은 텍스트 파생 컬럼을 재사용
+        analyzed = results['sentiment']['df']
+        keywords = column_keywords(df, text_column, top_n=15, dataset_key=dataset_key)
+        keyword_df = pd.DataFrame(keywords, columns=['키워드', '빈도'])
+        segment_frame = sentiment_keywords(df, text_column, analyzed['감성'], dataset_key=dataset_key)
+        return {
+            'table': keyword_df,
+            'chart': keyword_chart(keyword_df) if keywords else None,
+            'segment_chart': None if segment_frame.empty else sentiment_keyword_chart(segment_frame),
+            'frequencies': wordcloud_frequencies(df, text_column, dataset_key),
+        }
     
-    # 상위 키워드 반환
-    return word_freq.most_common(top_n)
+    def charts(results):
+        analyzed = results['sentiment']['df']
+        return {'figures': length_charts(analyzed), 'stats': length_stats(analyzed)}
+    
+    return [('sentiment', sentiment), ('keywords', keywords), ('charts', charts)]
+
+def wait_for_stage(job, name, message):
+    """분석 단계 결과 대기 (진행 표시를 계속 갱신하므로 그 사이 새 업로드·컬럼 변경이 바로 반영됨)"""
+    if name not in job.results and not job.finished:
+        # 백그라운드 작업 안의 단계는 측정 스레드 밖이므로 기다린 시간을 기록
+        with profile_stage(f'job.{name}'):
+            progress = st.progress(job.progress, text=message)
+            while not job.wait(name, timeout=0.2):
+                if job.finished or job.cancelled:
+                    break
+                progress.progress(job.progress, text=f"{message} ({job.elapsed:.0f}초)")
+            progress.empty()
+    if job.error is not None:
+        st.error(f"분석 중 오류가 발생했습니다: {str(job.error)}")
+    return job.results.get(name)
 
-def create_wordcloud(texts):
-    """워드클라우드 생성"""
-    if not texts or all(pd.isna(texts)):
-        return None
+@profiled('show_text_analysis')
+def show_text_analysis(df, text_column, dataset_key=None):
+    """텍스트 컬럼 분석 결과 (백그라운드 작업 결과를 준비되는 대로 표시)"""
+    key = content_hash('analysis', dataset_key if dataset_key is not None else df, text_column)
+    job = session_job(st.session_state, key, lambda: analysis_stages(df, text_column, dataset_key))
+    
+    # 감성 분석
+    st.write("**감성 분석 결과**")
+    sentiment = wait_for_stage(job, 'sentiment', "감성 분석 중...")
+    if sentiment is None:
+        return
+    st.plotly_chart(sentiment['chart'], use_container_width=True)
     
-    # 텍스트 결합
-    combined_text = ' '.join([str(text) for text in texts if pd.notna(text)])
+    # 키워드 추출
+    st.write("**상위 키워드**")
+    keywords = wait_for_stage(job, 'keywords', "키워드 추출 중...")
+    if keywords is None:
+        return
+    if keywords['chart'] is not None:
+        # 키워드 시각화 및 테이블
+        st.plotly_chart(keywords['chart'], use_container_width=True)
+        st.dataframe(keywords['table'], use_container_width=True)
+        
+        # 감성별 키워드 (같은 행렬을 감성별로 합산)
+        if keywords['segment_chart'] is not None:
+            st.plotly_chart(keywords['segment_chart'], use_container_width=True)
+    
+    # 워드클라우드
+    st.write("**워드클라우드**")
+    finish_wordcloud = None
+    if keywords['frequencies']:
+        finish_wordcloud = create_wordcloud(keywords['frequencies'], WORDCLOUD_OPTIONS)
+    else:
+        st.warning("워드클라우드를 생성할 수 없습니다.")
+    
+    # 텍스트 길이 분석
+    st.write("**텍스트 길이 분석**")
+    charts = wait_for_stage(job, 'charts', "텍스트 길이 분석 중...")
+    if charts is None:
+        return
+    fig_length, fig_sentiment_length = charts['figures']
+    st.plotly_chart(fig_length, use_container_width=True)
     
-    if not combined_text.strip():
-        return None
+    # 길이 통계
+    stats = charts['stats']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("평균 길이", f"{stats['mean']:.1f}")
+    with col2:
+        st.metric("중앙값", f"{stats['median']:.1f}")
+    with col3:
+        st.metric("최소 길이", f"{stats['min']}")
+    with col4:
+        st.metric("최대 길이", f"{stats['max']}")
     
-    # 워드클라우드 생성
-    wordcloud = WordCloud(
-        font_path='malgun.ttf',  # Windows 기본 한글 폰트
-        width=800, 
-        height=400,
-        background_color='white',
-        max_words=100,
-        colormap='viridis'
-    ).generate(combined_text)
+    # 감성별 텍스트 길이 비교
+    st.write("**감성별 텍스트 길이 비교**")
+    st.plotly_chart(fig_sentiment_length, use_container_width=True)
     
-    return wordcloud
+    # 상세 분석 결과 다운로드
+    st.subheader("💾 분석 결과 다운로드")
+    
+    # 감성 분석 결과 (버튼을 눌렀을 때만 파일 생성)
+    analyzed = sentiment['df']
+    results = analyzed[['감성', '텍스트_길이']]
+    show_export_buttons(results, None, analyzed, 'sentiment_analysis_results')
+    
+    if finish_wordcloud is not None:
+        with profile_stage('wordcloud'):
+            finish_wordcloud()
 
-def main():
+def show_dashboard():
     st.title("📊 고객 피드백 분석 대시보드")
     st.markdown("---")
     
@@ -131,12 +346,32 @@ def main():
     st.sidebar.header("📁 데이터 업로드")
     uploaded_file = st.sidebar.file_uploader(
         "CSV 또는 Excel 파일을 선택하세요",
-        type=['csv', 'xlsx', 'xls']
+        type=['csv', 'xlsx', 'xls', 'parquet']
     )
+    excel = excel_options(uploaded_file)
+    show_dataset_cache_panel()
     
-    if uploaded_file is not None:
+    # 대용량 CSV 스트리밍 옵션
+    streaming = st.sidebar.checkbox(
+        "대용량 스트리밍 모드 (CSV)",
+        value=False,
+        help="파일 전체를 메모리에 올리지 않고 청크 단위로 읽어 집계합니다."
+    )
+    if streaming:
+        chunk_size = st.sidebar.number_input(
+            "청크 크기 (행)", min_value=1000, value=DEFAULT_CHUNK_SIZE, step=10000
+        )
+    
+    if uploaded_file is not None and streaming and uploaded_file.name.endswith('.csv'):
+        cancel_session_job(st.session_state)
+        try:
+            show_streaming_analysis(uploaded_file, int(chunk_size))
+        except Exception as e:
+            st.error(f"파일 로드 중 오류가 발생했습니다: {str(e)}")
+    
+    elif uploaded_file is not None:
         # 데이터 로드
-        df = load_data(uploaded_file)
+        df, dataset_key, memory_table = load_data(uploaded_file, **excel)
         
         if df is not None:
             st.success(f"✅ {uploaded_file.name} 파일이 성공적으로 로드되었습니다!")
@@ -154,10 +389,17 @@ def main():
             with col2:
                 st.metric("총 열 수", len(df.columns))
             with col3:
-                st.metric("메모리 사용량", f"{df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+                before = memory_table['원래(MB)'].sum()
+                after = memory_mb(df)
+                st.metric(
+                    "메모리 사용량", f"{after:.2f} MB",
+                    delta=f"{after - before:.2f} MB (변환 전 {before:.2f} MB)", delta_color="inverse"
+                )
+            with st.expander("🗜️ 데이터 타입 최적화"):
+                st.dataframe(memory_table, use_container_width=True)
             
-            # 텍스트 컬럼 선택
-            text_columns = df.select_dtypes(include=['object']).columns.tolist()
+            # 텍스트 컬럼 선택 (범주형으로 압축한 문자열 컬럼 포함)
+            text_columns = df.select_dtypes(include=['object', 'string', 'category']).columns.tolist()
             
             if text_columns:
                 selected_text_column = st.sidebar.selectbox(
@@ -165,102 +407,21 @@ def main():
                     text_columns
                 )
                 
+                collapse = st.sidebar.checkbox(
+                    "유사 중복 피드백 묶기",
+                    value=False,
+                    help="복사해 붙였거나 거의 같은 피드백을 한 묶음으로 보고 묶음마다 첫 행만 남겨 분석합니다."
+                )
+                
                 if selected_text_column:
                     st.subheader(f"📝 {selected_text_column} 컬럼 분석")
-                    
-                    # 감성 분석
-                    st.write("**감성 분석 결과**")
-                    df['감성'] = df[selected_text_column].apply(analyze_sentiment)
-                    
-                    sentiment_counts = df['감성'].value_counts()
-                    fig_sentiment = px.pie(
-                        values=sentiment_counts.values,
-                        names=sentiment_counts.index,
-                        title="감성 분석 분포",
-                        color_discrete_map={'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
-                    )
-                    st.plotly_chart(fig_sentiment, use_container_width=True)
-                    
-                    # 키워드 추출
-                    st.write("**상위 키워드**")
-                    keywords = extract_keywords(df[selected_text_column], top_n=15)
-                    
-                    if keywords:
-                        # 키워드 시각화
-                        keyword_df = pd.DataFrame(keywords, columns=['키워드', '빈도'])
-                        fig_keywords = px.bar(
-                            keyword_df,
-                            x='빈도',
-                            y='키워드',
-                            orientation='h',
-                            title="상위 키워드 빈도",
-                            color='빈도',
-                            color_continuous_scale='viridis'
-                        )
-                        st.plotly_chart(fig_keywords, use_container_width=True)
-                        
-                        # 키워드 테이블
-                        st.dataframe(keyword_df, use_container_width=True)
-                    
-                    # 워드클라우드
-                    st.write("**워드클라우드**")
-                    wordcloud = create_wordcloud(df[selected_text_column])
-                    
-                    if wordcloud:
-                        fig, ax = plt.subplots(figsize=(10, 6))
-                        ax.imshow(wordcloud, interpolation='bilinear')
-                        ax.axis('off')
-                        st.pyplot(fig)
-                    else:
-                        st.warning("워드클라우드를 생성할 수 없습니다.")
-                    
-                    # 텍스트 길이 분석
-                    st.write("**텍스트 길이 분석**")
-                    df['텍스트_길이'] = df[selected_text_column].astype(str).str.len()
-                    
-                    fig_length = px.histogram(
-                        df,
-                        x='텍스트_길이',
-                        nbins=30,
-                        title="텍스트 길이 분포",
-                        labels={'텍스트_길이': '텍스트 길이', 'count': '빈도'}
-                    )
-                    st.plotly_chart(fig_length, use_container_width=True)
-                    
-                    # 길이 통계
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("평균 길이", f"{df['텍스트_길이'].mean():.1f}")
-                    with col2:
-                        st.metric("중앙값", f"{df['텍스트_길이'].median():.1f}")
-                    with col3:
-                        st.metric("최소 길이", f"{df['텍스트_길이'].min()}")
-                    with col4:
-                        st.metric("최대 길이", f"{df['텍스트_길이'].max()}")
-                    
-                    # 감성별 텍스트 길이 비교
-                    st.write("**감성별 텍스트 길이 비교**")
-                    fig_sentiment_length = px.box(
-                        df,
-                        x='감성',
-                        y='텍스트_길이',
-                        title="감성별 텍스트 길이 분포",
-                        color='감성',
-                        color_discrete_map={'긍정': '#2E8B57', '중립': '#FFD700', '부정': '#DC143C'}
-                    )
-                    st.plotly_chart(fig_sentiment_length, use_container_width=True)
-                    
-                    # 상세 분석 결과 다운로드
-                    st.subheader("💾 분석 결과 다운로드")
-                    
-                    # 감성 분석 결과를 CSV로 다운로드
-                    csv = df[['감성', '텍스트_길이']].to_csv(index=False, encoding='utf-8-sig')
-                    st.download_button(
-                        label="감성 분석 결과 다운로드 (CSV)",
-                        data=csv,
-                        file_name="sentiment_analysis_results.csv",
-                        mime="text/csv"
-                    )
+                    if collapse:
+                        # 묶은 데이터는 별도 캐시 키로 분석 (원본 분석 결과가 캐시에 있으면 재사용)
+                        total_rows = len(df)
+                        with st.spinner("유사 중복 피드백 찾는 중..."):
+                            df, dataset_key = collapse_duplicates(df, selected_text_column, dataset_key)
+                        st.caption(f"유사 중복 피드백 {total_rows - len(df):,}개를 묶어 {len(df):,}개 행으로 분석합니다.")
+                    show_text_analysis(df, selected_text_column, dataset_key)
                     
             else:
                 st.warning("분석할 수 있는 텍스트 컬럼이 없습니다.")
@@ -269,6 +430,7 @@ def main():
             st.error("파일을 로드할 수 없습니다. 파일 형식을 확인해주세요.")
     
     else:
+        cancel_session_job(st.session_state)
         st.info("👆 사이드바에서 데이터 파일을 업로드해주세요.")
         
         # 샘플 데이터 사용 안내
@@ -277,7 +439,7 @@ def main():
         1. **파일 업로드**: 사이드바에서 CSV 또는 Excel 파일을 선택하세요
         2. **컬럼 선택**: 분석할 텍스트 컬럼을 선택하세요
         3. **결과 확인**: 자동으로 감성 분석, 키워드 추출, 워드클라우드가 생성됩니다
-        4. **결과 다운로드**: 분석 결과를 CSV 파일로 다운로드할 수 있습니다
+        4. **결과 다운로드**: 분석 결과를 CSV, Excel, Parquet 파일로 다운로드할 수 있습니다
         """)
         
         # 샘플 데이터 표시
@@ -288,5 +450,11 @@ def main():
         - **데이터 구조**: 텍스트 컬럼이 포함된 표 형태의 데이터
         """)
 
+def main():
+    # 성능 측정 여부는 위젯보다 먼저 읽고, 패널은 측정이 끝난 뒤 사이드바 아래에 그림
+    with profile_run(st.session_state.get(PROFILING_KEY, False)) as profiler:
+        show_dashboard()
+    show_profile_panel(profiler)
+
 if __name__ == "__main__":
     main()
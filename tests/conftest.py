@@ -0,0 +1,5 @@
+"""테스트 공용 설정 (저장소 루트의 cfa 패키지를 불러오도록 경로 추가)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -0,0 +1,43 @@
+"""청크 단위 내보내기 파일이 전체 데이터를 한 번에 쓴 결과와 같은지 검사"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfa.export import export_rows, write_parquet
+
+
+@pytest.fixture
+def feedback():
+    return pd.DataFrame({
+        'feedback_text': pd.Series(['배송이 빨라요', None, '앱이 느려요', '좋아요'] * 5, dtype=object),
+        'rating': np.arange(20) % 5 + 1,
+        'category': pd.Categorical(['UI', '기능', '버그', 'UI'] * 5),
+    })
+
+
+def test_parquet_null_then_string_column():
+    df = pd.DataFrame({'a': pd.Series([None] * 5 + ['x'] * 5, dtype=object)})
+    result = pd.read_parquet(io.BytesIO(write_parquet(df, chunk_size=5)))
+    assert result['a'].isna().sum() == 5
+    assert result['a'].iloc[5:].tolist() == ['x'] * 5
+
+
+def test_parquet_rows_in_chunks(feedback):
+    rows = np.array([19, 3, 4, 0, 7, 12, 1])
+    result = pd.read_parquet(io.BytesIO(export_rows(feedback, rows, 'parquet', chunk_size=2)))
+    # pandas 버전에 따라 Parquet 문자열 컬럼을 str dtype으로 읽음
+    expected = feedback.iloc[rows].reset_index(drop=True).astype({'feedback_text': result['feedback_text'].dtype})
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+
+
+def test_parquet_no_rows(feedback):
+    result = pd.read_parquet(io.BytesIO(write_parquet(feedback, rows=np.array([], dtype=np.int64))))
+    assert list(result.columns) == list(feedback.columns)
+    assert len(result) == 0
+
+
+def test_csv_chunks_match_single_write(feedback):
+    data = export_rows(feedback, export_format='csv', chunk_size=3)
+    assert data == feedback.to_csv(index=False).encode('utf-8-sig')
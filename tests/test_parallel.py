@@ -0,0 +1,73 @@
+"""프로세스 풀 병렬 텍스트 분석이 직렬 처리와 같은 결과를 내는지 검사"""
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pandas as pd
+import pandas.testing as tm
+import pytest
+
+import cfa.parallel
+from cfa.parallel import analyze_texts
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+PARTITION_SIZE = 300
+
+
+@pytest.fixture(scope='module')
+def texts():
+    rng = np.random.default_rng(0)
+    sentences = pd.read_csv(SAMPLE_PATH)['feedback_text'].tolist()
+    values = [' '.join(rng.choice(sentences, size=rng.integers(1, 4))) for _ in range(1000)]
+    for position, value in zip(rng.integers(0, len(values), size=60), [None, np.nan, "", 7, "😀 좋아요!!", "이 수"] * 10):
+        values[position] = value
+    return pd.Series(values, index=np.arange(len(values)) * 3 + 5, dtype=object, name='feedback_text')
+
+
+def assert_same(result, expected):
+    tm.assert_frame_equal(result[0], expected[0])
+    assert result[1] == expected[1]
+
+
+@pytest.mark.parametrize('dtype', [object, 'str', 'category'])
+def test_pool_matches_serial(texts, dtype):
+    values = texts.astype(dtype)
+    expected = analyze_texts(values, workers=1, keywords=True)
+    result = analyze_texts(values, workers=2, partition_size=PARTITION_SIZE, keywords=True)
+    assert_same(result, expected)
+
+
+def test_pool_without_keywords(texts):
+    features, counts = analyze_texts(texts, workers=2, partition_size=PARTITION_SIZE)
+    assert counts is None
+    tm.assert_frame_equal(features, analyze_texts(texts, workers=1)[0])
+
+
+class BrokenPool:
+    def __init__(self, error):
+        self.error = error
+
+    def map(self, *args):
+        raise self.error
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize('error', [BrokenProcessPool("작업 프로세스 종료"), OSError("프로세스를 만들 수 없음")])
+def test_broken_pool_falls_back_to_serial(texts, monkeypatch, error):
+    pool = BrokenPool(error)
+    monkeypatch.setitem(cfa.parallel._pools, 2, pool)
+    result = analyze_texts(texts, workers=2, partition_size=PARTITION_SIZE, keywords=True)
+    assert_same(result, analyze_texts(texts, workers=1, keywords=True))
+    # 망가진 풀은 버려서 다음 호출에서 새로 만듦
+    assert cfa.parallel._pools.get(2) is not pool
+
+
+def test_small_column_stays_serial(texts, monkeypatch):
+    monkeypatch.setattr(cfa.parallel, '_pool', lambda workers: pytest.fail("프로세스 풀을 사용함"))
+    assert_same(
+        analyze_texts(texts.iloc[:PARTITION_SIZE], workers=2, partition_size=PARTITION_SIZE, keywords=True),
+        analyze_texts(texts.iloc[:PARTITION_SIZE], workers=1, keywords=True),
+    )
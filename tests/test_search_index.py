@@ -0,0 +1,110 @@
+"""역색인 검색 결과가 행마다 전처리 토큰을 직접 훑은 결과와 같은지 검사"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfa.search_index import SearchIndex, decode_postings, encode_postings, parse_query
+from cfa.text import preprocess_text, tokenize
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+# 결과가 없어야 하는 검색어 (불용어, 없는 단어, 빈 검색어)
+EMPTY_QUERIES = ['이 수', '없는단어', '"없는단어 배송이"', '']
+
+QUERIES = [
+    '배송이',
+    '배송이 포장',
+    '로그인 OR 결제',
+    '로그인 | 환불 배송',
+    '로그*',
+    '배* 포장',
+    '"배송이 느려"',
+    '"앱이 느"',
+    '"앱이 너무 느려서"',
+    '"로그인 오류" OR 환불*',
+    'good',
+    '좋아요!!',
+    *EMPTY_QUERIES,
+]
+
+
+@pytest.fixture(scope='module')
+def texts():
+    rng = np.random.default_rng(1)
+    sample = pd.read_csv(SAMPLE_PATH)
+    words = ['배송이', '느려요', '느려', '포장', '로그인', '로그아웃', '오류', '결제', '환불', '앱이', 'GOOD', '좋아요!!', '이']
+    texts = [
+        ' '.join(rng.choice(sample['feedback_text'], size=rng.integers(1, 3)))
+        + ' ' + ' '.join(rng.choice(words, size=rng.integers(0, 6)))
+        for _ in range(2000)
+    ]
+    for position, value in zip(rng.integers(0, len(texts), size=30), [None, np.nan, "", 7, "!!!"] * 6):
+        texts[position] = value
+    return pd.Series(texts, dtype=object)
+
+
+@pytest.fixture(scope='module')
+def index(texts):
+    return SearchIndex.from_tokens(tokenize(texts))
+
+
+def clause_score(tokens, clause):
+    """조건 하나의 점수를 토큰 목록에서 직접 계산"""
+    if clause[0] == 'term':
+        return sum(token == clause[1] for token in tokens)
+    if clause[0] == 'prefix':
+        return sum(token.startswith(clause[1]) for token in tokens)
+    terms, prefix = clause[1], clause[2]
+    found = sum(
+        tuple(tokens[i:i + len(terms)]) == terms and tokens[i + len(terms)].startswith(prefix)
+        for i in range(len(tokens) - len(terms))
+    )
+    return found * (len(terms) + 1)
+
+
+def naive_search(texts, query, rows=None):
+    """모든 행을 훑어 점수가 높은 순서(같은 점수는 원래 순서)로 맞는 행 위치"""
+    groups = parse_query(query)
+    results = []
+    for row, text in enumerate(texts):
+        if rows is not None and row not in rows:
+            continue
+        tokens = preprocess_text(text).split()
+        score = 0
+        for group in groups:
+            scores = [clause_score(tokens, clause) for clause in group]
+            if all(scores):
+                score += sum(scores)
+        if score:
+            results.append((-score, row))
+    return [row for _, row in sorted(results)]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_search_matches_naive_scan(texts, index, query):
+    assert index.search(query).tolist() == naive_search(texts, query)
+
+
+@pytest.mark.parametrize('query', ['배송이', '로그인 OR 결제', '"배송이 느려"'])
+def test_search_within_rows(texts, index, query):
+    rows = np.arange(0, len(texts), 3)
+    assert index.search(query, rows).tolist() == naive_search(texts, query, set(rows.tolist()))
+
+
+def test_queries_find_rows(index):
+    # 비교가 빈 결과끼리만 이뤄지지 않도록 나머지 검색어는 결과가 있어야 함
+    for query in QUERIES:
+        assert (len(index.search(query)) > 0) == (query not in EMPTY_QUERIES), query
+
+
+def test_postings_round_trip():
+    rng = np.random.default_rng(2)
+    lists = [np.sort(rng.choice(10 ** 6, size=size, replace=False)) for size in (0, 1, 5, 300, 0, 2000)]
+    starts = np.concatenate(([0], np.cumsum([len(rows) for rows in lists])))
+    data, byte_starts = encode_postings(np.concatenate(lists), starts)
+    for number, rows in enumerate(lists):
+        decoded = decode_postings(data[byte_starts[number]:byte_starts[number + 1]])
+        assert decoded.tolist() == rows.tolist()
+
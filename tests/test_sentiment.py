@@ -0,0 +1,64 @@
+"""컬럼 단위 감성 분석이 행별 `analyze_sentiment`와 같은 라벨을 내는지 검사"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfa.sentiment import SENTIMENT_LABELS, analyze_sentiment, analyze_sentiment_batch
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+EDGE_CASES = [
+    None, np.nan, float('nan'), pd.NA, "", " ", 0, 123, 4.5, True,
+    "좋아요", "불편해요", "편리 불편", "좋지만 불편하고 느리다", "작은 글씨", "작동이 잘 돼요",
+    "GOOD 좋아요", "😀 좋아요", "좋아요 😡😡", "🙂", "𝒜 오류 𝒜", "좋\x00불편", "\x00", "오류\x00",
+    "좋좋좋", "느리고 어렵고 오류", "빠르", "빠", "르", "직관적이고 간단해요 👍",
+    "좋아요 \ud800", "\udfff불편", "좋\ud83d아요", "편리\x00\udc00",
+]
+
+
+def expected_labels(texts):
+    return pd.Series([analyze_sentiment(text) for text in texts], dtype=object)
+
+
+@pytest.mark.parametrize('text', EDGE_CASES, ids=repr)
+def test_edge_case_matches_single_text(text):
+    result = analyze_sentiment_batch(pd.Series([text], dtype=object))
+    assert result.tolist() == [analyze_sentiment(text)]
+
+
+def test_mixed_column_matches_single_text():
+    rng = np.random.default_rng(0)
+    sentences = pd.read_csv(SAMPLE_PATH)['feedback_text'].tolist()
+    texts = [' '.join(rng.choice(sentences, size=rng.integers(1, 4))) + f' #{i}' for i in range(2000)]
+    for position, value in zip(rng.integers(0, len(texts), size=300), EDGE_CASES * 10):
+        texts[position] = value
+    texts = pd.Series(texts, dtype=object)
+    assert analyze_sentiment_batch(texts).tolist() == expected_labels(texts).tolist()
+
+
+def test_repeated_texts_match_single_text():
+    # 중복이 많은 컬럼은 고유 텍스트만 분석하는 경로를 탐
+    texts = pd.Series(EDGE_CASES * 200, dtype=object)
+    assert analyze_sentiment_batch(texts).tolist() == expected_labels(texts).tolist()
+
+
+def test_string_dtype_and_index_are_kept():
+    texts = pd.Series(["좋아요", None, "오류", ""], index=[10, 20, 30, 40], dtype='str', name='feedback_text')
+    result = analyze_sentiment_batch(texts)
+    assert result.index.tolist() == [10, 20, 30, 40]
+    assert result.name == 'feedback_text'
+    assert result.tolist() == expected_labels(texts).tolist()
+
+
+def test_categorical_result():
+    texts = pd.Series(EDGE_CASES, dtype=object)
+    result = analyze_sentiment_batch(texts, categorical=True)
+    assert list(result.cat.categories) == list(SENTIMENT_LABELS)
+    assert result.astype(object).tolist() == expected_labels(texts).tolist()
+
+
+def test_empty_column():
+    result = analyze_sentiment_batch(pd.Series([], dtype=object))
+    assert result.empty
@@ -0,0 +1,21 @@
+"""문자 n-gram 감성 모델이 깨진 텍스트(짝이 없는 서로게이트)도 분석하는지 검사"""
+import numpy as np
+import pandas as pd
+
+from cfa.sentiment import SENTIMENT_LABELS, analyze_sentiment_model
+from cfa.sentiment_model import ngram_buckets
+
+
+def test_lone_surrogate_counts_as_one_character():
+    broken = ngram_buckets(['좋아요 \ud800 최고', '느려요'])
+    replaced = ngram_buckets(['좋아요 ? 최고', '느려요'])
+    for left, right in zip(broken, replaced):
+        np.testing.assert_array_equal(left, right)
+
+
+def test_model_labels_broken_text():
+    texts = pd.Series(['좋아요 \ud800', '\udfff', None, '오류가 나요 \ud83d'], dtype=object)
+    labels = analyze_sentiment_model(texts)
+    assert len(labels) == len(texts)
+    assert set(labels) <= set(SENTIMENT_LABELS)
+    assert labels.iloc[2] == '중립'
@@ -0,0 +1,85 @@
+"""피드백 저장소 중복 제거 검사 (같은 데이터를 여러 세션이 동시에 추가하는 경우 포함)"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfa.parallel import analyze_texts
+from cfa.store import FeedbackStore
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+@pytest.fixture(scope='module')
+def feedback():
+    rng = np.random.default_rng(0)
+    sample = pd.read_csv(SAMPLE_PATH)
+    n_rows = 6000
+    return pd.DataFrame({
+        'date': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, size=n_rows), unit='D'),
+        'product': rng.choice(sample['product'].unique(), size=n_rows),
+        'category': rng.choice(sample['category'].unique(), size=n_rows),
+        'feedback_text': [
+            ' '.join(rng.choice(sample['feedback_text'], size=rng.integers(1, 3))) for _ in range(n_rows)
+        ],
+        'rating': rng.integers(1, 6, size=n_rows),
+    })
+
+
+def unique_rows(df):
+    return df.drop_duplicates(['date', 'product', 'category', 'feedback_text', 'rating'])
+
+
+def expected_keywords(df):
+    _, keywords = analyze_texts(unique_rows(df)['feedback_text'], keywords=True)
+    return dict(keywords)
+
+
+def import_concurrently(store, frames, sources):
+    """여러 스레드에서 동시에 추가 (결과 목록, 예외 목록)"""
+    barrier = threading.Barrier(len(frames))
+    results, errors = [None] * len(frames), []
+
+    def run(position):
+        barrier.wait()
+        try:
+            results[position] = store.import_frame(frames[position], sources[position])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(position,)) for position in range(len(frames))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_reimport_adds_only_new_rows(tmp_path, feedback):
+    store = FeedbackStore(str(tmp_path / 'store.sqlite'))
+    first = store.import_frame(feedback.iloc[:4000], 'first')
+    second = store.import_frame(feedback, 'second')
+    assert first['added'] == len(unique_rows(feedback.iloc[:4000]))
+    assert first['added'] + second['added'] == len(unique_rows(feedback)) == len(store)
+    assert store.import_frame(feedback, 'second')['skipped']
+    assert dict(store.aggregates(max_keywords=10**6).keyword_counts) == expected_keywords(feedback)
+
+
+def test_concurrent_overlapping_imports(tmp_path, feedback):
+    store = FeedbackStore(str(tmp_path / 'store.sqlite'))
+    results, errors = import_concurrently(store, [feedback, feedback.iloc[2000:]], ['a', 'b'])
+    assert errors == []
+    assert sum(result['added'] for result in results) == len(unique_rows(feedback)) == len(store)
+    assert dict(store.aggregates(max_keywords=10**6).keyword_counts) == expected_keywords(feedback)
+    assert sorted(store.imports()['새 행']) == sorted(result['added'] for result in results)
+
+
+def test_concurrent_imports_of_same_source(tmp_path, feedback):
+    store = FeedbackStore(str(tmp_path / 'store.sqlite'))
+    results, errors = import_concurrently(store, [feedback, feedback], ['same', 'same'])
+    assert errors == []
+    assert sorted(result['skipped'] for result in results) == [False, True]
+    assert len(store) == len(unique_rows(feedback))
+    assert len(store.imports()) == 1
@@ -0,0 +1,99 @@
+"""문서-단어 행렬의 키워드 집계가 행마다 다시 토큰화한 Counter 결과와 같은지 검사"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cfa.term_matrix import TermMatrix
+from cfa.text import count_tokens, extract_keywords, tokenize
+
+SAMPLE_PATH = os.path.join(os.path.dirname(__file__), '..', 'sample_feedback_data.csv')
+
+
+@pytest.fixture(scope='module')
+def feedback():
+    rng = np.random.default_rng(0)
+    sample = pd.read_csv(SAMPLE_PATH)
+    words = ['배송', '포장', '로그인', '오류', '결제', '환불', '앱이', '느려요', 'GOOD', '좋아요!!', '이', '수']
+    texts = [
+        ' '.join(rng.choice(sample['feedback_text'], size=rng.integers(1, 3)))
+        + ' ' + ' '.join(rng.choice(words, size=rng.integers(0, 4)))
+        for _ in range(3000)
+    ]
+    for position, value in zip(rng.integers(0, len(texts), size=40), [None, np.nan, "", 42, "!!!", "이 수"] * 7):
+        texts[position] = value
+    return pd.DataFrame({
+        'feedback_text': pd.Series(texts, dtype=object),
+        'product': rng.choice(sample['product'].unique(), size=len(texts)),
+        'category': pd.Series(rng.choice([*sample['category'].unique(), None], size=len(texts)), dtype=object),
+    })
+
+
+@pytest.fixture(scope='module')
+def matrix(feedback):
+    return TermMatrix.from_tokens(tokenize(feedback['feedback_text']))
+
+
+def subset_counter(feedback, rows):
+    return count_tokens(feedback['feedback_text'].iloc[rows])
+
+
+def assert_top_counts(result, expected, top_n):
+    """상위 키워드의 빈도가 Counter와 같은지 (같은 빈도 단어의 순서는 전체 첫 등장 기준이라 빈도만 비교)"""
+    assert all(expected[word] == count for word, count in result.items())
+    assert sorted(result.values(), reverse=True) == sorted(expected.values(), reverse=True)[:top_n]
+
+
+@pytest.mark.parametrize('top_n', [1, 5, 10, 30, 1000])
+def test_full_column_matches_most_common(feedback, matrix, top_n):
+    expected = extract_keywords(feedback['feedback_text'], top_n)
+    assert list(matrix.top_terms(top_n=top_n).items()) == expected
+
+
+def test_subset_counts_match_counter(feedback, matrix):
+    rows = np.flatnonzero(np.random.default_rng(1).random(len(feedback)) < 0.3)
+    expected = subset_counter(feedback, rows)
+    counts = matrix.counts(rows)
+    assert dict(zip(matrix.vocabulary[counts > 0], counts[counts > 0].tolist())) == dict(expected)
+    mask = np.zeros(len(feedback), dtype=bool)
+    mask[rows] = True
+    assert np.array_equal(matrix.counts(mask), counts)
+    assert_top_counts(matrix.top_terms(rows, top_n=10), expected, 10)
+
+
+def test_weighted_counts_match_repeated_rows(feedback, matrix):
+    weights = np.random.default_rng(2).integers(0, 4, size=len(feedback))
+    repeated = np.repeat(np.arange(len(feedback)), weights)
+    assert np.array_equal(matrix.counts(weights=weights), matrix.counts(repeated))
+
+
+@pytest.mark.parametrize('column', ['product', 'category'])
+def test_segment_keywords_match_counter(feedback, matrix, column):
+    labels = feedback[column]
+    result = matrix.top_terms_by(labels.to_numpy(), top_n=5)
+    assert set(result) == set(labels.dropna())
+    for group, keywords in result.items():
+        rows = np.flatnonzero((labels == group).to_numpy())
+        assert_top_counts(keywords, subset_counter(feedback, rows), 5)
+        assert keywords == matrix.top_terms(rows, top_n=5)
+
+
+def test_group_counts_match_row_subsets(feedback, matrix):
+    labels = feedback['category']
+    groups, counts = matrix.group_counts(labels)
+    for code, group in enumerate(groups):
+        rows = np.flatnonzero((labels == group).to_numpy())
+        assert np.array_equal(counts[code].toarray().ravel(), matrix.counts(rows))
+
+
+def test_categorical_labels_match_array_labels(feedback, matrix):
+    labels = feedback['category']
+    categorical = matrix.top_terms_by(labels.astype('category'), top_n=5)
+    assert list(categorical.items()) == list(matrix.top_terms_by(labels.to_numpy(), top_n=5).items())
+
+
+def test_empty_matrix():
+    matrix = TermMatrix.from_tokens(pd.Series(['', '', ''], dtype=object))
+    assert matrix.top_terms() == {}
+    assert matrix.top_terms_by(np.array(['a', 'b', 'a'])) == {'a': {}, 'b': {}}